@@ -2,7 +2,9 @@ from fastapi import APIRouter
 
 from config import config
 
-from .endpoints import router_auth, router_check, router_healthz, router_verify
+from .endpoints import router_auth, router_check, router_verify
+from .health import router_healthz
+from .well_known import router_well_known
 
 router = APIRouter()
 router.include_router(
@@ -19,3 +21,8 @@ router.include_router(
 router.include_router(
     router_verify, tags=[config.service.tags_metadata_verify['name']]  # type: ignore
 )
+
+well_known_router = APIRouter()
+well_known_router.include_router(
+    router_well_known, tags=[config.service.tags_metadata_check['name']]  # type: ignore
+)
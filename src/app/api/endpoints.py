@@ -1,7 +1,6 @@
 import os
-from uuid import uuid1
+from typing import Any
 
-import aiofiles
 from fastapi import (
     APIRouter,
     Depends,
@@ -12,28 +11,47 @@ from fastapi import (
     UploadFile,
     status,
 )
-from opentracing import global_tracer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.schemes import (
-    IsReady,
     KafkaResponse,
     UserCreate,
     UserToken,
+    UserTokenBatchCheckRequest,
     UserTokenCheck,
     UserTokenCheckRequest,
 )
-from app.constants import FILENAME_ERROR, UPLOAD_ERROR, WRONG_IMAGE_FORMAT
+from app.constants import (
+    FILENAME_ERROR,
+    PHOTO_TOO_LARGE,
+    UPLOAD_ERROR,
+    WRONG_IMAGE_FORMAT,
+)
 from app.db import get_async_session
-from app.service import AuthService, producer
+from app.service import (
+    AuthService,
+    PhotoTooLargeError,
+    outbox_relay,
+    photo_storage,
+    rate_limiter,
+)
+from app.tracing import tracer
 from config import config
 
 router_auth = APIRouter()
 router_check = APIRouter()
-router_healthz = APIRouter()
 router_verify = APIRouter()
 
 
+def client_ip(request: Request) -> str:
+    """Client address of the request.
+
+    uvicorn replaces the peer address with the ``X-Forwarded-For`` client
+    only for requests from ``service.forwarded_allow_ips``.
+    """
+    return request.client.host if request.client else 'unknown'
+
+
 @router_auth.post('/registration', response_model=UserToken)
 async def registration(
     user: UserCreate,
@@ -41,8 +59,9 @@ async def registration(
     session: AsyncSession = Depends(get_async_session),
 ):
     """User registration endpoint."""
-    with global_tracer().start_active_span('register_user') as scope:
+    with tracer().start_active_span('register_user') as scope:
         scope.span.set_tag('login', user.login)
+        await rate_limiter.check('registration', ip=client_ip(request))
         return UserToken(
             token=await AuthService.registration(
                 login=user.login,
@@ -60,8 +79,13 @@ async def authentication(
     session: AsyncSession = Depends(get_async_session),
 ):
     """User authentication endpoint."""
-    with global_tracer().start_active_span('login_user') as scope:
+    with tracer().start_active_span('login_user') as scope:
         scope.span.set_tag('login', user.login)
+        await rate_limiter.check(
+            'auth',
+            ip=client_ip(request),
+            login=user.login,
+        )
         return UserToken(
             token=await AuthService.authentication(
                 login=user.login,
@@ -78,7 +102,7 @@ async def check_token(
     request: Request,
 ):
     """Token check endpoint."""
-    with global_tracer().start_active_span('check_token') as scope:
+    with tracer().start_active_span('check_token') as scope:
         scope.span.set_tag('token', token.token[:10] + '...')
         return await AuthService.check_token(
             token.token,
@@ -86,10 +110,57 @@ async def check_token(
         )
 
 
-@router_healthz.get('/healthz/ready', response_model=IsReady)
-async def check_health():
-    """Health check endpoint."""
-    return IsReady(is_ready=True)
+@router_check.post(
+    '/check_token/batch',
+    response_model=list[UserTokenCheck],
+)
+async def check_token_batch(
+    tokens: UserTokenBatchCheckRequest,
+    request: Request,
+):
+    """Batch token check endpoint."""
+    with tracer().start_active_span('check_token_batch') as scope:
+        scope.span.set_tag('tokens', len(tokens.tokens))
+        return await AuthService.check_tokens(
+            tokens.tokens,
+            request.app.state.redis,
+        )
+
+
+def photo_extension(filename: str | None, span: Any) -> str:
+    """Extension of the uploaded photo, 400 for unsupported files."""
+    if filename is None:
+        span.set_tag('error', FILENAME_ERROR)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=FILENAME_ERROR,
+        )
+    file_extension = os.path.splitext(filename)[1]
+    if file_extension not in config.service.acceptable_formats:  # type: ignore # noqa: E501
+        span.set_tag('error', 'wrong file format')
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=WRONG_IMAGE_FORMAT.format(extension=file_extension),
+        )
+    return file_extension
+
+
+async def save_photo(file: UploadFile, file_extension: str, span: Any) -> str:
+    """Save the photo, 413 when it is too large, 406 on other errors."""
+    try:
+        return await photo_storage.save(file, file_extension)
+    except PhotoTooLargeError:
+        span.set_tag('error', 'photo too large')
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=PHOTO_TOO_LARGE.format(max_size=photo_storage.max_size),
+        )
+    except Exception:
+        span.set_tag('error', UPLOAD_ERROR)
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail=UPLOAD_ERROR,
+        )
 
 
 @router_verify.post('/verify', response_model=KafkaResponse)
@@ -99,37 +170,10 @@ async def verify(
     session: AsyncSession = Depends(get_async_session),
 ):
     """Photo upload endpoint."""
-    with global_tracer().start_active_span('photo_upload') as scope:
-        if file.filename is None:
-            scope.span.set_tag('error', FILENAME_ERROR)
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=FILENAME_ERROR,
-            )
-        file_extension = os.path.splitext(file.filename)[1]
-        if file_extension not in config.service.acceptable_formats:  # type: ignore # noqa: E501
-            scope.span.set_tag('error', 'wrong file format')
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=WRONG_IMAGE_FORMAT.format(extension=file_extension),
-            )
-        file_path = (
-            f'{config.service.photo_directory}/'  # type: ignore
-            f'{uuid1()}{file_extension}'
-        )
-        try:
-            async with aiofiles.open(file_path, 'wb') as photo:
-                await photo.write(await file.read())
-        except Exception:
-            scope.span.set_tag('error', UPLOAD_ERROR)
-            raise HTTPException(
-                status_code=status.HTTP_406_NOT_ACCEPTABLE,
-                detail=UPLOAD_ERROR,
-            )
+    with tracer().start_active_span('photo_upload') as scope:
+        file_extension = photo_extension(file.filename, scope.span)
+        file_path = await save_photo(file, file_extension, scope.span)
         scope.span.set_tag('file path', file_path)
-        await producer.send_message(
-            config.service.kafka_topic,  # type: ignore
-            {user_id: file_path},
-        )
-        await AuthService.verify(user_id, session)
+        await AuthService.verify(user_id, file_path, session)
+        outbox_relay.notify()
         return KafkaResponse
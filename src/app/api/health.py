@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Response, status
+
+from app.api.schemes import IsAlive, IsReady
+from app.service import health_checker
+
+router_healthz = APIRouter()
+
+
+@router_healthz.get('/healthz/ready', response_model=IsReady)
+async def check_health(response: Response):
+    """Readiness endpoint serving the last dependency checks."""
+    is_ready = health_checker.is_ready()
+    if not is_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return IsReady(
+        is_ready=is_ready,
+        checks=health_checker.dependency_checks.checks,
+    )
+
+
+@router_healthz.get('/healthz/live', response_model=IsAlive)
+async def check_liveness(response: Response):
+    """Liveness endpoint failing when the event loop stalls."""
+    is_alive = health_checker.is_alive()
+    if not is_alive:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return IsAlive(
+        is_alive=is_alive,
+        loop_lag=health_checker.heartbeat.loop_lag,
+    )
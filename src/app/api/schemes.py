@@ -1,6 +1,8 @@
+from typing import Any
+
 from pydantic import BaseModel, Field, PositiveInt
 
-from app.constants import KAFKA_RESPONSE
+from app.constants import KAFKA_RESPONSE, TOKEN_BATCH_SIZE
 
 
 class UserCreate(BaseModel):
@@ -38,10 +40,34 @@ class UserTokenCheckRequest(BaseModel):
     token: str
 
 
+class UserTokenBatchCheckRequest(BaseModel):
+    """Batch token check request scheme."""
+
+    tokens: list[str] = Field(
+        description='Tokens',
+        min_length=1,
+        max_length=TOKEN_BATCH_SIZE,
+    )
+
+
 class IsReady(BaseModel):
     """Health check response scheme."""
 
     is_ready: bool
+    checks: dict[str, bool] = Field(default_factory=dict)
+
+
+class IsAlive(BaseModel):
+    """Liveness check response scheme."""
+
+    is_alive: bool
+    loop_lag: float
+
+
+class Jwks(BaseModel):
+    """JWK Set response scheme."""
+
+    keys: list[dict[str, Any]]
 
 
 class KafkaResponse(BaseModel):
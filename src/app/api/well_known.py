@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Response
+
+from app.api.schemes import Jwks
+from app.service import key_ring
+from config import config
+
+router_well_known = APIRouter()
+
+
+@router_well_known.get('/.well-known/jwks.json', response_model=Jwks)
+async def jwks(response: Response):
+    """Public keys for local token signature verification."""
+    response.headers['Cache-Control'] = (
+        'public, max-age={0}'.format(config.jwt.jwks_max_age)  # type: ignore
+    )
+    return key_ring.jwks()
@@ -3,8 +3,29 @@
 ENCODING_FORMAT = 'utf-8'
 LOGIN_LENGTH = 20
 BALANCE_DEFAULT_VALUE = 0
-HASHED_PASSWORD_LENGTH = 60
+HASHED_PASSWORD_LENGTH = 255
 TOKEN_LENGTH = 300
+OUTBOX_TOPIC_LENGTH = 255
+TOKEN_BATCH_SIZE = 100
+TOKEN_DIGEST_SIZE = 16
+SYMMETRIC_ALGORITHM = 'HS256'
+KEY_FILE_SUFFIX = '.pem'
+KEY_FILE_MODE = 0o600
+PRIVATE_KEY_MARKER = b'PRIVATE KEY'
+RSA_PUBLIC_EXPONENT = 65537
+RSA_KEY_SIZE = 2048
+UPLOAD_FORM_OVERHEAD = 65536
+UNMATCHED_ROUTE = 'unmatched'
+BCRYPT_PREFIXES = ('$2a$', '$2b$', '$2y$')
+SCRYPT_SALT_LENGTH = 16
+SCRYPT_KEY_LENGTH = 32
+SCRYPT_MEMORY_FACTOR = 256
+SCRYPT_HASH_PARTS = 5
+MILLISECONDS = 1000
+MULTIPROCESS_DIRECTORY_VARIABLE = 'PROMETHEUS_MULTIPROC_DIR'
+CGROUP_V2_CPU_MAX = '/sys/fs/cgroup/cpu.max'
+CGROUP_V1_CPU_QUOTA = '/sys/fs/cgroup/cpu/cpu.cfs_quota_us'
+CGROUP_V1_CPU_PERIOD = '/sys/fs/cgroup/cpu/cpu.cfs_period_us'
 
 """Error messages."""
 INVALID_TOKEN_MESSAGE = 'Invalid token'
@@ -15,6 +36,13 @@ TOKEN_NOT_FOUND = 'Token not found'
 UPLOAD_ERROR = 'Error during file upload'
 WRONG_IMAGE_FORMAT = 'Invalid image format {extension}'
 FILENAME_ERROR = 'File name is too short or the file has no extension'
+SIGNING_KEY_NOT_FOUND = 'Signing key {kid} not found'
+UNKNOWN_KEY_ID = 'Unknown key id'
+PHOTO_TOO_LARGE = 'Photo is larger than {max_size} bytes'
+SERVICE_OVERLOADED = 'Service is overloaded, retry later'
+RATE_LIMIT_EXCEEDED = 'Too many requests, retry after {retry_after} seconds'
+UNKNOWN_SAMPLER = 'Unknown sampler type {sampler_type}'
+INVALID_PASSWORD_HASH = 'Invalid password hash'
 
 
 """Default values."""
@@ -1,3 +1,9 @@
 from app.db.basemodels import Base
 from app.db.database import get_async_session
-from app.db.models import User
+from app.db.models import Outbox, User
+from app.db.queries import (
+    get_credentials,
+    insert_user,
+    set_password_hash,
+    set_verified,
+)
@@ -1,15 +1,151 @@
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+import asyncio
+import logging
+import time
+from typing import Any
 
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    Pool,
+    PoolProxiedConnection,
+)
+
+from app.metrics import DB_POOL_CHECKED_OUT, DB_POOL_OVERFLOW, DB_POOL_WAIT
 from config import config
 
+log = logging.getLogger('uvicorn')
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Connection pool measuring the connection acquisition time."""
+
+    def connect(self) -> PoolProxiedConnection:
+        """Get connection from the pool and observe the wait time."""
+        started_at = time.perf_counter()
+        connection = super().connect()
+        DB_POOL_WAIT.observe(time.perf_counter() - started_at)
+        return connection
+
+
+class PoolMetrics:
+    """Connection pool gauges updated by pool events.
+
+    ``checkin`` fires before the connection is back in the pool, so the
+    connections are counted from the events instead of read from the pool.
+    Listeners are kept when the engine recreates its pool on ``dispose``.
+    """
+
+    def __init__(self, pool: Pool, pool_size: int):
+        """Pool metrics initialization."""
+        self.pool = pool
+        self.pool_size = pool_size
+        self.checked_out = 0
+        self.opened = 0
+
+    def listen(self):
+        """Register the pool event listeners."""
+        event.listen(self.pool, 'connect', self.on_connect)
+        event.listen(self.pool, 'close', self.on_close)
+        event.listen(self.pool, 'checkout', self.on_checkout)
+        event.listen(self.pool, 'checkin', self.on_checkin)
+
+    def on_connect(self, dbapi_connection: Any, record: ConnectionPoolEntry):
+        """Count a new database connection."""
+        self.opened += 1
+        self._update_metrics()
+
+    def on_close(self, dbapi_connection: Any, record: ConnectionPoolEntry):
+        """Count a closed database connection."""
+        self.opened = max(self.opened - 1, 0)
+        self._update_metrics()
+
+    def on_checkout(
+        self,
+        dbapi_connection: Any,
+        record: ConnectionPoolEntry,
+        proxy: PoolProxiedConnection,
+    ):
+        """Count a connection taken from the pool."""
+        self.checked_out += 1
+        self._update_metrics()
+
+    def on_checkin(self, dbapi_connection: Any, record: ConnectionPoolEntry):
+        """Count a connection returned to the pool."""
+        self.checked_out = max(self.checked_out - 1, 0)
+        self._update_metrics()
+
+    def _update_metrics(self):
+        """Update checked out and overflow connection gauges."""
+        DB_POOL_CHECKED_OUT.set(self.checked_out)
+        DB_POOL_OVERFLOW.set(max(self.opened - self.pool_size, 0))
+
+
 engine = create_async_engine(
     url=config.database_url,  # type: ignore
     echo=config.service.db_echo,  # type: ignore
+    poolclass=TimedQueuePool,
+    pool_size=config.service.db_pool_size,  # type: ignore
+    max_overflow=config.service.db_max_overflow,  # type: ignore
+    pool_timeout=config.service.db_pool_timeout,  # type: ignore
+    pool_recycle=config.service.db_pool_recycle,  # type: ignore
+    pool_pre_ping=config.service.db_pool_pre_ping,  # type: ignore
+    connect_args={
+        'timeout': config.service.db_connect_timeout,  # type: ignore
+        'command_timeout': config.service.db_command_timeout,  # type: ignore
+        'statement_cache_size': (
+            config.service.db_statement_cache_size  # type: ignore
+        ),
+        'prepared_statement_cache_size': (
+            config.service.db_prepared_statement_cache_size  # type: ignore
+        ),
+    },
 )
 
+pool_metrics = PoolMetrics(
+    engine.sync_engine.pool,
+    config.service.db_pool_size,  # type: ignore
+)
+pool_metrics.listen()
+
 async_session = async_sessionmaker(bind=engine)
 
 
+async def warm_up_pool(database_engine: AsyncEngine, size: int):
+    """Open pool connections before the first requests need them."""
+    connections = await asyncio.gather(
+        *[database_engine.connect().start() for _ in range(size)],
+        return_exceptions=True,
+    )
+    errors = [
+        connection
+        for connection in connections
+        if isinstance(connection, Exception)
+    ]
+    for connection in connections:
+        if not isinstance(connection, Exception):
+            await connection.close()
+    if errors:
+        log.warning(
+            'Opened {0} of {1} pool connections: {2}'.format(
+                size - len(errors),
+                size,
+                errors[0],
+            ),
+        )
+
+
+async def ping_database(database_engine: AsyncEngine):
+    """Run ``SELECT 1`` on a pooled connection."""
+    async with database_engine.connect() as connection:
+        await connection.execute(text('SELECT 1'))
+
+
 async def get_async_session():
     """Async session generator."""
     async with async_session() as session:
@@ -3,7 +3,7 @@ from logging.config import fileConfig
 from alembic import context
 from sqlalchemy import engine_from_config, pool
 
-from app.db import Base, User
+from app.db import Base, Outbox, User
 from config import config as conf
 
 # this is the Alembic Config object, which provides
@@ -1,12 +1,14 @@
-from typing import Annotated
+from datetime import datetime
+from typing import Annotated, Any
 
-from sqlalchemy import String
+from sqlalchemy import JSON, DateTime, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.constants import (
     BALANCE_DEFAULT_VALUE,
     HASHED_PASSWORD_LENGTH,
     LOGIN_LENGTH,
+    OUTBOX_TOPIC_LENGTH,
 )
 from app.db.basemodels import Base
 
@@ -23,3 +25,15 @@ class User(Base):
     )
     balance: Mapped[int] = mapped_column(default=BALANCE_DEFAULT_VALUE)
     is_verified: Mapped[bool] = mapped_column(default=False)
+
+
+class Outbox(Base):
+    """Events waiting to be published to Kafka."""
+
+    id: Mapped[intpk]
+    topic: Mapped[str] = mapped_column(String(OUTBOX_TOPIC_LENGTH))
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+    )
@@ -0,0 +1,67 @@
+from sqlalchemy import Row, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models import User
+
+
+async def insert_user(
+    session: AsyncSession,
+    login: str,
+    hashed_password: str,
+) -> int | None:
+    """Insert a user, return its id or None if the login is taken.
+
+    PostgreSQL and SQLite both support ``ON CONFLICT DO NOTHING``.
+    """
+    if session.get_bind().dialect.name == 'sqlite':
+        insert = sqlite.insert
+    else:
+        insert = postgresql.insert
+    user_insert = insert(User).values(
+        login=login,
+        hashed_password=hashed_password,
+    )
+    query_result = await session.execute(
+        user_insert.on_conflict_do_nothing(
+            index_elements=[User.login],
+        ).returning(User.id),
+    )
+    return query_result.scalar_one_or_none()
+
+
+async def get_credentials(
+    session: AsyncSession,
+    login: str,
+) -> Row[tuple[int, str]] | None:
+    """User id and password hash by login without loading the ORM object."""
+    query_result = await session.execute(
+        select(User.id, User.hashed_password).where(User.login == login),
+    )
+    return query_result.one_or_none()
+
+
+async def set_verified(session: AsyncSession, user_id: int) -> bool:
+    """Mark the user verified in one UPDATE, False if there is no user."""
+    user_update = update(User).where(User.id == user_id).values(
+        is_verified=True,
+    )
+    query_result = await session.execute(
+        user_update.returning(User.id),
+        execution_options={'synchronize_session': False},
+    )
+    return query_result.scalar_one_or_none() is not None
+
+
+async def set_password_hash(
+    session: AsyncSession,
+    user_id: int,
+    hashed_password: str,
+):
+    """Replace the stored password hash of the user."""
+    await session.execute(
+        update(User).where(User.id == user_id).values(
+            hashed_password=hashed_password,
+        ),
+        execution_options={'synchronize_session': False},
+    )
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from functools import partial
+
+from fastapi import FastAPI
+
+from app.db.database import engine, ping_database, warm_up_pool
+from app.metrics import mark_worker_stopped, remove_dead_workers
+from app.redis_client import AnyRedis, create_redis
+from app.service import (
+    client_cache,
+    key_ring,
+    outbox_relay,
+    password_executor,
+    producer,
+    rate_limiter,
+    token_cache,
+)
+from app.service.hashers import password_hashers
+from app.service.health import health_checker
+from app.tracing import tracing
+from config import config
+
+log = logging.getLogger('uvicorn')
+
+
+async def start_workers():
+    """Prepare the worker process and the password hashing pool."""
+    if not os.path.exists(config.service.photo_directory):  # type: ignore
+        os.makedirs(config.service.photo_directory)  # type: ignore
+        log.info('Directory created')
+
+    remove_dead_workers()
+
+    key_ring.load()
+    log.info('Token signing keys loaded')
+
+    if config.service.db_pool_warm_up:  # type: ignore
+        await warm_up_pool(engine, config.service.db_pool_size)  # type: ignore
+        log.info('Database connection pool warmed up')
+
+    if config.password_hashing.calibrate:  # type: ignore
+        await asyncio.to_thread(
+            password_hashers.calibrate,
+            config.password_hashing.target_time,  # type: ignore
+        )
+        log.info(
+            'Password hasher calibrated: {0}'.format(
+                password_hashers.default.settings(),
+            ),
+        )
+    await asyncio.to_thread(password_hashers.dummy_hash)
+
+    await password_executor.start()
+    log.info('Password executor started')
+
+
+async def start_messaging():
+    """Start the kafka producer, the outbox relay and the tracer."""
+    await producer.start()
+    log.info('Kafka producer started')
+
+    await outbox_relay.start()
+    log.info('Outbox relay started')
+
+    tracing.start()
+    log.info('Tracer client  initialized')
+
+
+async def start_redis_services(redis: AnyRedis):
+    """Start the caches, the rate limiter and the health checker."""
+    await token_cache.start(redis)
+    log.info('Token cache started')
+
+    await client_cache.start(redis)
+    log.info('Redis client-side cache started')
+
+    await rate_limiter.start(redis)
+    log.info('Rate limiter started')
+
+    await health_checker.start({
+        'redis': redis.ping,
+        'database': partial(ping_database, engine),
+        'kafka': producer.fetch_metadata,
+    })
+    log.info('Health checker started')
+
+
+async def stop_background_services():
+    """Stop the health checker, the password pool and kafka publishing."""
+    await health_checker.stop()
+    log.info('Health checker stopped')
+
+    await password_executor.stop()
+    log.info('Password executor stopped')
+
+    await outbox_relay.stop()
+    log.info('Outbox relay stopped')
+
+    await producer.stop()
+    log.info('kafkaproducer stopped')
+
+
+async def close_connections(redis: AnyRedis):
+    """Close the tracer, the redis caches and the connection pools."""
+    tracing.stop()
+    log.info('Tracer client  closed')
+
+    await token_cache.stop()
+    log.info('Token cache stopped')
+
+    await client_cache.stop()
+    log.info('Redis client-side cache stopped')
+
+    await redis.aclose()
+    log.info('Redis client closed')
+
+    await engine.dispose()
+    log.info('Database connection pool closed')
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Photo directory creation, kafka producer, tracer, redis start and stop."""  # noqa: E501
+    await start_workers()
+    await start_messaging()
+    app.state.jaeger_tracer = tracing.tracer
+
+    redis = create_redis()
+    app.state.redis = redis
+    log.info(
+        'Redis client initialized in {0} mode'.format(config.redis.mode),
+    )
+    await start_redis_services(redis)
+
+    yield
+
+    await stop_background_services()
+    await close_connections(redis)
+    mark_worker_stopped()
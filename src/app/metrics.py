@@ -1,7 +1,21 @@
-from typing import Final
+import glob
+import logging
+import os
+from typing import Any, Final
 
-from prometheus_client import Counter, Histogram
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    multiprocess,
+)
+
+from app.constants import MULTIPROCESS_DIRECTORY_VARIABLE, UNMATCHED_ROUTE
+from config import config
 
+log = logging.getLogger('uvicorn')
 SERVICE_PREFIX: Final[str] = 'stakrotckii_auth'
 REQUEST_COUNT = Counter(
     name=f'{SERVICE_PREFIX}_request_count',
@@ -12,7 +26,7 @@ REQUEST_DURATION = Histogram(
     name=f'{SERVICE_PREFIX}_request_duration',
     documentation='Time spend processing request',
     labelnames=['method', 'endpoint'],
-    buckets=(0.01, 0.025, 0.05, 0.1, 2.5, 5, 10),
+    buckets=config.metrics.request_duration_buckets,  # type: ignore
 )
 
 READY_PROBE = Counter(
@@ -26,3 +40,227 @@ AUTH_RESULT = Counter(
     documentation='Auth result metric',
     labelnames=['status'],
 )
+
+PASSWORD_QUEUE_DEPTH = Gauge(
+    name=f'{SERVICE_PREFIX}_password_queue_depth',
+    documentation='Password tasks waiting for a free worker',
+    multiprocess_mode='livesum',
+)
+
+PASSWORD_WAIT_TIME = Histogram(
+    name=f'{SERVICE_PREFIX}_password_wait_time',
+    documentation='Time password tasks spend waiting for a free worker',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+TOKEN_CACHE_HITS = Counter(
+    name=f'{SERVICE_PREFIX}_token_cache_hits',
+    documentation='Token checks served from the in-process cache',
+)
+
+TOKEN_CACHE_MISSES = Counter(
+    name=f'{SERVICE_PREFIX}_token_cache_misses',
+    documentation='Token checks not found in the in-process cache',
+)
+
+TOKEN_CACHE_EVICTIONS = Counter(
+    name=f'{SERVICE_PREFIX}_token_cache_evictions',
+    documentation='Tokens removed from the in-process cache',
+    labelnames=['reason'],
+)
+
+CLIENT_CACHE_HITS = Counter(
+    name=f'{SERVICE_PREFIX}_redis_client_cache_hits',
+    documentation='Redis keys served from the client-side cache',
+)
+
+CLIENT_CACHE_MISSES = Counter(
+    name=f'{SERVICE_PREFIX}_redis_client_cache_misses',
+    documentation='Redis keys not found in the client-side cache',
+)
+
+MISSING_LOGIN_CACHE = Counter(
+    name=f'{SERVICE_PREFIX}_missing_login_cache',
+    documentation='Missing login cache lookups',
+    labelnames=['result'],
+)
+
+RATE_LIMITED = Counter(
+    name=f'{SERVICE_PREFIX}_rate_limited',
+    documentation='Requests rejected by the rate limiter',
+    labelnames=['endpoint', 'key'],
+)
+
+ADMISSION_IN_FLIGHT = Gauge(
+    name=f'{SERVICE_PREFIX}_admission_in_flight',
+    documentation='Admitted requests being processed',
+    labelnames=['endpoint'],
+    multiprocess_mode='livesum',
+)
+
+ADMISSION_QUEUE_DEPTH = Gauge(
+    name=f'{SERVICE_PREFIX}_admission_queue_depth',
+    documentation='Requests waiting for admission',
+    labelnames=['endpoint'],
+    multiprocess_mode='livesum',
+)
+
+ADMISSION_REJECTED = Counter(
+    name=f'{SERVICE_PREFIX}_admission_rejected',
+    documentation='Requests shed by admission control',
+    labelnames=['endpoint', 'reason'],
+)
+
+PASSWORD_REHASHES = Counter(
+    name=f'{SERVICE_PREFIX}_password_rehashes',
+    documentation='Stored password hashes upgraded on login',
+    labelnames=['algorithm'],
+)
+
+PHOTO_BYTES_WRITTEN = Counter(
+    name=f'{SERVICE_PREFIX}_photo_bytes_written',
+    documentation='Bytes of uploaded photos written to storage',
+)
+
+PHOTO_UPLOAD_DURATION = Histogram(
+    name=f'{SERVICE_PREFIX}_photo_upload_duration',
+    documentation='Time spent writing uploaded photos to storage',
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+PHOTO_STORE_METHOD = Counter(
+    name=f'{SERVICE_PREFIX}_photo_store_method',
+    documentation='Uploaded photos stored by kernel copy or chunked copy',
+    labelnames=['method'],
+)
+
+KAFKA_DELIVERY_LATENCY = Histogram(
+    name=f'{SERVICE_PREFIX}_kafka_delivery_latency',
+    documentation='Time from sending a Kafka message to its acknowledgement',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+KAFKA_DELIVERY_FAILURES = Counter(
+    name=f'{SERVICE_PREFIX}_kafka_delivery_failures',
+    documentation='Kafka messages not acknowledged by the broker',
+)
+
+OUTBOX_RELAYED = Counter(
+    name=f'{SERVICE_PREFIX}_outbox_relayed',
+    documentation='Outbox events published to Kafka',
+)
+
+OUTBOX_RELAY_ERRORS = Counter(
+    name=f'{SERVICE_PREFIX}_outbox_relay_errors',
+    documentation='Outbox relay batches failed and left for retry',
+)
+
+
+DB_POOL_CHECKED_OUT = Gauge(
+    name=f'{SERVICE_PREFIX}_db_pool_checked_out',
+    documentation='Database connections in use',
+    multiprocess_mode='livesum',
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    name=f'{SERVICE_PREFIX}_db_pool_overflow',
+    documentation='Database connections opened above the pool size',
+    multiprocess_mode='livesum',
+)
+
+DB_POOL_WAIT = Histogram(
+    name=f'{SERVICE_PREFIX}_db_pool_wait_time',
+    documentation='Time spent getting a database connection from the pool',
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+
+DEPENDENCY_UP = Gauge(
+    name=f'{SERVICE_PREFIX}_dependency_up',
+    documentation='Result of the last dependency check, 1 if it passed',
+    labelnames=['dependency'],
+    multiprocess_mode='livemin',
+)
+
+EVENT_LOOP_LAG = Gauge(
+    name=f'{SERVICE_PREFIX}_event_loop_lag',
+    documentation='Delay of the last event loop heartbeat in seconds',
+    multiprocess_mode='livemax',
+)
+
+
+def route_template(scope: dict[str, Any]) -> str:
+    """Path template of the matched route for the endpoint label."""
+    route = scope.get('route')
+    if route is not None:
+        return route.path
+    if 'endpoint' in scope:
+        return scope['root_path'][len(scope.get('app_root_path', '')):]
+    return UNMATCHED_ROUTE
+
+
+def trace_exemplar(span: Any) -> dict[str, str] | None:
+    """Exemplar linking a metric sample to the request trace."""
+    context = getattr(span, 'context', None)
+    unwrap = getattr(context, 'unwrap', None)
+    if unwrap is not None:
+        context = unwrap()
+    trace_id = getattr(context, 'trace_id', None)
+    if not trace_id:
+        return None
+    return {'trace_id': format(trace_id, 'x')}
+
+
+def is_multiprocess() -> bool:
+    """Check whether metrics are shared by several worker processes."""
+    return MULTIPROCESS_DIRECTORY_VARIABLE in os.environ
+
+
+def metrics_registry() -> CollectorRegistry:
+    """Return the registry served at /metrics.
+
+    In multiprocess mode the registry aggregates the files written by
+    every worker into the ``PROMETHEUS_MULTIPROC_DIR`` directory.
+    The multiprocess mode of ``prometheus_client`` does not support
+    exemplars, so trace ids are not exported there.
+    """
+    if not is_multiprocess():
+        return REGISTRY
+    log.warning(
+        'Metrics run in multiprocess mode, trace exemplars are not exported',
+    )
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def is_running(pid: int) -> bool:
+    """Check whether the process exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def remove_dead_workers():
+    """Drop gauge values of workers that exited without a clean shutdown.
+
+    Counters and histograms of dead workers are kept, so the aggregated
+    series never go backwards.
+    """
+    if not is_multiprocess():
+        return
+    directory = os.environ[MULTIPROCESS_DIRECTORY_VARIABLE]
+    for gauge_file in glob.glob(os.path.join(directory, 'gauge_*.db')):
+        file_name = os.path.splitext(gauge_file)[0]
+        pid = int(file_name.rsplit('_', 1)[1])
+        if not is_running(pid):
+            multiprocess.mark_process_dead(pid)
+
+
+def mark_worker_stopped():
+    """Drop live gauge values of the current worker on shutdown."""
+    if is_multiprocess():
+        multiprocess.mark_process_dead(os.getpid())
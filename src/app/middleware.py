@@ -0,0 +1,289 @@
+import time
+from contextlib import suppress
+from typing import Any
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from opentracing import (
+    InvalidCarrierException,
+    SpanContextCorruptedException,
+    global_tracer,
+    propagation,
+    tags,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.constants import (
+    PHOTO_TOO_LARGE,
+    SERVICE_OVERLOADED,
+    UPLOAD_FORM_OVERHEAD,
+)
+from app.metrics import (
+    AUTH_RESULT,
+    READY_PROBE,
+    REQUEST_COUNT,
+    REQUEST_DURATION,
+    route_template,
+    trace_exemplar,
+)
+from app.service import (
+    AdmissionLimiter,
+    AdmissionRejectedError,
+    PhotoTooLargeError,
+    photo_storage,
+)
+from app.tracing import is_sampled, request_sampled
+from config import config
+
+UNTRACED_PATHS = (
+    '/ready',
+    '/live',
+    '/metrics/',
+    '/docs',
+    '/openapi.json',
+)
+
+
+class ObservabilityMiddleware:
+    """Request metrics and tracing as a single pure ASGI middleware.
+
+    The response stream is passed through untouched, only the status code
+    is read from the ``http.response.start`` message. Nested spans are
+    created only for sampled requests, see ``app.tracing.tracer``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """Middleware initialization."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Trace and measure HTTP requests."""
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        start_time = time.perf_counter()
+        if scope['path'].endswith(UNTRACED_PATHS):
+            status_code, error = await self._call_app(scope, receive, send)
+            exemplar = None
+        else:
+            status_code, error, exemplar = await self._call_traced_app(
+                scope,
+                receive,
+                send,
+            )
+        self._observe(
+            scope,
+            status_code,
+            time.perf_counter() - start_time,
+            exemplar,
+        )
+        if error is not None:
+            raise error
+
+    async def _call_traced_app(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> tuple[int, Exception | None, dict[str, str] | None]:
+        """Run the application in a server span.
+
+        Unsampled spans are neither tagged nor linked from exemplars.
+        """
+        with self._start_span(scope) as span_scope:
+            sampled = is_sampled(span_scope.span)
+            sampled_token = request_sampled.set(sampled)
+            status_code, error = await self._call_app(scope, receive, send)
+            request_sampled.reset(sampled_token)
+            if not sampled:
+                return status_code, error, None
+            self._finish_span(scope, span_scope.span, status_code)
+            return status_code, error, trace_exemplar(span_scope.span)
+
+    async def _call_app(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> tuple[int, Exception | None]:
+        """Run the application, return response status and raised error."""
+        response_status = [status.HTTP_500_INTERNAL_SERVER_ERROR]
+
+        async def send_with_status(message: Message):  # noqa: WPS430
+            if message['type'] == 'http.response.start':
+                response_status[0] = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        except Exception as error:
+            return status.HTTP_500_INTERNAL_SERVER_ERROR, error
+        return response_status[0], None
+
+    @staticmethod
+    def _start_span(scope: Scope):
+        """Start a server span continuing the trace from request headers."""
+        carrier = {
+            header_name.decode('latin-1'): header_value.decode('latin-1')
+            for header_name, header_value in scope['headers']
+        }
+        try:
+            span_ctx = global_tracer().extract(
+                propagation.Format.HTTP_HEADERS,
+                carrier,
+            )
+        except (InvalidCarrierException, SpanContextCorruptedException):
+            span_ctx = None
+        return global_tracer().start_active_span(
+            f'transactions_{scope["method"]}_{scope["path"]}',
+            child_of=span_ctx,
+            tags={
+                tags.SPAN_KIND: tags.SPAN_KIND_RPC_SERVER,
+                tags.HTTP_METHOD: scope['method'],
+                tags.HTTP_URL: '{scheme}://{host}{path}'.format(
+                    scheme=scope['scheme'],
+                    host=carrier.get('host', ''),
+                    path=scope['path'],
+                ),
+            },
+        )
+
+    @staticmethod
+    def _finish_span(scope: Scope, span: Any, status_code: int):
+        """Name the span after the route and tag the response status."""
+        span.set_operation_name(
+            f'transactions_{scope["method"]}_{route_template(scope)}',
+        )
+        span.set_tag(tags.HTTP_STATUS_CODE, status_code)
+        if status_code >= status.HTTP_500_INTERNAL_SERVER_ERROR:
+            span.set_tag(tags.ERROR, value=True)
+
+    @staticmethod
+    def _observe(
+        scope: Scope,
+        status_code: int,
+        duration: float,
+        exemplar: dict[str, str] | None,
+    ):
+        """Request count and duration metrics."""
+        endpoint = route_template(scope)
+        REQUEST_DURATION.labels(
+            method=scope['method'],
+            endpoint=endpoint,
+        ).observe(duration, exemplar=exemplar)
+        REQUEST_COUNT.labels(
+            method=scope['method'],
+            endpoint=endpoint,
+            status=status_code,
+        ).inc(exemplar=exemplar)
+        if scope['path'] == '/api/healthz/ready':
+            READY_PROBE.labels(status=status_code).inc()
+        if scope['path'] == '/api/auth':
+            AUTH_RESULT.labels(status=status_code).inc()
+
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized photo uploads while the body is received.
+
+    Requests declaring a too large ``Content-Length`` are rejected before
+    the body is read. Other bodies, chunked ones included, are counted as
+    they arrive and rejected once the total passes the limit; messages the
+    application sends afterwards are dropped.
+    """
+
+    def __init__(self, app: ASGIApp, path: str):
+        """Middleware initialization."""
+        self.app = app
+        self.path = path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Limit the body size of the upload request."""
+        if scope['type'] != 'http' or scope['path'] != self.path:
+            await self.app(scope, receive, send)
+            return
+        max_body_size = photo_storage.max_size + UPLOAD_FORM_OVERHEAD
+        if self._content_length(scope) > max_body_size:
+            await self._reject(scope, receive, send)
+            return
+        await self._call_limited_app(scope, receive, send, max_body_size)
+
+    async def _call_limited_app(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        max_body_size: int,
+    ):
+        """Run the application, answer 413 once the body is too large."""
+        body_size = [0]
+        response_started = [False]
+
+        async def limited_receive() -> Message:  # noqa: WPS430
+            message = await receive()
+            body_size[0] += len(message.get('body', b''))
+            if body_size[0] > max_body_size:
+                raise PhotoTooLargeError
+            return message
+
+        async def limited_send(message: Message):  # noqa: WPS430
+            if body_size[0] <= max_body_size:
+                response_started[0] = True
+                await send(message)
+
+        with suppress(PhotoTooLargeError):
+            await self.app(scope, limited_receive, limited_send)
+        if body_size[0] > max_body_size and not response_started[0]:
+            await self._reject(scope, receive, send)
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send):
+        """Send the 413 response."""
+        response = JSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content={
+                'detail': PHOTO_TOO_LARGE.format(
+                    max_size=photo_storage.max_size,
+                ),
+            },
+        )
+        await response(scope, receive, send)
+
+    @staticmethod
+    def _content_length(scope: Scope) -> int:
+        """Body size from the Content-Length header, zero when unknown."""
+        for header_name, header_value in scope['headers']:
+            if header_name == b'content-length' and header_value.isdigit():
+                return int(header_value)
+        return 0
+
+
+class AdmissionControlMiddleware:
+    """Shed requests to CPU-heavy endpoints that cannot start in time."""
+
+    def __init__(self, app: ASGIApp, limiters: dict[str, AdmissionLimiter]):
+        """Middleware initialization."""
+        self.app = app
+        self.limiters = limiters
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        """Run the request within the concurrency limit of its path."""
+        limiter = None
+        if scope['type'] == 'http':
+            limiter = self.limiters.get(scope['path'])
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            async with limiter.admit():
+                await self.app(scope, receive, send)
+        except AdmissionRejectedError:
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={'detail': SERVICE_OVERLOADED},
+                headers={
+                    'Retry-After': str(
+                        config.admission.retry_after,  # type: ignore
+                    ),
+                },
+            )
+            await response(scope, receive, send)
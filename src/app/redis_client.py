@@ -0,0 +1,108 @@
+from typing import Any
+
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.cluster import RedisCluster
+from redis.asyncio.retry import Retry
+from redis.asyncio.sentinel import Sentinel, SentinelConnectionPool
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from config import config
+
+AnyRedis = Redis | RedisCluster
+
+
+class BlockingSentinelConnectionPool(
+    SentinelConnectionPool,
+    BlockingConnectionPool,
+):
+    """Sentinel connection pool waiting for a free connection.
+
+    ``timeout`` bounds the wait like in ``BlockingConnectionPool``, while
+    the primary address is resolved through the sentinels.
+    """
+
+
+def sentinel_addresses(sentinels: list[str]) -> list[tuple[str, int]]:
+    """Parse ``host:port`` addresses of sentinels."""
+    addresses = []
+    for sentinel in sentinels:
+        host, port = sentinel.rsplit(':', 1)
+        addresses.append((host, int(port)))
+    return addresses
+
+
+def connection_options(settings: Any) -> dict[str, Any]:
+    """Return connection settings shared by every topology."""
+    return {
+        'decode_responses': settings.decode_responses,
+        'protocol': 2,
+        'socket_timeout': settings.socket_timeout,
+        'socket_connect_timeout': settings.socket_connect_timeout,
+        'health_check_interval': settings.health_check_interval,
+        'retry': Retry(
+            ExponentialBackoff(
+                cap=settings.retry_backoff_cap,
+                base=settings.retry_backoff_base,
+            ),
+            settings.retry_attempts,
+        ),
+        'retry_on_error': [RedisConnectionError, RedisTimeoutError],
+    }
+
+
+def create_redis() -> AnyRedis:
+    """Create a Redis client for the configured topology.
+
+    Standalone and sentinel clients use a blocking pool of at most
+    ``max_connections``, so a burst waits up to ``pool_timeout`` for a
+    free connection instead of failing. Sentinel clients resolve the
+    current primary on reconnection, so a failover is retried instead
+    of stalling requests.
+    """
+    settings = config.redis  # type: ignore
+    options = connection_options(settings)
+    if settings.mode == 'cluster':
+        return RedisCluster.from_url(
+            settings.url,
+            max_connections=settings.max_connections,
+            **options,
+        )
+    if settings.mode == 'sentinel':
+        sentinel = Sentinel(
+            sentinel_addresses(settings.sentinels),
+            sentinel_kwargs={
+                'socket_timeout': settings.socket_timeout,
+                'socket_connect_timeout': settings.socket_connect_timeout,
+            },
+        )
+        return sentinel.master_for(
+            settings.sentinel_service_name,
+            connection_pool_class=BlockingSentinelConnectionPool,
+            db=settings.db,
+            max_connections=settings.max_connections,
+            timeout=settings.pool_timeout,
+            **options,
+        )
+    return Redis.from_pool(
+        BlockingConnectionPool.from_url(
+            settings.url,
+            db=settings.db,
+            max_connections=settings.max_connections,
+            timeout=settings.pool_timeout,
+            **options,
+        ),
+    )
+
+
+def is_cluster(redis: AnyRedis) -> bool:
+    """Check whether the client talks to a Redis Cluster."""
+    return isinstance(redis, RedisCluster)
+
+
+async def mget(redis: AnyRedis, keys: list[str]) -> list[str | None]:
+    """MGET that splits keys by hash slot on a cluster."""
+    if is_cluster(redis):
+        return await redis.mget_nonatomic(keys)  # type: ignore
+    return await redis.mget(keys)
@@ -0,0 +1,115 @@
+"""Production entry point running the service in several worker processes.
+
+Run from the repository root::
+
+    PYTHONPATH=src python -m app.server
+"""
+
+import glob
+import math
+import os
+from typing import Any
+
+import uvicorn
+
+from app.constants import (
+    CGROUP_V1_CPU_PERIOD,
+    CGROUP_V1_CPU_QUOTA,
+    CGROUP_V2_CPU_MAX,
+    MULTIPROCESS_DIRECTORY_VARIABLE,
+)
+from config import config
+
+
+def read_cgroup_file(path: str) -> str | None:
+    """Read a cgroup file, ``None`` outside of a cgroup."""
+    try:
+        with open(path) as cgroup_file:
+            return cgroup_file.read().strip()
+    except OSError:
+        return None
+
+
+def cpu_quota() -> float | None:
+    """Return CPUs allowed by the cgroup quota, ``None`` when unlimited."""
+    cpu_max = read_cgroup_file(CGROUP_V2_CPU_MAX)
+    if cpu_max is not None:
+        quota, period = cpu_max.split()
+    else:
+        quota = read_cgroup_file(CGROUP_V1_CPU_QUOTA) or '-1'
+        period = read_cgroup_file(CGROUP_V1_CPU_PERIOD) or '0'
+    if quota in {'max', '-1'} or not int(period):
+        return None
+    return int(quota) / int(period)
+
+
+def worker_count() -> int:
+    """Return configured workers or one worker per CPU of the process.
+
+    A fractional CPU quota is rounded down, so workers are not throttled,
+    but at least one worker is started.
+    """
+    if config.service.workers > 0:  # type: ignore
+        return config.service.workers  # type: ignore
+    cpus = len(os.sched_getaffinity(0))
+    quota = cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, math.floor(quota))
+    return max(cpus, 1)
+
+
+def server_options() -> dict[str, Any]:
+    """Return uvicorn settings shared by every worker."""
+    return {
+        'loop': config.service.loop,  # type: ignore
+        'http': config.service.http,  # type: ignore
+        'backlog': config.service.backlog,  # type: ignore
+        'limit_concurrency': config.service.limit_concurrency,  # type: ignore
+        'timeout_keep_alive': (
+            config.service.keep_alive_timeout  # type: ignore
+        ),
+        'timeout_graceful_shutdown': (
+            config.service.graceful_timeout  # type: ignore
+        ),
+        'proxy_headers': config.service.proxy_headers,  # type: ignore
+        'forwarded_allow_ips': (
+            config.service.forwarded_allow_ips  # type: ignore
+        ),
+    }
+
+
+def prepare_metrics_directory(workers: int):
+    """Switch metrics to multiprocess mode for several workers.
+
+    ``PROMETHEUS_MULTIPROC_DIR`` is inherited by the workers, so every
+    worker writes its metrics to that directory and /metrics aggregates
+    them. Files left by the previous run are removed on startup.
+    """
+    if workers > 1:
+        os.environ.setdefault(
+            MULTIPROCESS_DIRECTORY_VARIABLE,
+            config.metrics.multiprocess_directory,  # type: ignore
+        )
+    directory = os.environ.get(MULTIPROCESS_DIRECTORY_VARIABLE)
+    if directory is None:
+        return
+    os.makedirs(directory, exist_ok=True)
+    for metrics_file in glob.glob(os.path.join(directory, '*.db')):
+        os.remove(metrics_file)
+
+
+def main():
+    """Run the service workers."""
+    workers = worker_count()
+    prepare_metrics_directory(workers)
+    uvicorn.run(
+        'app.main:app',
+        host=config.service.host,  # type: ignore
+        port=config.service.port,  # type: ignore
+        workers=workers,
+        **server_options(),
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,17 @@
+from .admission import (
+    AdmissionLimiter,
+    AdmissionRejectedError,
+    admission_limiters,
+)
+from .client_cache import client_cache
+from .executor import password_executor
+from .hashers import password_hashers
+from .health import health_checker
+from .keys import key_ring
+from .login_cache import login_cache
+from .outbox import outbox_relay
 from .producer import producer
+from .rate_limiter import rate_limiter
 from .service import AuthService
+from .storage import PhotoTooLargeError, photo_storage
+from .token_cache import token_cache
@@ -0,0 +1,87 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_REJECTED,
+)
+from config import config
+
+
+class AdmissionRejectedError(Exception):
+    """Request could not be admitted in time."""
+
+    def __init__(self, reason: str):
+        """Rejection reason, ``queue_full`` or ``timeout``."""
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdmissionLimiter:
+    """Concurrency limit with a bounded wait queue and a wait deadline.
+
+    Requests over ``concurrency`` wait in the queue for at most
+    ``timeout`` seconds, requests over ``queue_size`` waiting ones are
+    rejected at once, so overload is shed instead of queued.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        queue_size: int,
+        timeout: float,
+    ):
+        """Admission limiter initialization."""
+        self.name = name
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.waiting = 0
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Hold a concurrency slot or raise AdmissionRejectedError."""
+        await self._acquire()
+        ADMISSION_IN_FLIGHT.labels(endpoint=self.name).inc()
+        try:
+            yield
+        finally:
+            ADMISSION_IN_FLIGHT.labels(endpoint=self.name).dec()
+            self.semaphore.release()
+
+    async def _acquire(self):
+        """Take a free slot, waiting in the queue until the deadline."""
+        if not self.semaphore.locked():
+            await self.semaphore.acquire()
+            return
+        if self.waiting >= self.queue_size:
+            self._reject('queue_full')
+        self.waiting += 1
+        ADMISSION_QUEUE_DEPTH.labels(endpoint=self.name).inc()
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.timeout)
+        except TimeoutError:
+            self._reject('timeout')
+        finally:
+            self.waiting -= 1
+            ADMISSION_QUEUE_DEPTH.labels(endpoint=self.name).dec()
+
+    def _reject(self, reason: str):
+        """Count and raise the rejection."""
+        ADMISSION_REJECTED.labels(endpoint=self.name, reason=reason).inc()
+        raise AdmissionRejectedError(reason)
+
+
+admission_limiters = {
+    path: AdmissionLimiter(
+        name=path,
+        concurrency=limit.concurrency,
+        queue_size=limit.queue_size,
+        timeout=limit.timeout,
+    )
+    for path, limit in config.admission.endpoints.items()  # type: ignore
+    if config.admission.enabled  # type: ignore
+}
@@ -0,0 +1,147 @@
+from collections import OrderedDict
+
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+from redis.asyncio.connection import Connection
+
+from app.metrics import CLIENT_CACHE_HITS, CLIENT_CACHE_MISSES
+from app.service.invalidation import InvalidatedCache
+from config import config
+
+INVALIDATION_CHANNEL = '__redis__:invalidate'
+
+
+async def run_command(connection: Connection, *args: str | int):
+    """Run a command on a connection outside of the pool."""
+    await connection.send_command(*args)
+    return await connection.read_response()
+
+
+async def subscribe_invalidations(pubsub: PubSub) -> int:
+    """Subscribe to invalidation messages, return the connection id."""
+    await pubsub.connect()
+    subscriber_id = await run_command(
+        pubsub.connection,  # type: ignore
+        'CLIENT',
+        'ID',
+    )
+    await pubsub.subscribe(INVALIDATION_CHANNEL)
+    return subscriber_id
+
+
+class ClientSideCache(InvalidatedCache):
+    """Server-assisted client-side cache of Redis values.
+
+    A dedicated connection enables ``CLIENT TRACKING`` in broadcasting
+    mode for the key prefix and redirects invalidation messages to a
+    subscribed connection, so every write of a cached key, its expiration
+    or eviction drops the local copy. Values are served from the cache
+    only while both connections are alive, missing keys are cached too.
+    """
+
+    description = 'Client-side cache'
+
+    def __init__(  # noqa: WPS211
+        self,
+        enabled: bool,
+        max_size: int,
+        prefix: str,
+        reconnect_delay: float,
+        check_interval: float,
+    ):
+        """Client-side cache initialization."""
+        super().__init__(enabled, reconnect_delay)
+        self.max_size = max_size
+        self.prefix = prefix
+        self.check_interval = check_interval
+        self.entries: OrderedDict[str, str | None] = OrderedDict()
+
+    def get_many(self, keys: list[str]) -> dict[str, str | None]:
+        """Return cached values of the keys, uncached keys are omitted."""
+        if not self.subscribed:
+            return {}
+        cached = {
+            key: self.entries[key] for key in self.entries.keys() & set(keys)
+        }
+        for cached_key in cached:
+            self.entries.move_to_end(cached_key)
+        CLIENT_CACHE_HITS.inc(len(cached))
+        CLIENT_CACHE_MISSES.inc(len(keys) - len(cached))
+        return cached
+
+    def put_many(self, fetched: dict[str, str | None], version: int):
+        """Cache tracked keys read while the cache was at the version.
+
+        Keys are dropped when an invalidation arrived since, because they
+        might have been read before the invalidating write.
+        """
+        if not self.subscribed or version != self.version:
+            return
+        for key, stored in fetched.items():
+            if key.startswith(self.prefix):
+                self.entries[key] = stored
+                self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, keys: list[str] | None):
+        """Drop invalidated keys, all keys when the database was flushed."""
+        self.version += 1
+        if keys is None:
+            self.entries.clear()
+            return
+        for key in keys:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        """Drop all cached values."""
+        super().clear()
+        self.entries.clear()
+
+    async def _receive(self, redis: Redis):
+        """Hold the tracking connection while consuming invalidations.
+
+        The tracking connection is closed afterwards, so tracking stops
+        with it.
+        """
+        tracking = await redis.connection_pool.get_connection('CLIENT')
+        try:  # noqa: WPS501
+            async with redis.pubsub() as pubsub:
+                await self._consume(pubsub, tracking)
+        finally:
+            await tracking.disconnect()
+            await redis.connection_pool.release(tracking)
+
+    async def _consume(self, pubsub: PubSub, tracking: Connection):
+        """Redirect invalidations of the prefix and apply them."""
+        subscriber_id = await subscribe_invalidations(pubsub)
+        await run_command(
+            tracking,
+            'CLIENT',
+            'TRACKING',
+            'ON',
+            'REDIRECT',
+            subscriber_id,
+            'BCAST',
+            'PREFIX',
+            self.prefix,
+        )
+        self.subscribed = True
+        while self.subscribed:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True,
+                timeout=self.check_interval,
+            )
+            if message is None:
+                await run_command(tracking, 'PING')
+            elif message['type'] == 'message':
+                self.invalidate(message['data'])
+
+
+client_cache = ClientSideCache(
+    enabled=config.redis.client_cache_enabled,  # type: ignore
+    max_size=config.redis.client_cache_max_size,  # type: ignore
+    prefix=config.redis.token_key_prefix,  # type: ignore
+    reconnect_delay=config.token_cache.reconnect_delay,  # type: ignore
+    check_interval=config.redis.client_cache_check_interval,  # type: ignore
+)
@@ -0,0 +1,76 @@
+import asyncio
+import time
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, Callable
+
+from app.metrics import PASSWORD_QUEUE_DEPTH, PASSWORD_WAIT_TIME
+from config import config
+
+
+class PasswordExecutor:
+    """Bounded worker pool for CPU-bound password work."""
+
+    def __init__(self, executor_type: str, max_workers: int):
+        """Password executor initialization."""
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.executor: Executor | None = None
+        self.semaphore: asyncio.Semaphore | None = None
+
+    async def start(self):
+        """Password executor start method."""
+        if self.executor_type == 'process':
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        else:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='password',
+            )
+        self.semaphore = asyncio.Semaphore(self.max_workers)
+
+    async def stop(self):
+        """Password executor stop method."""
+        if self.executor:
+            await asyncio.to_thread(
+                self.executor.shutdown,
+                wait=True,
+                cancel_futures=True,
+            )
+            self.executor = None
+            self.semaphore = None
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run function in the pool once a worker is free."""
+        if self.executor is None or self.semaphore is None:
+            raise RuntimeError('Password executor is not started')
+        queued_at = time.perf_counter()
+        with PASSWORD_QUEUE_DEPTH.track_inprogress():
+            await self.semaphore.acquire()
+        PASSWORD_WAIT_TIME.observe(time.perf_counter() - queued_at)
+        future = asyncio.get_running_loop().run_in_executor(
+            self.executor,
+            func,
+            *args,
+        )
+        try:  # noqa: WPS501
+            return await asyncio.shield(future)
+        finally:
+            if future.done():
+                self._release(future)
+            else:
+                future.add_done_callback(self._release)
+
+    def _release(self, _future: asyncio.Future):
+        """Free the worker slot."""
+        if self.semaphore is not None:
+            self.semaphore.release()
+
+
+password_executor = PasswordExecutor(
+    executor_type=config.service.password_executor,  # type: ignore
+    max_workers=config.service.password_workers,  # type: ignore
+)
@@ -0,0 +1,5 @@
+from app.service.hashers.argon2_hasher import Argon2Hasher
+from app.service.hashers.base import PasswordHasher, calibrated, measure
+from app.service.hashers.bcrypt_hasher import BcryptHasher
+from app.service.hashers.registry import PasswordHashers, password_hashers
+from app.service.hashers.scrypt_hasher import ScryptHasher
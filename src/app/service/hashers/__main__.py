@@ -0,0 +1,23 @@
+"""Print hasher settings reaching the target hashing time.
+
+Run from the repository root::
+
+    PYTHONPATH=src python -m app.service.hashers 0.25
+"""
+
+import sys
+
+from app.service.hashers.base import calibrated, measure
+from app.service.hashers.registry import password_hashers
+from config import config
+
+target_time = (
+    float(sys.argv[1])
+    if len(sys.argv) > 1
+    else config.password_hashing.target_time  # type: ignore
+)
+calibrated_hasher = calibrated(password_hashers.default, target_time)
+hashing_time = measure(calibrated_hasher)
+sys.stdout.write('# {0:.3f}s per hash\n'.format(hashing_time))
+for setting, parameter in calibrated_hasher.settings().items():
+    sys.stdout.write('{0}: {1}\n'.format(setting, parameter))
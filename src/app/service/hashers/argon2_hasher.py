@@ -0,0 +1,64 @@
+import argon2
+from argon2.exceptions import InvalidHashError, VerificationError
+
+from app.service.hashers.base import PasswordHasher
+
+
+class Argon2Hasher(PasswordHasher):
+    """Argon2id with ``time_cost`` as the tuned cost."""
+
+    algorithm = 'argon2id'
+    prefixes = ('$argon2id$',)
+    min_cost = 1
+
+    def __init__(self, time_cost: int, memory_cost: int, parallelism: int):
+        """Argon2id hasher initialization."""
+        self.hasher = argon2.PasswordHasher(
+            time_cost=time_cost,
+            memory_cost=memory_cost,
+            parallelism=parallelism,
+            type=argon2.Type.ID,
+        )
+
+    def hash(self, password: str) -> str:
+        """Hash the password with a random salt."""
+        return self.hasher.hash(password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """Check the password against the hash, ``False`` if it is corrupt."""
+        try:
+            return self.hasher.verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Check whether the hash is weaker or corrupt."""
+        try:
+            stored_settings = argon2.extract_parameters(hashed_password)
+        except InvalidHashError:
+            return True
+        is_time_cost_lower = stored_settings.time_cost < self.hasher.time_cost
+        return is_time_cost_lower or (
+            stored_settings.memory_cost < self.hasher.memory_cost
+        )
+
+    def with_cost(self, cost: int) -> 'Argon2Hasher':
+        """Copy the hasher with other time cost."""
+        return Argon2Hasher(
+            time_cost=cost,
+            memory_cost=self.hasher.memory_cost,
+            parallelism=self.hasher.parallelism,
+        )
+
+    @property
+    def cost(self) -> int:
+        """Return the main cost parameter."""
+        return self.hasher.time_cost
+
+    def settings(self) -> dict[str, int]:
+        """Return parameters in the ``password_hashing`` settings format."""
+        return {
+            'argon2_time_cost': self.hasher.time_cost,
+            'argon2_memory_cost': self.hasher.memory_cost,
+            'argon2_parallelism': self.hasher.parallelism,
+        }
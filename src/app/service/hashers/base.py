@@ -0,0 +1,60 @@
+import secrets
+import time
+from abc import ABC, abstractmethod
+
+
+def measure(hasher: 'PasswordHasher') -> float:
+    """Measure the time of a single password hashing."""
+    started_at = time.perf_counter()
+    hasher.hash(secrets.token_urlsafe())
+    return time.perf_counter() - started_at
+
+
+class PasswordHasher(ABC):
+    """Password hashing algorithm with tunable cost.
+
+    Stored hashes carry the algorithm and its parameters, so every hasher
+    recognizes its own hashes and tells whether they are weaker than the
+    current parameters.
+    """
+
+    algorithm = ''
+    prefixes: tuple[str, ...] = ()
+    min_cost = 1
+
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        """Hash the password with a random salt."""
+
+    @abstractmethod
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """Check the password against the hash, ``False`` if it is corrupt."""
+
+    def identifies(self, hashed_password: str) -> bool:
+        """Check whether the hash was produced by this algorithm."""
+        return hashed_password.startswith(self.prefixes)
+
+    @abstractmethod
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Check whether the hash is weaker than the current parameters."""
+
+    @abstractmethod
+    def with_cost(self, cost: int) -> 'PasswordHasher':
+        """Copy the hasher with the main cost parameter changed."""
+
+    @property
+    @abstractmethod
+    def cost(self) -> int:
+        """Return the main cost parameter."""
+
+    @abstractmethod
+    def settings(self) -> dict[str, int]:
+        """Return parameters in the ``password_hashing`` settings format."""
+
+
+def calibrated(hasher: PasswordHasher, target_time: float) -> PasswordHasher:
+    """Find the lowest cost of the hasher reaching the target hashing time."""
+    candidate = hasher.with_cost(hasher.min_cost)
+    while measure(candidate) < target_time:
+        candidate = candidate.with_cost(candidate.cost + 1)
+    return candidate
@@ -0,0 +1,51 @@
+import bcrypt
+
+from app.constants import BCRYPT_PREFIXES, ENCODING_FORMAT
+from app.service.hashers.base import PasswordHasher
+
+
+class BcryptHasher(PasswordHasher):
+    """Bcrypt with ``rounds`` as the logarithmic cost."""
+
+    algorithm = 'bcrypt'
+    prefixes = BCRYPT_PREFIXES
+    min_cost = 4
+
+    def __init__(self, rounds: int):
+        """Bcrypt hasher initialization."""
+        self.rounds = rounds
+
+    def hash(self, password: str) -> str:
+        """Hash the password with a random salt."""
+        return bcrypt.hashpw(
+            password.encode(ENCODING_FORMAT),
+            bcrypt.gensalt(self.rounds),
+        ).decode(ENCODING_FORMAT)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """Check the password against the hash, ``False`` if it is corrupt."""
+        try:
+            return bcrypt.checkpw(
+                password.encode(ENCODING_FORMAT),
+                hashed_password.encode(ENCODING_FORMAT),
+            )
+        except ValueError:
+            return False
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Check whether the hash is weaker or corrupt."""
+        rounds = hashed_password.split('$')[2]
+        return not rounds.isdigit() or int(rounds) < self.rounds
+
+    def with_cost(self, cost: int) -> 'BcryptHasher':
+        """Copy the hasher with other rounds."""
+        return BcryptHasher(rounds=cost)
+
+    @property
+    def cost(self) -> int:
+        """Return the main cost parameter."""
+        return self.rounds
+
+    def settings(self) -> dict[str, int]:
+        """Return parameters in the ``password_hashing`` settings format."""
+        return {'bcrypt_rounds': self.rounds}
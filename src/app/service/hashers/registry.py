@@ -0,0 +1,83 @@
+import secrets
+
+from app.service.hashers.argon2_hasher import Argon2Hasher
+from app.service.hashers.base import PasswordHasher, calibrated
+from app.service.hashers.bcrypt_hasher import BcryptHasher
+from app.service.hashers.scrypt_hasher import ScryptHasher
+from config import config
+
+
+class PasswordHashers:
+    """Registry of supported hashers.
+
+    New passwords are hashed by the default hasher, stored hashes are
+    verified by the hasher that produced them. Instances are pickled
+    with their parameters, so bound methods can run in worker processes.
+    """
+
+    def __init__(self, hashers: list[PasswordHasher], default: str):
+        """Password hashers initialization."""
+        self.hashers = {hasher.algorithm: hasher for hasher in hashers}
+        self.default = self.hashers[default]
+        self.dummy_password_hash: str | None = None
+
+    def hash(self, password: str) -> str:
+        """Hash the password with the default hasher."""
+        return self.default.hash(password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """Check the password with the hasher of the stored hash."""
+        for hasher in self.hashers.values():
+            if hasher.identifies(hashed_password):
+                return hasher.verify(password, hashed_password)
+        return False
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Check whether the hash should be replaced by the default one."""
+        if not self.default.identifies(hashed_password):
+            return True
+        return self.default.needs_rehash(hashed_password)
+
+    def dummy_hash(self) -> str:
+        """Return a hash of a random password made by the default hasher.
+
+        Verified for unknown logins, so rejecting them costs the same as
+        a wrong password.
+        """
+        if self.dummy_password_hash is None:
+            self.dummy_password_hash = self.hash(secrets.token_urlsafe())
+        return self.dummy_password_hash
+
+    def calibrate(self, target_time: float):
+        """Tune the default hasher cost for the target hashing time."""
+        self.default = calibrated(self.default, target_time)
+        self.hashers[self.default.algorithm] = self.default
+        self.dummy_password_hash = None
+
+
+password_hashers = PasswordHashers(
+    hashers=[
+        BcryptHasher(
+            rounds=config.password_hashing.bcrypt_rounds,  # type: ignore
+        ),
+        ScryptHasher(
+            ln=config.password_hashing.scrypt_ln,  # type: ignore
+            block_size=(
+                config.password_hashing.scrypt_block_size  # type: ignore
+            ),
+            parallelism=(
+                config.password_hashing.scrypt_parallelism  # type: ignore
+            ),
+        ),
+        Argon2Hasher(
+            time_cost=config.password_hashing.argon2_time_cost,  # type: ignore
+            memory_cost=(
+                config.password_hashing.argon2_memory_cost  # type: ignore
+            ),
+            parallelism=(
+                config.password_hashing.argon2_parallelism  # type: ignore
+            ),
+        ),
+    ],
+    default=config.password_hashing.algorithm,  # type: ignore
+)
@@ -0,0 +1,143 @@
+import base64
+import hashlib
+import hmac
+import os
+
+from app.constants import (
+    ENCODING_FORMAT,
+    INVALID_PASSWORD_HASH,
+    SCRYPT_HASH_PARTS,
+    SCRYPT_KEY_LENGTH,
+    SCRYPT_MEMORY_FACTOR,
+    SCRYPT_SALT_LENGTH,
+)
+from app.service.hashers.base import PasswordHasher
+
+SETTING_NAMES = frozenset(('ln', 'r', 'p'))
+
+
+def derive_key(password: str, salt: bytes, cost_settings: dict[str, int]):
+    """Derive the key, allowing twice the memory the settings need."""
+    cpu_cost = 2 ** cost_settings['ln']
+    block_size = cost_settings['r']
+    return hashlib.scrypt(
+        password.encode(ENCODING_FORMAT),
+        salt=salt,
+        n=cpu_cost,
+        r=block_size,
+        p=cost_settings['p'],
+        maxmem=SCRYPT_MEMORY_FACTOR * block_size * cpu_cost,
+        dklen=SCRYPT_KEY_LENGTH,
+    )
+
+
+def encode(raw: bytes) -> str:
+    """Encode salt or key as unpadded base64."""
+    return base64.b64encode(raw).rstrip(b'=').decode(ENCODING_FORMAT)
+
+
+def decode(encoded: str) -> bytes:
+    """Decode salt or key from unpadded base64."""
+    return base64.b64decode(
+        encoded + '=' * (-len(encoded) % 4),
+        validate=True,
+    )
+
+
+def parse_hash(hashed_password: str) -> tuple[dict[str, int], bytes, bytes]:
+    """Split the stored hash into cost settings, salt and key.
+
+    Raises ``ValueError`` for a truncated or corrupt hash.
+    """
+    hash_parts = hashed_password.split('$')
+    if len(hash_parts) != SCRYPT_HASH_PARTS:
+        raise ValueError(INVALID_PASSWORD_HASH)
+    pairs = [pair.split('=') for pair in hash_parts[2].split(',')]
+    cost_settings = {name: int(cost) for name, cost in pairs}
+    if cost_settings.keys() != SETTING_NAMES:
+        raise ValueError(INVALID_PASSWORD_HASH)
+    return cost_settings, decode(hash_parts[3]), decode(hash_parts[4])
+
+
+def derive_stored_key(
+    password: str,
+    hashed_password: str,
+) -> tuple[bytes, bytes]:
+    """Derive the key with the stored settings, return it with stored key."""
+    cost_settings, salt, stored_key = parse_hash(hashed_password)
+    return derive_key(password, salt, cost_settings), stored_key
+
+
+class ScryptHasher(PasswordHasher):
+    """Scrypt from the standard library, ``ln`` is log2 of the CPU cost.
+
+    Hashes are stored as ``$scrypt$ln=15,r=8,p=1$<salt>$<key>``.
+    """
+
+    algorithm = 'scrypt'
+    prefixes = ('$scrypt$',)
+    min_cost = 10
+
+    def __init__(self, ln: int, block_size: int, parallelism: int):
+        """Scrypt hasher initialization."""
+        self.ln = ln
+        self.block_size = block_size
+        self.parallelism = parallelism
+        self.cost_settings = {'ln': ln, 'r': block_size, 'p': parallelism}
+
+    def hash(self, password: str) -> str:
+        """Hash the password with a random salt."""
+        salt = os.urandom(SCRYPT_SALT_LENGTH)
+        key = derive_key(password, salt, self.cost_settings)
+        return '${0}${1}${2}${3}'.format(
+            self.algorithm,
+            ','.join(
+                '{0}={1}'.format(name, cost)
+                for name, cost in self.cost_settings.items()
+            ),
+            encode(salt),
+            encode(key),
+        )
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        """Check the password against the hash, ``False`` if it is corrupt."""
+        try:
+            derived_key, stored_key = derive_stored_key(
+                password,
+                hashed_password,
+            )
+        except ValueError:
+            return False
+        return hmac.compare_digest(derived_key, stored_key)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Check whether the hash is weaker or corrupt."""
+        try:
+            stored_settings = parse_hash(hashed_password)[0]
+        except ValueError:
+            return True
+        return any(
+            stored_settings[name] < current
+            for name, current in self.cost_settings.items()
+        )
+
+    def with_cost(self, cost: int) -> 'ScryptHasher':
+        """Copy the hasher with other CPU cost."""
+        return ScryptHasher(
+            ln=cost,
+            block_size=self.block_size,
+            parallelism=self.parallelism,
+        )
+
+    @property
+    def cost(self) -> int:
+        """Return the main cost parameter."""
+        return self.ln
+
+    def settings(self) -> dict[str, int]:
+        """Return parameters in the ``password_hashing`` settings format."""
+        return {
+            'scrypt_ln': self.ln,
+            'scrypt_block_size': self.block_size,
+            'scrypt_parallelism': self.parallelism,
+        }
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from typing import Any, Awaitable, Callable
+
+from app.metrics import DEPENDENCY_UP, EVENT_LOOP_LAG
+from config import config
+
+log = logging.getLogger('uvicorn')
+
+DependencyCheck = Callable[[], Awaitable[Any]]
+
+
+class DependencyChecks:
+    """Dependency check results refreshed every ``interval``.
+
+    Results older than two intervals and the timeout are not trusted.
+    """
+
+    def __init__(self, interval: float, timeout: float):
+        """Dependency checks initialization."""
+        self.interval = interval
+        self.timeout = timeout
+        self.dependencies: dict[str, DependencyCheck] = {}
+        self.checks: dict[str, bool] = {}
+        self.checked_at: float = 0
+
+    async def refresh(self):
+        """Check all dependencies concurrently."""
+        passed = await asyncio.gather(*[
+            self._check(name, check)
+            for name, check in self.dependencies.items()
+        ])
+        self.checks = dict(zip(self.dependencies, passed))
+        self.checked_at = time.monotonic()
+
+    def all_passed(self) -> bool:
+        """Check whether fresh results of all dependency checks passed."""
+        if not self.checks or not all(self.checks.values()):
+            return False
+        checks_age = time.monotonic() - self.checked_at
+        return checks_age <= self.interval * 2 + self.timeout
+
+    async def _check(self, name: str, check: DependencyCheck) -> bool:
+        """Run the dependency check within the timeout."""
+        try:
+            await asyncio.wait_for(check(), self.timeout)
+        except Exception as error:
+            log.warning(
+                'Health check of {0} failed: {1!r}'.format(name, error),
+            )
+            DEPENDENCY_UP.labels(dependency=name).set(0)
+            return False
+        DEPENDENCY_UP.labels(dependency=name).set(1)
+        return True
+
+
+class Heartbeat:
+    """Event loop heartbeat waking up every ``interval``.
+
+    The heartbeat records how late it was woken up; a heartbeat missing
+    for ``stall_timeout`` means the event loop is stalled.
+    """
+
+    def __init__(self, interval: float, stall_timeout: float):
+        """Heartbeat initialization."""
+        self.interval = interval
+        self.stall_timeout = stall_timeout
+        self.beat_at = time.monotonic()
+        self.loop_lag: float = 0
+
+    def is_on_time(self) -> bool:
+        """Check whether the last beat and its lag are within the timeout."""
+        beat_age = time.monotonic() - self.beat_at
+        return max(beat_age, self.loop_lag) < self.stall_timeout
+
+    def beat(self):
+        """Record the beat and how late the event loop woke it up."""
+        now = time.monotonic()
+        self.loop_lag = max(now - self.beat_at - self.interval, 0)
+        self.beat_at = now
+        EVENT_LOOP_LAG.set(self.loop_lag)
+
+
+class HealthChecker:
+    """Dependency checks and event loop heartbeat for the health probes.
+
+    Both run as background tasks, so probes only read their last results.
+    """
+
+    def __init__(
+        self,
+        dependency_checks: DependencyChecks,
+        heartbeat: Heartbeat,
+    ):
+        """Health checker initialization."""
+        self.dependency_checks = dependency_checks
+        self.heartbeat = heartbeat
+        self.tasks: list[asyncio.Task] = []
+
+    async def start(self, dependencies: dict[str, DependencyCheck]):
+        """Check dependencies once, then keep checking in the background."""
+        self.dependency_checks.dependencies = dependencies
+        await self.dependency_checks.refresh()
+        self.heartbeat.beat_at = time.monotonic()
+        self.tasks = [
+            asyncio.create_task(self._check_periodically()),
+            asyncio.create_task(self._heartbeat()),
+        ]
+
+    async def stop(self):
+        """Stop background checks."""
+        for task in self.tasks:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        self.tasks = []
+
+    def is_ready(self) -> bool:
+        """Check whether fresh results of all dependency checks passed."""
+        return self.dependency_checks.all_passed()
+
+    def is_alive(self) -> bool:
+        """Check whether the event loop heartbeat is on time."""
+        return self.heartbeat.is_on_time()
+
+    async def _check_periodically(self):
+        """Refresh dependency checks every interval."""
+        while self.tasks:
+            await asyncio.sleep(self.dependency_checks.interval)
+            await self.dependency_checks.refresh()
+
+    async def _heartbeat(self):
+        """Beat every heartbeat interval."""
+        while self.tasks:
+            await asyncio.sleep(self.heartbeat.interval)
+            self.heartbeat.beat()
+
+
+health_checker = HealthChecker(
+    dependency_checks=DependencyChecks(
+        interval=config.health.check_interval,  # type: ignore
+        timeout=config.health.check_timeout,  # type: ignore
+    ),
+    heartbeat=Heartbeat(
+        interval=config.health.heartbeat_interval,  # type: ignore
+        stall_timeout=config.health.stall_timeout,  # type: ignore
+    ),
+)
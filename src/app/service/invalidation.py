@@ -0,0 +1,82 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from contextlib import suppress
+
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from app.redis_client import is_cluster
+
+log = logging.getLogger('uvicorn')
+
+
+class InvalidatedCache(ABC):
+    """In-process cache kept consistent by Redis invalidation messages.
+
+    Values are served only while invalidations are received, so a lost
+    connection never hides a write. Every invalidation bumps ``version``,
+    a value read from Redis is cached only if no invalidation arrived
+    since the read started.
+    """
+
+    description = ''
+
+    def __init__(self, enabled: bool, reconnect_delay: float):
+        """Invalidated cache initialization."""
+        self.enabled = enabled
+        self.reconnect_delay = reconnect_delay
+        self.version = 0
+        self.listener: asyncio.Task | None = None
+        self.subscribed = False
+
+    async def start(self, redis: Redis):
+        """Start receiving invalidation messages."""
+        if not self.enabled:
+            return
+        if is_cluster(redis):
+            log.warning(
+                '{0} is not supported on Redis Cluster'.format(
+                    self.description,
+                ),
+            )
+            return
+        self.listener = asyncio.create_task(self._listen(redis))
+
+    async def stop(self):
+        """Stop receiving invalidation messages."""
+        if self.listener:
+            self.listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.listener
+            self.listener = None
+        self.clear()
+
+    def clear(self):
+        """Drop all cached values."""
+        self.version += 1
+
+    async def _listen(self, redis: Redis):
+        """Invalidation messages listener with reconnection."""
+        while True:
+            try:
+                await self._receive(redis)
+            except (RedisConnectionError, RedisTimeoutError, OSError):
+                log.warning(
+                    '{0} invalidation channel lost'.format(self.description),
+                )
+            except Exception:
+                log.exception(
+                    '{0} invalidation listener failed'.format(
+                        self.description,
+                    ),
+                )
+            finally:
+                self.subscribed = False
+                self.clear()
+            await asyncio.sleep(self.reconnect_delay)
+
+    @abstractmethod
+    async def _receive(self, redis: Redis):
+        """Subscribe and apply invalidation messages until disconnected."""
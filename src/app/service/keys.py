@@ -0,0 +1,168 @@
+import sys
+from pathlib import Path
+from typing import Any
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from app.constants import (
+    KEY_FILE_MODE,
+    KEY_FILE_SUFFIX,
+    PRIVATE_KEY_MARKER,
+    RSA_KEY_SIZE,
+    RSA_PUBLIC_EXPONENT,
+    SIGNING_KEY_NOT_FOUND,
+    SYMMETRIC_ALGORITHM,
+    UNKNOWN_KEY_ID,
+)
+from config import config
+
+PRIVATE_KEY_TYPES = (
+    ed25519.Ed25519PrivateKey,
+    ec.EllipticCurvePrivateKey,
+    rsa.RSAPrivateKey,
+)
+
+
+def key_paths(key_directory: Path) -> list[Path]:
+    """Key files sorted by key id."""
+    return sorted(key_directory.glob(f'*{KEY_FILE_SUFFIX}'))
+
+
+def read_key(key_path: Path) -> Any:
+    """Private or public key from PEM file."""
+    key_data = key_path.read_bytes()
+    if PRIVATE_KEY_MARKER in key_data:
+        return serialization.load_pem_private_key(key_data, password=None)
+    return serialization.load_pem_public_key(key_data)
+
+
+class KeyRing:
+    """JWT signing and verification keys.
+
+    Asymmetric keys are read from ``<key_directory>/<kid>.pem``. The key
+    with ``active_kid`` signs new tokens, every other key in the directory
+    only verifies tokens issued before rotation.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        key_directory: str,
+        active_kid: str | None,
+    ):
+        """Key ring initialization."""
+        self.algorithm = algorithm
+        self.key_directory = Path(key_directory)
+        self.active_kid = active_kid
+        self.signing_key: Any = None
+        self.public_keys: dict[str, Any] = {}
+
+    @property
+    def is_symmetric(self) -> bool:
+        """Tokens are signed with the shared secret."""
+        return self.algorithm == SYMMETRIC_ALGORITHM
+
+    def load(self):
+        """Load keys from the key directory."""
+        if self.is_symmetric:
+            return
+        jwt_algorithm = jwt.get_algorithm_by_name(self.algorithm)
+        self.signing_key = None
+        public_keys = {}
+        for key_path in key_paths(self.key_directory):
+            key = read_key(key_path)
+            if isinstance(key, PRIVATE_KEY_TYPES):
+                if key_path.stem == self.active_kid:
+                    self.signing_key = jwt_algorithm.prepare_key(key)
+                key = key.public_key()
+            public_keys[key_path.stem] = jwt_algorithm.prepare_key(key)
+        if self.signing_key is None:
+            raise RuntimeError(
+                SIGNING_KEY_NOT_FOUND.format(kid=self.active_kid),
+            )
+        self.public_keys = public_keys
+
+    def headers(self) -> dict[str, str] | None:
+        """Token headers."""
+        if self.is_symmetric:
+            return None
+        return {'kid': self.active_kid}  # type: ignore
+
+    def key_for_signing(self) -> Any:
+        """Key for new tokens."""
+        if self.is_symmetric:
+            return config.SECRET.get_secret_value()  # type: ignore
+        return self.signing_key
+
+    def key_for_token(self, token: str) -> Any:
+        """Key for the token from its kid header."""
+        if self.is_symmetric:
+            return config.SECRET.get_secret_value()  # type: ignore
+        kid = jwt.get_unverified_header(token).get('kid')
+        if kid not in self.public_keys:
+            raise jwt.InvalidTokenError(UNKNOWN_KEY_ID)
+        return self.public_keys[kid]
+
+    def jwks(self) -> dict[str, list[dict]]:
+        """Public keys in JWK Set format."""
+        if self.is_symmetric:
+            return {'keys': []}
+        jwt_algorithm = jwt.get_algorithm_by_name(self.algorithm)
+        return {
+            'keys': [
+                {
+                    **jwt_algorithm.to_jwk(public_key, as_dict=True),
+                    'kid': kid,
+                    'use': 'sig',
+                    'alg': self.algorithm,
+                }
+                for kid, public_key in self.public_keys.items()
+            ],
+        }
+
+
+def generate_private_key(algorithm: str) -> Any:
+    """Generate a private key for the algorithm."""
+    if algorithm == 'EdDSA':
+        return ed25519.Ed25519PrivateKey.generate()
+    if algorithm == 'ES256':
+        return ec.generate_private_key(ec.SECP256R1())
+    return rsa.generate_private_key(
+        public_exponent=RSA_PUBLIC_EXPONENT,
+        key_size=RSA_KEY_SIZE,
+    )
+
+
+def write_private_key(algorithm: str, key_directory: str, kid: str) -> Path:
+    """Generate and save a new signing key."""
+    key_path = Path(key_directory) / f'{kid}{KEY_FILE_SUFFIX}'
+    key_path.parent.mkdir(parents=True, exist_ok=True)
+    key_path.write_bytes(
+        generate_private_key(algorithm).private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        ),
+    )
+    key_path.chmod(KEY_FILE_MODE)
+    return key_path
+
+
+key_ring = KeyRing(
+    algorithm=config.jwt.algorithm,  # type: ignore
+    key_directory=config.jwt.key_directory,  # type: ignore
+    active_kid=config.jwt.active_kid,  # type: ignore
+)
+
+
+if __name__ == '__main__':
+    if key_ring.is_symmetric:
+        sys.exit(f'Key generation is not needed for {SYMMETRIC_ALGORITHM}')
+    key_path = write_private_key(
+        config.jwt.algorithm,  # type: ignore
+        config.jwt.key_directory,  # type: ignore
+        sys.argv[1],
+    )
+    sys.stdout.write(f'{key_path}\n')
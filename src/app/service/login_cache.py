@@ -0,0 +1,51 @@
+from redis.asyncio import Redis
+
+from app.metrics import MISSING_LOGIN_CACHE
+from config import config
+
+
+class MissingLoginCache:
+    """Redis cache of logins known to be missing from the database.
+
+    Authentication attempts for cached logins skip the database lookup.
+    Entries expire after ``ttl`` seconds and are removed on registration,
+    so the TTL bounds how long a registration racing with a failed login
+    may be rejected.
+    """
+
+    def __init__(self, enabled: bool, ttl: int, prefix: str):
+        """Missing login cache initialization."""
+        self.enabled = enabled
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def is_missing(self, login: str, redis: Redis) -> bool:
+        """Check whether the login is known to be missing."""
+        if not self.enabled:
+            return False
+        is_missing = bool(await redis.exists(self._key(login)))
+        MISSING_LOGIN_CACHE.labels(
+            result='hit' if is_missing else 'miss',
+        ).inc()
+        return is_missing
+
+    async def remember(self, login: str, redis: Redis):
+        """Remember the login as missing."""
+        if self.enabled:
+            await redis.set(self._key(login), 1, ex=self.ttl)
+
+    async def forget(self, login: str, redis: Redis):
+        """Remove the login from the cache after its registration."""
+        if self.enabled:
+            await redis.delete(self._key(login))
+
+    def _key(self, login: str) -> str:
+        """Redis key of the login."""
+        return f'{self.prefix}{login}'
+
+
+login_cache = MissingLoginCache(
+    enabled=config.login_cache.enabled,  # type: ignore
+    ttl=config.login_cache.ttl,  # type: ignore
+    prefix=config.login_cache.prefix,  # type: ignore
+)
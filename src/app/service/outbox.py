@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from contextlib import suppress
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db import Outbox
+from app.db.database import async_session
+from app.metrics import OUTBOX_RELAY_ERRORS, OUTBOX_RELAYED
+from app.service.producer import producer
+from config import config
+
+log = logging.getLogger('uvicorn')
+
+
+class OutboxRelay:
+    """Background publisher of outbox events to Kafka.
+
+    Events are locked with ``FOR UPDATE SKIP LOCKED``, so every replica
+    can run a relay and each event is published by one of them. Rows are
+    deleted in the same transaction once Kafka acknowledged the batch.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        poll_interval: float,
+        session_factory: async_sessionmaker = async_session,
+    ):
+        """Outbox relay initialization."""
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.session_factory = session_factory
+        self.wakeup = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+    async def start(self):
+        """Start relaying outbox events."""
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop relaying outbox events."""
+        if self.task:
+            self.task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+
+    def notify(self):
+        """Wake the relay up after a new event was committed."""
+        self.wakeup.set()
+
+    async def relay_batch(self, session: AsyncSession) -> int:
+        """Publish one batch of outbox events and remove them."""
+        query = select(Outbox).order_by(Outbox.id).limit(self.batch_size)
+        query_result = await session.execute(
+            query.with_for_update(skip_locked=True),
+        )
+        events = query_result.scalars().all()
+        if events:
+            await producer.send_batch(
+                [(event.topic, event.payload) for event in events],
+            )
+            await session.execute(
+                delete(Outbox).where(
+                    Outbox.id.in_([event.id for event in events]),
+                ),
+            )
+        await session.commit()
+        OUTBOX_RELAYED.inc(len(events))
+        return len(events)
+
+    async def _run(self):
+        """Relay events until the outbox is drained, then wait."""
+        while self.task is not None:
+            self.wakeup.clear()
+            try:
+                async with self.session_factory() as session:
+                    relayed = await self.relay_batch(session)
+            except Exception:
+                log.exception('Outbox relay failed')
+                OUTBOX_RELAY_ERRORS.inc()
+                relayed = 0
+            if relayed < self.batch_size:
+                await self._wait()
+
+    async def _wait(self):
+        """Wait for a new event or the poll interval."""
+        with suppress(TimeoutError):
+            await asyncio.wait_for(self.wakeup.wait(), self.poll_interval)
+
+
+outbox_relay = OutboxRelay(
+    batch_size=config.outbox.batch_size,  # type: ignore
+    poll_interval=config.outbox.poll_interval,  # type: ignore
+)
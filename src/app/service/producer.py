@@ -1,16 +1,35 @@
+import asyncio
 import json
+import time
 
 from aiokafka import AIOKafkaProducer  # type: ignore
 
+from app.metrics import KAFKA_DELIVERY_FAILURES, KAFKA_DELIVERY_LATENCY
 from config import config
 
 
 class KafkaProducer:
-    """Kafka producer."""
+    """Kafka producer.
 
-    def __init__(self, bootstrap_servers: str):
+    Messages of a batch are handed to the producer at once, so they share
+    broker requests within ``linger_ms``; delivery guarantees come from the
+    outbox, which keeps events until the whole batch is acknowledged.
+    """
+
+    def __init__(  # noqa: WPS211
+        self,
+        bootstrap_servers: str,
+        linger_ms: int = 0,
+        max_batch_size: int = 16384,
+        compression_type: str | None = None,
+        acks: int | str = 1,
+    ):
         """Kafka producer initialization."""
         self.bootstrap_servers = bootstrap_servers
+        self.linger_ms = linger_ms
+        self.max_batch_size = max_batch_size
+        self.compression_type = compression_type
+        self.acks = acks
         self.producer = None
 
     def serializer(self, value):
@@ -22,6 +41,10 @@ class KafkaProducer:
         self.producer = AIOKafkaProducer(
             bootstrap_servers=self.bootstrap_servers,
             value_serializer=self.serializer,
+            linger_ms=self.linger_ms,
+            max_batch_size=self.max_batch_size,
+            compression_type=self.compression_type,
+            acks=self.acks,
         )
         await self.producer.start()
 
@@ -30,16 +53,41 @@ class KafkaProducer:
         if self.producer:
             await self.producer.stop()
 
-    async def send_message(self, topic: str, user_data: dict[int, str]):
-        """Send message method."""
+    async def send_batch(self, messages: list[tuple[str, dict]]):
+        """Send messages and wait until the broker acknowledges all of them."""
         if self.producer is None:
             raise RuntimeError('Producer is not started')
-        await self.producer.send_and_wait(
-            topic,
-            value=user_data,
-        )
+        sent_at = time.perf_counter()
+        deliveries = [
+            await self.producer.send(topic, value=message)
+            for topic, message in messages
+        ]
+        await self._wait_deliveries(deliveries)
+        KAFKA_DELIVERY_LATENCY.observe(time.perf_counter() - sent_at)
+
+    async def fetch_metadata(self):
+        """Fetch cluster metadata, fail when no broker answers."""
+        if self.producer is None:
+            raise RuntimeError('Producer is not started')
+        await self.producer.client.fetch_all_metadata()
+
+    async def _wait_deliveries(self, deliveries: list[asyncio.Future]):
+        """Wait for all deliveries, count and raise the failed ones."""
+        results = await asyncio.gather(*deliveries, return_exceptions=True)
+        failures = [
+            delivery_result
+            for delivery_result in results
+            if isinstance(delivery_result, Exception)
+        ]
+        if failures:
+            KAFKA_DELIVERY_FAILURES.inc(len(failures))
+            raise failures[0]
 
 
 producer = KafkaProducer(
     bootstrap_servers=config.service.kafka_url,  # type: ignore
+    linger_ms=config.service.kafka_linger_ms,  # type: ignore
+    max_batch_size=config.service.kafka_max_batch_size,  # type: ignore
+    compression_type=config.service.kafka_compression_type,  # type: ignore
+    acks=config.service.kafka_acks,  # type: ignore
 )
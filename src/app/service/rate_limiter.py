@@ -0,0 +1,130 @@
+import math
+import uuid
+
+from fastapi import HTTPException, status
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+
+from app.constants import MILLISECONDS, RATE_LIMIT_EXCEEDED
+from app.metrics import RATE_LIMITED
+from app.redis_client import is_cluster
+from config import config
+
+SLIDING_WINDOW_SCRIPT = """
+local now = redis.call('TIME')
+local now_ms = now[1] * 1000 + math.floor(now[2] / 1000)
+local window = tonumber(ARGV[2])
+local blocked = 0
+local retry_after = 0
+for index, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[index + 2])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now_ms - window)
+    if redis.call('ZCARD', key) >= limit then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        local wait = math.max(tonumber(oldest[2]) + window - now_ms, 1)
+        if wait > retry_after then
+            blocked = index
+            retry_after = wait
+        end
+    end
+end
+if blocked == 0 then
+    for _, key in ipairs(KEYS) do
+        redis.call('ZADD', key, now_ms, ARGV[1])
+        redis.call('PEXPIRE', key, window)
+    end
+end
+return {blocked, retry_after}
+"""
+
+
+class SlidingWindowRateLimiter:
+    """Sliding window rate limiter on Redis sorted sets.
+
+    Every request is checked against all limits of the endpoint in one
+    Lua script, which records the attempt only when no limit is exceeded,
+    so rejected requests do not extend the ban. Keys of one request may
+    live on different Redis Cluster nodes, so there every limit is checked
+    by its own script run and an attempt rejected by a later limit is
+    still counted by the earlier ones.
+    """
+
+    def __init__(
+        self,
+        enabled: bool,
+        window: int,
+        prefix: str,
+        limits: dict[str, dict[str, int]],
+    ):
+        """Rate limiter initialization."""
+        self.enabled = enabled
+        self.window = window
+        self.prefix = prefix
+        self.limits = limits
+        self.script: AsyncScript | None = None
+        self.cluster = False
+
+    async def start(self, redis: Redis):
+        """Register the rate limiting script on the redis client."""
+        self.script = redis.register_script(SLIDING_WINDOW_SCRIPT)
+        self.cluster = is_cluster(redis)
+
+    async def check(self, endpoint: str, **identifiers: str):
+        """Count the attempt or raise 429 when a limit is exceeded."""
+        limits = {
+            kind: limit
+            for kind, limit in self.limits.get(endpoint, {}).items()
+            if kind in identifiers
+        }
+        if not self.enabled or not limits or self.script is None:
+            return
+        blocked, retry_after = await self._run_script(
+            [
+                f'{self.prefix}{endpoint}:{kind}:{identifiers[kind]}'
+                for kind in limits
+            ],
+            list(limits.values()),
+        )
+        if blocked:
+            RATE_LIMITED.labels(
+                endpoint=endpoint,
+                key=list(limits)[blocked - 1],
+            ).inc()
+            raise self._rejection(math.ceil(retry_after / MILLISECONDS))
+
+    async def _run_script(
+        self,
+        keys: list[str],
+        limits: list[int],
+    ) -> tuple[int, int]:
+        """Run the script for all keys, one key at a time on a cluster."""
+        if not self.cluster:
+            return await self.script(  # type: ignore
+                keys=keys,
+                args=[uuid.uuid4().hex, self.window * MILLISECONDS, *limits],
+            )
+        for index, (key, limit) in enumerate(zip(keys, limits), start=1):
+            key_result = await self.script(  # type: ignore
+                keys=[key],
+                args=[uuid.uuid4().hex, self.window * MILLISECONDS, limit],
+            )
+            if key_result[0]:
+                return index, key_result[1]
+        return 0, 0
+
+    @staticmethod
+    def _rejection(retry_after: int) -> HTTPException:
+        """Too many requests error with the Retry-After header."""
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=RATE_LIMIT_EXCEEDED.format(retry_after=retry_after),
+            headers={'Retry-After': str(retry_after)},
+        )
+
+
+rate_limiter = SlidingWindowRateLimiter(
+    enabled=config.rate_limit.enabled,  # type: ignore
+    window=config.rate_limit.window,  # type: ignore
+    prefix=config.rate_limit.prefix,  # type: ignore
+    limits=config.rate_limit.limits,  # type: ignore
+)
@@ -1,118 +1,27 @@
-from datetime import datetime, timedelta
-
-import bcrypt
-import jwt
 from fastapi import HTTPException, status
 from redis import Redis
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 
-from app.constants import (
-    ENCODING_FORMAT,
-    INVALID_TOKEN_MESSAGE,
-    TOKEN_EXPIRED_MESSAGE,
-    USER_EXISTS_MESSAGE,
-    USER_NOT_FOUND,
+from app.constants import USER_EXISTS_MESSAGE, USER_NOT_FOUND
+from app.db import (
+    Outbox,
+    get_credentials,
+    insert_user,
+    set_password_hash,
+    set_verified,
 )
-from app.db import User
+from app.metrics import PASSWORD_REHASHES
+from app.service.executor import password_executor
+from app.service.hashers import password_hashers
+from app.service.login_cache import login_cache
+from app.service.tokens import TokenService
 from config import config
 
 
-class TokenService:
-    """Token service."""
-
-    @staticmethod
-    async def get_token(user_id: int, redis: Redis) -> str | None:
-        """Get token from redis."""
-        return await redis.get(str(user_id))
-
-    @staticmethod
-    async def create_and_put_token(user_id: int, redis: Redis) -> str:
-        """Token creation and sending to redis."""
-        token = AuthService.generate_jwt_token(user_id)
-        await redis.set(user_id, token, config.service.token_ttl)  # type: ignore # noqa: E501
-        return token
-
-    @staticmethod
-    def is_token_expired(token: str) -> bool:
-        """Check token expiration."""
-        try:
-            AuthService.decode_jwt_token(token)
-        except jwt.ExpiredSignatureError:
-            return True
-        return False
-
-    @staticmethod
-    async def update_token(user_id: int, redis: Redis) -> str:
-        """Token update in redis."""
-        token = AuthService.generate_jwt_token(user_id)
-        await redis.set(user_id, token, config.service.token_ttl)  # type: ignore # noqa: E501
-        return token
-
-    @staticmethod
-    async def check_token(token: str, redis: Redis) -> dict:
-        """Token check method."""
-        response = {'user_id': None, 'is_token_valid': False}
-        try:
-            user_id = AuthService.decode_jwt_token(token)['id']
-        except (jwt.ExpiredSignatureError, jwt.InvalidTokenError) as exeption:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=str(exeption),
-            )
-        if user_id and token == await TokenService.get_token(user_id, redis):
-            response['user_id'] = user_id
-            response['is_token_valid'] = True
-        return response
-
-    @staticmethod
-    def generate_jwt_token(user_id: int) -> str:
-        """Token generation."""
-        payload = {
-            'id': user_id,
-            'exp': (
-                datetime.now() + timedelta(seconds=config.service.token_ttl)  # type: ignore # noqa: E501
-            ).timestamp(),
-        }
-        return jwt.encode(
-            payload,
-            config.SECRET.get_secret_value(),  # type: ignore
-            algorithm='HS256',
-        )
-
-    @staticmethod
-    def decode_jwt_token(token: str) -> dict:
-        """Token decoding."""
-        try:
-            return jwt.decode(
-                token,
-                config.SECRET.get_secret_value(),  # type: ignore
-                algorithms=['HS256'],
-            )
-        except jwt.ExpiredSignatureError:
-            raise jwt.ExpiredSignatureError(TOKEN_EXPIRED_MESSAGE)
-        except jwt.InvalidTokenError:
-            raise jwt.InvalidTokenError(INVALID_TOKEN_MESSAGE)
-
-
 class AuthService(TokenService):
     """Auth service."""
 
-    @staticmethod
-    def hash_password(password: str) -> str:
-        """Password hashing."""
-        salt = bcrypt.gensalt()
-        hashed_password = bcrypt.hashpw(password.encode(ENCODING_FORMAT), salt)
-        return hashed_password.decode(ENCODING_FORMAT)
-
-    @staticmethod
-    def check_password(password: str, hashed_password: str) -> bool:
-        """Password check."""
-        return bcrypt.checkpw(
-            password.encode(ENCODING_FORMAT),
-            hashed_password.encode(ENCODING_FORMAT),
-        )
-
     @staticmethod
     async def registration(
         login: str,
@@ -120,22 +29,21 @@ class AuthService(TokenService):
         session: AsyncSession,
         redis: Redis,
     ) -> str:
-        """User registration."""
-        query_result = await session.execute(
-            select(User).where(User.login == login),
+        """User registration in a single INSERT ... ON CONFLICT statement."""
+        hashed_password = await password_executor.run(
+            password_hashers.hash,
+            password,
         )
-        if query_result.scalar_one_or_none():
+        user_id = await insert_user(session, login, hashed_password)
+        if user_id is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=USER_EXISTS_MESSAGE.format(login=login),
             )
-        hashed_password = AuthService.hash_password(password)
-        user = User(login=login, hashed_password=hashed_password)
-        session.add(user)
         await session.commit()
-        await session.refresh(user)
-        token = AuthService.generate_jwt_token(user.id)
-        await redis.set(user.id, token, config.service.token_ttl)  # type: ignore # noqa: E501
+        await login_cache.forget(login, redis)
+        token = AuthService.generate_jwt_token(user_id)
+        await TokenService.put_token(user_id, token, redis)
         return token
 
     @staticmethod
@@ -143,47 +51,77 @@ class AuthService(TokenService):
         login: str,
         password: str,
         session: AsyncSession,
-    ) -> User:
-        """Get user from db."""
-        query_result = await session.execute(
-            select(User).where(User.login == login),
+        redis: Redis,
+    ) -> Row[tuple[int, str]]:
+        """Get user id and password hash from db.
+
+        Unknown logins are checked against a dummy hash, so they cost the
+        same as a wrong password. Hashes weaker than the current hasher
+        settings are replaced after a successful check.
+        """
+        user = None
+        if not await login_cache.is_missing(login, redis):
+            user = await get_credentials(session, login)
+            if user is None:
+                await login_cache.remember(login, redis)
+        is_password_valid = await password_executor.run(
+            password_hashers.verify,
+            password,
+            (
+                password_hashers.dummy_hash()
+                if user is None
+                else user.hashed_password
+            ),
         )
-        user = query_result.scalar_one_or_none()
-        if user and AuthService.check_password(password, user.hashed_password):
+        if user is not None and is_password_valid:
+            if password_hashers.needs_rehash(user.hashed_password):
+                await AuthService.rehash_password(user.id, password, session)
             return user
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=USER_NOT_FOUND,
         )
 
+    @staticmethod
+    async def rehash_password(
+        user_id: int,
+        password: str,
+        session: AsyncSession,
+    ):
+        """Store the password hashed with the current hasher settings."""
+        hashed_password = await password_executor.run(
+            password_hashers.hash,
+            password,
+        )
+        await set_password_hash(session, user_id, hashed_password)
+        await session.commit()
+        PASSWORD_REHASHES.labels(
+            algorithm=password_hashers.default.algorithm,
+        ).inc()
+
     @staticmethod
     async def authentication(
         login: str,
         password: str,
         session: AsyncSession,
         redis: Redis,
-    ) -> str | None:
-        """User authentication."""
-        user = await AuthService.get_user(login, password, session)
-        user_id = user.id
-        token = await TokenService.get_token(user_id, redis)
-        if not token:
-            return await TokenService.create_and_put_token(user_id, redis)
-        if TokenService.is_token_expired(token):
-            return await TokenService.update_token(user_id, redis)
-        return token
+    ) -> str:
+        """User authentication with a new token replacing the stored one."""
+        user = await AuthService.get_user(login, password, session, redis)
+        return await TokenService.create_and_put_token(user.id, redis)
 
     @staticmethod
-    async def verify(user_id: int, session: AsyncSession):
-        """User verification in db."""
-        query_result = await session.execute(
-            select(User).where(User.id == user_id),
-        )
-        user = query_result.scalar_one_or_none()
-        if not user:
+    async def verify(user_id: int, file_path: str, session: AsyncSession):
+        """User verification in db with the photo event in the outbox."""
+        if not await set_verified(session, user_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=USER_NOT_FOUND,
             )
-        user.is_verified = True
+        session.add(
+            Outbox(
+                topic=config.service.kafka_topic,  # type: ignore
+                payload={user_id: file_path},
+            ),
+        )
         await session.commit()
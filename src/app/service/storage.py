@@ -0,0 +1,135 @@
+import asyncio
+import errno
+import logging
+import os
+import time
+from contextlib import suppress
+from uuid import uuid1
+
+import aiofiles
+from aiofiles import os as async_os
+from fastapi import UploadFile
+
+from app.metrics import (
+    PHOTO_BYTES_WRITTEN,
+    PHOTO_STORE_METHOD,
+    PHOTO_UPLOAD_DURATION,
+)
+from config import config
+
+log = logging.getLogger('uvicorn')
+SENDFILE_UNSUPPORTED = (
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.ENOTSOCK,
+    errno.EOPNOTSUPP,
+)
+
+
+class PhotoTooLargeError(Exception):
+    """Photo exceeds the upload size limit."""
+
+
+class PhotoStorage:
+    """Photo files storage.
+
+    Uploads with a file descriptor are copied inside the kernel with
+    ``sendfile``; a Starlette spool still in memory is rolled over to its
+    temporary file by ``fileno()``. Other uploads, and file systems without
+    ``sendfile``, are copied in fixed-size chunks, so worker memory does not
+    depend on the photo size.
+    """
+
+    def __init__(self, directory: str, max_size: int, chunk_size: int):
+        """Photo storage initialization."""
+        self.directory = directory
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+
+    async def save(self, upload: UploadFile, extension: str) -> str:
+        """Save uploaded photo and return its path."""
+        if upload.size is not None and upload.size > self.max_size:
+            raise PhotoTooLargeError
+        file_path = f'{self.directory}/{uuid1()}{extension}'
+        started_at = time.perf_counter()
+        try:
+            bytes_written = await self._persist(upload, file_path)
+        except Exception:
+            with suppress(FileNotFoundError):
+                await async_os.remove(file_path)
+            raise
+        PHOTO_BYTES_WRITTEN.inc(bytes_written)
+        PHOTO_UPLOAD_DURATION.observe(time.perf_counter() - started_at)
+        return file_path
+
+    async def _persist(self, upload: UploadFile, file_path: str) -> int:
+        """Store the upload, inside the kernel when it is in a file."""
+        spool_fd = self._file_descriptor(upload)
+        if spool_fd is not None:
+            upload.file.flush()
+            bytes_written = await self._send_file(spool_fd, file_path)
+            if bytes_written is not None:
+                PHOTO_STORE_METHOD.labels(method='sendfile').inc()
+                return bytes_written
+        bytes_written = await self._copy(upload, file_path)
+        PHOTO_STORE_METHOD.labels(method='copy').inc()
+        return bytes_written
+
+    async def _send_file(self, spool_fd: int, file_path: str) -> int | None:
+        """Copy the file with sendfile, None when sendfile is not supported."""
+        size = os.fstat(spool_fd).st_size
+        if size > self.max_size:
+            raise PhotoTooLargeError
+        try:
+            return await asyncio.to_thread(
+                kernel_copy,
+                spool_fd,
+                file_path,
+                size,
+            )
+        except OSError as error:
+            if error.errno not in SENDFILE_UNSUPPORTED:
+                raise
+        log.warning('sendfile is not supported, copying photo')
+        return None
+
+    async def _copy(self, upload: UploadFile, file_path: str) -> int:
+        """Copy upload to the file chunk by chunk."""
+        bytes_written = 0
+        async with aiofiles.open(file_path, 'wb') as photo:
+            while True:
+                chunk = await upload.read(self.chunk_size)
+                if not chunk:
+                    return bytes_written
+                bytes_written += len(chunk)
+                if bytes_written > self.max_size:
+                    raise PhotoTooLargeError
+                await photo.write(chunk)
+
+    @staticmethod
+    def _file_descriptor(upload: UploadFile) -> int | None:
+        """File descriptor of the upload, None for in-memory files."""
+        try:
+            return upload.file.fileno()
+        except (OSError, ValueError):
+            return None
+
+
+def kernel_copy(source_fd: int, file_path: str, size: int) -> int:
+    """Copy file contents to a new file without passing through userspace."""
+    with open(file_path, 'wb') as photo:
+        target_fd = photo.fileno()
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(target_fd, source_fd, offset, size - offset)
+            if not sent:
+                break
+            offset += sent
+    return offset
+
+
+photo_storage = PhotoStorage(
+    directory=config.service.photo_directory,  # type: ignore
+    max_size=config.service.max_photo_size,  # type: ignore
+    chunk_size=config.service.photo_chunk_size,  # type: ignore
+)
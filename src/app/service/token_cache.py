@@ -0,0 +1,148 @@
+import time
+from collections import OrderedDict, defaultdict
+
+from redis.asyncio import Redis
+
+from app.metrics import (
+    TOKEN_CACHE_EVICTIONS,
+    TOKEN_CACHE_HITS,
+    TOKEN_CACHE_MISSES,
+)
+from app.service.invalidation import InvalidatedCache
+from config import config
+
+
+class TokenEntries:
+    """LRU of validated tokens indexed by user id."""
+
+    def __init__(self, max_size: int, ttl: int):
+        """Token entries initialization."""
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self.user_tokens: defaultdict[int, set[str]] = defaultdict(set)
+
+    def get(self, token: str) -> int | None:
+        """User id of a cached token."""
+        entry = self.entries.get(token)
+        if entry is None:
+            TOKEN_CACHE_MISSES.inc()
+            return None
+        user_id, expires_at = entry
+        if expires_at <= time.time():
+            self._remove(token, user_id)
+            TOKEN_CACHE_EVICTIONS.labels(reason='expired').inc()
+            TOKEN_CACHE_MISSES.inc()
+            return None
+        self.entries.move_to_end(token)
+        TOKEN_CACHE_HITS.inc()
+        return user_id
+
+    def put(self, token: str, user_id: int, exp: float):
+        """Cache a token, evicting the least recently used ones."""
+        expires_at = min(time.time() + self.ttl, exp)
+        self.entries[token] = (user_id, expires_at)
+        self.entries.move_to_end(token)
+        self.user_tokens[user_id].add(token)
+        while len(self.entries) > self.max_size:
+            oldest_token, (oldest_user_id, _) = next(
+                iter(self.entries.items()),
+            )
+            self._remove(oldest_token, oldest_user_id)
+            TOKEN_CACHE_EVICTIONS.labels(reason='size').inc()
+
+    def remove_user(self, user_id: int):
+        """Drop cached tokens of the user."""
+        for token in self.user_tokens.pop(user_id, set()):
+            if self.entries.pop(token, None):
+                TOKEN_CACHE_EVICTIONS.labels(reason='invalidated').inc()
+
+    def clear(self):
+        """Drop all cached tokens."""
+        self.entries.clear()
+        self.user_tokens.clear()
+
+    def _remove(self, token: str, user_id: int):
+        """Remove a single token from the cache."""
+        self.entries.pop(token, None)
+        tokens = self.user_tokens.get(user_id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                self.user_tokens.pop(user_id)
+
+
+class TokenCache(InvalidatedCache):
+    """In-process LRU cache of validated tokens.
+
+    Workers publish the user id to ``channel`` when a token is
+    overwritten, every worker drops the cached tokens of the user.
+    """
+
+    description = 'Token cache'
+
+    def __init__(  # noqa: WPS211
+        self,
+        enabled: bool,
+        max_size: int,
+        ttl: int,
+        channel: str,
+        reconnect_delay: float,
+    ):
+        """Token cache initialization."""
+        super().__init__(enabled, reconnect_delay)
+        self.channel = channel
+        self.tokens = TokenEntries(max_size, ttl)
+
+    def get(self, token: str) -> int | None:
+        """User id of a cached token."""
+        if not self.subscribed:
+            return None
+        return self.tokens.get(token)
+
+    def put(self, token: str, user_id: int, exp: float, version: int):
+        """Cache a token validated while the cache was at the version.
+
+        The token is skipped when an invalidation arrived since, because
+        it might have been validated against an overwritten digest.
+        """
+        if self.subscribed and version == self.version:
+            self.tokens.put(token, user_id, exp)
+
+    def invalidate(self, user_id: int):
+        """Drop cached tokens of the user."""
+        self.version += 1
+        self.tokens.remove_user(user_id)
+
+    async def publish_invalidation(self, user_id: int, redis: Redis):
+        """Drop cached tokens of the user in every worker."""
+        if self.enabled:
+            self.invalidate(user_id)
+            await redis.publish(self.channel, user_id)
+
+    def clear(self):
+        """Drop all cached tokens."""
+        super().clear()
+        self.tokens.clear()
+
+    async def _receive(self, redis: Redis):
+        """Apply invalidation messages of the channel."""
+        async with redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+            await pubsub.subscribe(self.channel)
+            self.subscribed = True
+            while self.subscribed:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=self.reconnect_delay,
+                )
+                if message is not None and message['type'] == 'message':
+                    self.invalidate(int(message['data']))
+
+
+token_cache = TokenCache(
+    enabled=config.token_cache.enabled,  # type: ignore
+    max_size=config.token_cache.max_size,  # type: ignore
+    ttl=config.token_cache.ttl,  # type: ignore
+    channel=config.token_cache.channel,  # type: ignore
+    reconnect_delay=config.token_cache.reconnect_delay,  # type: ignore
+)
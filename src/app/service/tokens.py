@@ -0,0 +1,300 @@
+import hashlib
+import hmac
+from datetime import datetime, timedelta
+
+import jwt
+from fastapi import HTTPException, status
+from redis import Redis
+
+from app.constants import (
+    ENCODING_FORMAT,
+    INVALID_TOKEN_MESSAGE,
+    TOKEN_DIGEST_SIZE,
+    TOKEN_EXPIRED_MESSAGE,
+)
+from app.redis_client import mget
+from app.service.client_cache import client_cache
+from app.service.keys import key_ring
+from app.service.token_cache import token_cache
+from config import config
+
+
+def uncached_token_keys(
+    digest_keys: dict[int, str],
+    cached_tokens: dict[str, str | None],
+) -> list[str]:
+    """Redis keys of uncached token digests and of legacy tokens."""
+    keys = [
+        key for key in digest_keys.values() if key not in cached_tokens
+    ]
+    if config.redis.legacy_token_keys:  # type: ignore
+        keys.extend(
+            str(user_id)
+            for user_id, key in digest_keys.items()
+            if cached_tokens.get(key) is None
+        )
+    return keys
+
+
+class TokenCodec:
+    """JWT encoding and decoding with the key ring keys."""
+
+    @staticmethod
+    def generate_jwt_token(user_id: int) -> str:
+        """Token generation."""
+        payload = {
+            'id': user_id,
+            'exp': (
+                datetime.now() + timedelta(seconds=config.service.token_ttl)  # type: ignore # noqa: E501
+            ).timestamp(),
+        }
+        return jwt.encode(
+            payload,
+            key_ring.key_for_signing(),
+            algorithm=key_ring.algorithm,
+            headers=key_ring.headers(),
+        )
+
+    @staticmethod
+    def decode_jwt_token(token: str) -> dict:
+        """Token decoding."""
+        try:
+            return jwt.decode(
+                token,
+                key_ring.key_for_token(token),
+                algorithms=[key_ring.algorithm],
+            )
+        except jwt.ExpiredSignatureError:
+            raise jwt.ExpiredSignatureError(TOKEN_EXPIRED_MESSAGE)
+        except jwt.InvalidTokenError:
+            raise jwt.InvalidTokenError(INVALID_TOKEN_MESSAGE)
+
+    @staticmethod
+    def get_token_payload(token: str) -> dict:
+        """Token payload or empty dict for invalid and expired tokens."""
+        try:
+            return TokenCodec.decode_jwt_token(token)
+        except (jwt.ExpiredSignatureError, jwt.InvalidTokenError):
+            return {}
+
+    @staticmethod
+    def is_token_expired(token: str) -> bool:
+        """Check token expiration."""
+        try:
+            TokenCodec.decode_jwt_token(token)
+        except jwt.ExpiredSignatureError:
+            return True
+        return False
+
+
+class TokenStore:
+    """Token digests in redis.
+
+    Redis keeps a digest of the current token of every user under
+    ``redis.token_key_prefix``. Full tokens stored under bare user id keys
+    by earlier versions are accepted while ``redis.legacy_token_keys`` is
+    enabled and removed when the user gets a new token.
+    """
+
+    @staticmethod
+    def token_key(user_id: int) -> str:
+        """Redis key of the user token digest."""
+        return ''.join(
+            (config.redis.token_key_prefix, str(user_id)),  # type: ignore
+        )
+
+    @staticmethod
+    def token_digest(token: str) -> str:
+        """Compute the fixed size token digest stored in redis."""
+        return hashlib.blake2b(
+            token.encode(ENCODING_FORMAT),
+            digest_size=TOKEN_DIGEST_SIZE,
+        ).hexdigest()
+
+    @staticmethod
+    def is_stored_token(token: str, stored_token: str) -> bool:
+        """Compare the token with its stored digest or legacy full value."""
+        if hmac.compare_digest(stored_token, TokenStore.token_digest(token)):
+            return True
+        if not config.redis.legacy_token_keys:  # type: ignore
+            return False
+        return hmac.compare_digest(stored_token, token)
+
+    @staticmethod
+    async def get_token(user_id: int, redis: Redis) -> str | None:
+        """Get stored token digest from redis."""
+        stored_tokens = await TokenStore.get_tokens({user_id}, redis)
+        return stored_tokens[user_id]
+
+    @staticmethod
+    async def get_tokens(
+        user_ids: set[int],
+        redis: Redis,
+    ) -> dict[int, str | None]:
+        """Get several stored token digests in at most one round trip.
+
+        Digests are served from the client-side cache when it is enabled,
+        legacy keys are read only for users without a digest.
+        """
+        digest_keys = {
+            user_id: TokenStore.token_key(user_id) for user_id in user_ids
+        }
+        stored_tokens = client_cache.get_many(list(digest_keys.values()))
+        keys = uncached_token_keys(digest_keys, stored_tokens)
+        if keys:
+            stored_tokens.update(await TokenStore.fetch_tokens(keys, redis))
+        return {
+            user_id: stored_tokens.get(key) or stored_tokens.get(str(user_id))
+            for user_id, key in digest_keys.items()
+        }
+
+    @staticmethod
+    async def fetch_tokens(
+        keys: list[str],
+        redis: Redis,
+    ) -> dict[str, str | None]:
+        """Read token keys from redis and cache the tracked ones."""
+        cache_version = client_cache.version
+        fetched_tokens = dict(zip(keys, await mget(redis, keys)))
+        client_cache.put_many(fetched_tokens, cache_version)
+        return fetched_tokens
+
+    @staticmethod
+    async def put_token(user_id: int, token: str, redis: Redis):
+        """Token digest saving to redis with cached tokens invalidation."""
+        async with redis.pipeline(transaction=False) as pipeline:
+            pipeline.set(
+                TokenStore.token_key(user_id),
+                TokenStore.token_digest(token),
+                ex=config.service.token_ttl,  # type: ignore
+            )
+            if config.redis.legacy_token_keys:  # type: ignore
+                pipeline.delete(str(user_id))
+            await pipeline.execute()
+        client_cache.invalidate([TokenStore.token_key(user_id)])
+        await token_cache.publish_invalidation(user_id, redis)
+
+
+class TokenService(TokenCodec, TokenStore):
+    """Token service."""
+
+    @staticmethod
+    async def create_and_put_token(user_id: int, redis: Redis) -> str:
+        """Token creation and sending to redis."""
+        token = TokenService.generate_jwt_token(user_id)
+        await TokenService.put_token(user_id, token, redis)
+        return token
+
+    @staticmethod
+    async def update_token(user_id: int, redis: Redis) -> str:
+        """Token update in redis."""
+        token = TokenService.generate_jwt_token(user_id)
+        await TokenService.put_token(user_id, token, redis)
+        return token
+
+    @staticmethod
+    async def check_token(token: str, redis: Redis) -> dict:
+        """Token check method."""
+        cached_user_id = token_cache.get(token)
+        if cached_user_id:
+            return TokenService.token_check_result(
+                cached_user_id,
+                is_token_valid=True,
+            )
+        try:
+            payload = TokenService.decode_jwt_token(token)
+        except (jwt.ExpiredSignatureError, jwt.InvalidTokenError) as exeption:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail=str(exeption),
+            )
+        cache_version = token_cache.version
+        stored_token = None
+        if payload.get('id'):
+            stored_token = await TokenService.get_token(payload['id'], redis)
+        return TokenService.validate_token(
+            token,
+            payload,
+            stored_token,
+            cache_version,
+        )
+
+    @staticmethod
+    async def check_tokens(tokens: list[str], redis: Redis) -> list[dict]:
+        """Batch token check method."""
+        token_checks = {}
+        payloads = {}
+        for token in set(tokens):
+            cached_user_id = token_cache.get(token)
+            if cached_user_id:
+                token_checks[token] = TokenService.token_check_result(
+                    cached_user_id,
+                    is_token_valid=True,
+                )
+            else:
+                payloads[token] = TokenService.get_token_payload(token)
+        token_checks.update(
+            await TokenService.validate_tokens(payloads, redis),
+        )
+        return [token_checks[requested] for requested in tokens]
+
+    @staticmethod
+    async def validate_tokens(
+        payloads: dict[str, dict],
+        redis: Redis,
+    ) -> dict[str, dict]:
+        """Validate decoded tokens against the stored ones."""
+        user_ids = {payload.get('id') for payload in payloads.values()}
+        user_ids.discard(None)
+        cache_version = token_cache.version
+        stored_tokens = await TokenService.get_tokens(
+            user_ids,  # type: ignore
+            redis,
+        )
+        return {
+            token: TokenService.validate_token(
+                token,
+                payload,
+                stored_tokens.get(payload.get('id')),  # type: ignore
+                cache_version,
+            )
+            for token, payload in payloads.items()
+        }
+
+    @staticmethod
+    def validate_token(
+        token: str,
+        payload: dict,
+        stored_token: str | None,
+        cache_version: int,
+    ) -> dict:
+        """Compare decoded token with the stored one and cache the result.
+
+        ``cache_version`` is the token cache version read before the stored
+        token was fetched.
+        """
+        user_id = payload.get('id')
+        is_token_valid = bool(user_id) and stored_token is not None
+        if is_token_valid:
+            is_token_valid = TokenService.is_stored_token(
+                token,
+                stored_token,  # type: ignore
+            )
+        if is_token_valid:
+            token_cache.put(
+                token,
+                user_id,  # type: ignore
+                payload['exp'],
+                cache_version,
+            )
+        return TokenService.token_check_result(
+            user_id,
+            is_token_valid=is_token_valid,
+        )
+
+    @staticmethod
+    def token_check_result(user_id: int | None, is_token_valid: bool) -> dict:
+        """Token check response."""
+        if user_id and is_token_valid:
+            return {'user_id': user_id, 'is_token_valid': True}
+        return {'user_id': None, 'is_token_valid': False}
@@ -0,0 +1,191 @@
+import time
+from contextvars import ContextVar
+from typing import Any, Sequence
+
+import opentracing
+from jaeger_client import Config
+from opentelemetry.context import Context
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+    OTLPSpanExporter,
+)
+from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace.sampling import (
+    ALWAYS_OFF,
+    ALWAYS_ON,
+    Decision,
+    ParentBased,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
+from opentelemetry.shim.opentracing_shim import SpanShim, create_tracer
+from opentelemetry.trace import Link, SpanKind
+from opentelemetry.util.types import Attributes
+
+from app.constants import MILLISECONDS, UNKNOWN_SAMPLER
+from config import config
+
+NOOP_TRACER = opentracing.Tracer()
+
+request_sampled: ContextVar[bool] = ContextVar(
+    'request_sampled',
+    default=False,
+)
+
+
+class RateLimitingSampler(Sampler):
+    """Sample at most ``traces_per_second`` new traces.
+
+    Token bucket with the capacity of one second of traces, the same
+    policy as the ``ratelimiting`` sampler of jaeger_client.
+    """
+
+    def __init__(self, traces_per_second: float):
+        """Rate limiting sampler initialization."""
+        self.traces_per_second = traces_per_second
+        self.capacity = max(traces_per_second, 1)
+        self.balance = self.capacity
+        self.updated_at = time.monotonic()
+
+    def should_sample(  # noqa: WPS211
+        self,
+        parent_context: Context | None,
+        trace_id: int,
+        name: str,
+        kind: SpanKind | None = None,
+        attributes: Attributes = None,
+        links: Sequence[Link] | None = None,
+        trace_state: Any = None,
+    ) -> SamplingResult:
+        """Sample the trace when the bucket has a token left."""
+        now = time.monotonic()
+        self.balance = min(
+            self.capacity,
+            self.balance + (now - self.updated_at) * self.traces_per_second,
+        )
+        self.updated_at = now
+        if self.balance < 1:
+            return SamplingResult(Decision.DROP)
+        self.balance -= 1
+        return SamplingResult(Decision.RECORD_AND_SAMPLE, attributes)
+
+    def get_description(self) -> str:
+        """Sampler description."""
+        return 'RateLimitingSampler{{{0}}}'.format(self.traces_per_second)
+
+
+def create_sampler(sampler_type: str, sampler_param: float) -> Sampler:
+    """Map a jaeger_client sampler setting to an OpenTelemetry sampler.
+
+    Traces started by a caller keep the caller's sampling decision.
+    """
+    if sampler_type == 'const':
+        root_sampler = ALWAYS_ON if sampler_param else ALWAYS_OFF
+    elif sampler_type == 'probabilistic':
+        root_sampler = TraceIdRatioBased(sampler_param)
+    elif sampler_type == 'ratelimiting':
+        root_sampler = RateLimitingSampler(sampler_param)
+    else:
+        raise ValueError(UNKNOWN_SAMPLER.format(sampler_type=sampler_type))
+    return ParentBased(root_sampler)
+
+
+def is_sampled(span: Any) -> bool:
+    """Check whether the span is recorded and exported."""
+    if isinstance(span, SpanShim):
+        return span.unwrap().is_recording()
+    span_is_sampled = getattr(span, 'is_sampled', None)
+    return bool(span_is_sampled and span_is_sampled())
+
+
+def tracer() -> opentracing.Tracer:
+    """Tracer for spans of the current request.
+
+    Spans of unsampled requests are never exported, so they are not
+    created at all and the no-op tracer is returned.
+    """
+    if request_sampled.get():
+        return opentracing.global_tracer()
+    return NOOP_TRACER
+
+
+class Tracing:
+    """Global opentracing tracer backed by jaeger_client or OpenTelemetry.
+
+    The OpenTelemetry backend exports spans over OTLP/HTTP from a batching
+    span processor thread, so requests never wait for the exporter.
+    """
+
+    def __init__(self):
+        """Tracing initialization."""
+        self.tracer: opentracing.Tracer | None = None
+        self.provider: TracerProvider | None = None
+
+    def start(self):
+        """Create the tracer and make it global."""
+        if config.jaeger.backend == 'opentelemetry':  # type: ignore
+            self.provider = self._tracer_provider()
+            self.tracer = create_tracer(self.provider)
+            opentracing.set_global_tracer(self.tracer)
+        else:
+            self.tracer = self._jaeger_config().initialize_tracer()
+
+    def stop(self):
+        """Export pending spans and close the tracer."""
+        if self.provider is not None:
+            self.provider.shutdown()
+            self.provider = None
+        elif self.tracer is not None:
+            self.tracer.close()  # type: ignore
+        self.tracer = None
+
+    def _tracer_provider(self) -> TracerProvider:
+        """Create the tracer provider with a batching OTLP exporter."""
+        settings = config.jaeger
+        export_timeout = settings.batch_export_timeout  # type: ignore
+        provider = TracerProvider(
+            sampler=create_sampler(
+                settings.sampler_type,  # type: ignore
+                settings.sampler_param,  # type: ignore
+            ),
+            resource=Resource.create(
+                {SERVICE_NAME: settings.service_name},  # type: ignore
+            ),
+        )
+        provider.add_span_processor(
+            BatchSpanProcessor(
+                OTLPSpanExporter(endpoint=settings.otlp_url),  # type: ignore
+                max_queue_size=settings.batch_max_queue_size,  # type: ignore
+                schedule_delay_millis=(
+                    settings.batch_delay * MILLISECONDS  # type: ignore
+                ),
+                max_export_batch_size=(
+                    settings.batch_max_export_size  # type: ignore
+                ),
+                export_timeout_millis=export_timeout * MILLISECONDS,
+            ),
+        )
+        return provider
+
+    def _jaeger_config(self) -> Config:
+        """Create the Jaeger client configuration."""
+        return Config(
+            config={
+                'sampler': {
+                    'type': config.jaeger.sampler_type,  # type: ignore
+                    'param': config.jaeger.sampler_param,  # type: ignore
+                },
+                'local_agent': {
+                    'reporting_host': config.jaeger.host,  # type: ignore
+                    'reporting_port': config.jaeger.port,  # type: ignore
+                },
+                'logging': config.jaeger.logging,  # type: ignore
+            },
+            service_name=config.jaeger.service_name,  # type: ignore
+            validate=True,
+        )
+
+
+tracing = Tracing()
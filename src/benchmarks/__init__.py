@@ -0,0 +1 @@
+"""Micro benchmarks of service hot paths."""
@@ -0,0 +1,231 @@
+"""In-process load test of the service with local stand-ins.
+
+Virtual users drive the ASGI ``app`` with a mix of registration, auth,
+check_token and verify requests. The application lifespan runs as in
+the service, with Redis replaced by fakeredis, the database by SQLite and
+Kafka by a producer acknowledging messages at once, so no network services
+are needed. Rate limiting is disabled, because virtual users log in far
+more often than the login limit allows. Throughput and latency
+percentiles are reported per endpoint.
+
+Run from the repository root::
+
+    PYTHONPATH=src python -m benchmarks.load --users 32 --duration 30
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from typing import Any
+
+import httpx
+import jwt
+
+from app.constants import MILLISECONDS
+from app.main import app
+from app.service import producer
+from benchmarks.stand_ins import stand_ins
+
+DEFAULT_USERS = 32
+DEFAULT_DURATION = 30
+BASE_URL = 'http://auth-service'
+PASSWORD = 'load_password'  # noqa: S105
+PHOTO_SIZE = 4096
+PHOTO = bytes(PHOTO_SIZE)
+LOGIN_SUFFIX_LENGTH = 12
+OPERATIONS = ('registration', 'auth', 'check_token', 'verify')
+OPERATION_WEIGHTS = (1, 2, 16, 1)
+HEADER_FORMAT = '{0:<18}{1:>10}{2:>8}{3:>12}{4:>10}{5:>10}{6:>10}\n'
+ROW_FORMAT = (
+    '{0:<18}{1:>10}{2:>8}{3:>12.1f}{4:>10.1f}{5:>10.1f}{6:>10.1f}\n'
+)
+ERROR_FORMAT = '{0} responded {1} to {2} requests\n'
+
+
+class LoadStats:
+    """Latencies and failed requests per endpoint."""
+
+    def __init__(self):
+        """Load statistics initialization."""
+        self.latencies: defaultdict[str, list[float]] = defaultdict(list)
+        self.errors: Counter[tuple[str, int]] = Counter()
+
+    def record(self, endpoint: str, latency: float, status_code: int):
+        """Record the request result."""
+        self.latencies[endpoint].append(latency)
+        if status_code >= httpx.codes.BAD_REQUEST:
+            self.errors[endpoint, status_code] += 1
+
+    def endpoint_errors(self, endpoint: str) -> int:
+        """Return failed requests of the endpoint."""
+        return sum(
+            count
+            for (errors_endpoint, _), count in self.errors.items()
+            if errors_endpoint == endpoint
+        )
+
+    def report(self, duration: float):
+        """Print throughput and latency percentiles per endpoint."""
+        sys.stdout.write(
+            HEADER_FORMAT.format(
+                'endpoint',
+                'requests',
+                'errors',
+                'requests/s',
+                'p50, ms',
+                'p95, ms',
+                'p99, ms',
+            ),
+        )
+        for endpoint, latencies in sorted(self.latencies.items()):
+            sys.stdout.write(
+                ROW_FORMAT.format(
+                    endpoint,
+                    len(latencies),
+                    self.endpoint_errors(endpoint),
+                    len(latencies) / duration,
+                    *percentiles(latencies),
+                ),
+            )
+        self.report_errors()
+
+    def report_errors(self):
+        """Print failed requests by endpoint and status code."""
+        for (endpoint, status_code), count in sorted(self.errors.items()):
+            sys.stdout.write(ERROR_FORMAT.format(endpoint, status_code, count))
+
+
+def percentiles(latencies: list[float]) -> tuple[float, float, float]:
+    """Return p50, p95 and p99 latency in milliseconds."""
+    if len(latencies) < 2:
+        latencies = latencies * 2
+    cut_points = statistics.quantiles(latencies, n=100, method='inclusive')
+    return tuple(  # type: ignore
+        cut_points[percentile - 1] * MILLISECONDS
+        for percentile in (50, 95, 99)
+    )
+
+
+def issued_token(response: httpx.Response) -> str | None:
+    """Return the token issued by a successful registration or auth."""
+    if not response.is_success:
+        return None
+    return response.json()['token']
+
+
+def token_user_id(token: str) -> int:
+    """Return the id of the user the token was issued to."""
+    return jwt.decode(token, options={'verify_signature': False})['id']
+
+
+class VirtualUser:
+    """Client registering an account and using it until the deadline."""
+
+    def __init__(self, client: httpx.AsyncClient, stats: LoadStats):
+        """Virtual user initialization."""
+        self.client = client
+        self.stats = stats
+        self.login: str | None = None
+        self.token: str | None = None
+        self.user_id: int | None = None
+
+    async def run(self, deadline: float):
+        """Send requests of the operation mix until the deadline.
+
+        Registration is repeated until it is not shed, so the other
+        requests always have an account to use.
+        """
+        while self.token is None and time.perf_counter() < deadline:
+            await self.registration()
+        while time.perf_counter() < deadline:
+            operation = random.choices(  # noqa: S311
+                OPERATIONS,
+                OPERATION_WEIGHTS,
+            )[0]
+            await getattr(self, operation)()
+
+    async def registration(self):
+        """Register a new account and switch to it."""
+        login = 'load_{0}'.format(uuid.uuid4().hex[:LOGIN_SUFFIX_LENGTH])
+        response = await self._post(
+            '/api/registration',
+            json={'login': login, 'password': PASSWORD},
+        )
+        token = issued_token(response)
+        if token:
+            self.login = login
+            self.token = token
+            self.user_id = token_user_id(token)
+
+    async def auth(self):
+        """Log in to the account, which issues a new token."""
+        response = await self._post(
+            '/api/auth',
+            json={'login': self.login, 'password': PASSWORD},
+        )
+        self.token = issued_token(response) or self.token
+
+    async def check_token(self):
+        """Check the current token."""
+        await self._post('/api/check_token', json={'token': self.token})
+
+    async def verify(self):
+        """Upload a verification photo."""
+        await self._post(
+            '/api/verify',
+            data={'user_id': str(self.user_id)},
+            files={'file': ('photo.jpg', PHOTO, 'image/jpeg')},
+        )
+
+    async def _post(self, endpoint: str, **request: Any) -> httpx.Response:
+        """Send the request and record its latency."""
+        started_at = time.perf_counter()
+        response = await self.client.post(endpoint, **request)
+        self.stats.record(
+            endpoint,
+            time.perf_counter() - started_at,
+            response.status_code,
+        )
+        return response
+
+
+async def run(users: int, duration: float) -> LoadStats:
+    """Load the application with virtual users for the duration."""
+    stats = LoadStats()
+    transport = httpx.ASGITransport(app=app)  # type: ignore
+    with tempfile.TemporaryDirectory() as directory:
+        async with stand_ins(directory):
+            async with httpx.AsyncClient(
+                transport=transport,
+                base_url=BASE_URL,
+            ) as client:
+                deadline = time.perf_counter() + duration
+                await asyncio.gather(*[
+                    VirtualUser(client, stats).run(deadline)
+                    for _ in range(users)
+                ])
+    return stats
+
+
+def main():
+    """Run the load test and print per-endpoint results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=DEFAULT_USERS)
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION)
+    arguments = parser.parse_args()
+    started_at = time.perf_counter()
+    stats = asyncio.run(run(arguments.users, arguments.duration))
+    stats.report(time.perf_counter() - started_at)
+    sys.stdout.write(
+        'Kafka messages published: {0}\n'.format(producer.producer.messages),
+    )
+
+
+if __name__ == '__main__':
+    main()
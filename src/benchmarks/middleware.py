@@ -0,0 +1,189 @@
+"""Per-request overhead of observability middleware on /api/check_token.
+
+Compares the application without middleware, the former pair of
+``BaseHTTPMiddleware`` metrics and tracing middlewares and the pure ASGI
+``ObservabilityMiddleware``. Requests are sent straight to the ASGI app,
+Redis is replaced with fakeredis and the no-op tracer is used, so the
+difference between variants is the middleware cost.
+
+Run from the repository root::
+
+    PYTHONPATH=src python -m benchmarks.middleware --requests 5000
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from fakeredis import FakeAsyncRedis
+from fastapi import FastAPI, Request
+from opentracing import (
+    InvalidCarrierException,
+    SpanContextCorruptedException,
+    global_tracer,
+    propagation,
+    tags,
+)
+
+from app.api import router
+from app.metrics import (
+    AUTH_RESULT,
+    READY_PROBE,
+    REQUEST_COUNT,
+    REQUEST_DURATION,
+    route_template,
+    trace_exemplar,
+)
+from app.middleware import ObservabilityMiddleware
+from app.service import AuthService
+
+WARMUP_REQUESTS = 200
+DEFAULT_REQUESTS = 5000
+MICROSECONDS = 10 ** 6
+HEADER_FORMAT = '{0:<10}{1:>12}{2:>15}\n'
+ROW_FORMAT = '{0:<10}{1:>12.1f}{2:>15.1f}\n'
+REQUEST_HEADERS = (
+    (b'host', b'auth-service:8000'),
+    (b'user-agent', b'python-httpx/0.27.0'),
+    (b'accept', b'*/*'),
+    (b'accept-encoding', b'gzip, deflate'),
+    (b'connection', b'keep-alive'),
+    (b'content-type', b'application/json'),
+    (b'x-request-id', b'5f0c6a3e-8d2b-4a8e-9d1f-3c2b1a0e9f7d'),
+)
+
+
+async def legacy_metrics_middleware(request: Request, call_next):
+    """Metrics middleware before the pure ASGI rewrite."""
+    start_time = time.time()
+    response = await call_next(request)
+    process_time = time.time() - start_time
+    endpoint = route_template(request.scope)
+    exemplar = trace_exemplar(getattr(request.state, 'span', None))
+    REQUEST_DURATION.labels(
+        method=request.method,
+        endpoint=endpoint,
+    ).observe(process_time, exemplar=exemplar)
+    REQUEST_COUNT.labels(
+        method=request.method,
+        endpoint=endpoint,
+        status=response.status_code,
+    ).inc(exemplar=exemplar)
+    if request.url.path == '/api/healthz/ready':
+        READY_PROBE.labels(status=response.status_code).inc()
+    if request.url.path == '/api/auth':
+        AUTH_RESULT.labels(status=response.status_code).inc()
+    return response
+
+
+async def legacy_tracing_middleware(request: Request, call_next):
+    """Tracing middleware before the pure ASGI rewrite."""
+    try:
+        span_ctx = global_tracer().extract(
+            propagation.Format.HTTP_HEADERS,
+            dict(request.headers),
+        )
+    except (InvalidCarrierException, SpanContextCorruptedException):
+        span_ctx = None
+    span_tags = {
+        tags.SPAN_KIND: tags.SPAN_KIND_RPC_SERVER,
+        tags.HTTP_METHOD: request.method,
+        tags.HTTP_URL: str(request.url),
+    }
+    with global_tracer().start_active_span(
+        f'transactions_{request.method}_{request.url.path}',
+        child_of=span_ctx,
+        tags=span_tags,
+    ) as scope:
+        request.state.span = scope.span
+        response = await call_next(request)
+        scope.span.set_tag(tags.HTTP_STATUS_CODE, response.status_code)
+        return response
+
+
+def request_receiver(body: bytes):
+    """ASGI receive sending the body once, then waiting like a live client."""
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+
+    async def receive():  # noqa: WPS430
+        if messages:
+            return messages.pop()
+        return await asyncio.get_running_loop().create_future()
+
+    return receive
+
+
+def build_app(variant: str, redis: FakeAsyncRedis) -> FastAPI:
+    """Application with the middleware variant."""
+    app = FastAPI()
+    app.include_router(router, prefix='/api')
+    app.state.redis = redis
+    if variant == 'base_http':
+        app.middleware('http')(legacy_metrics_middleware)
+        app.middleware('http')(legacy_tracing_middleware)
+    elif variant == 'asgi':
+        app.add_middleware(ObservabilityMiddleware)
+    return app
+
+
+async def measure(app: FastAPI, body: bytes, requests: int) -> float:
+    """Mean /api/check_token request time in microseconds."""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'POST',
+        'scheme': 'http',
+        'path': '/api/check_token',
+        'raw_path': b'/api/check_token',
+        'query_string': b'',
+        'root_path': '',
+        'headers': [
+            *REQUEST_HEADERS,
+            (b'content-length', str(len(body)).encode()),
+        ],
+        'client': ('127.0.0.1', 50000),
+        'server': ('127.0.0.1', 8000),
+    }
+
+    async def send(message):  # noqa: WPS430
+        """Drop the response."""
+
+    for _ in range(WARMUP_REQUESTS):
+        await app(dict(scope), request_receiver(body), send)
+    started_at = time.perf_counter()
+    for _ in range(requests):  # noqa: WPS440
+        await app(dict(scope), request_receiver(body), send)
+    return (time.perf_counter() - started_at) / requests * MICROSECONDS
+
+
+async def run(requests: int) -> dict[str, float]:
+    """Mean request time of every middleware variant."""
+    redis = FakeAsyncRedis(decode_responses=True)
+    token = await AuthService.create_and_put_token(1, redis)
+    body = json.dumps({'token': token}).encode()
+    return {
+        variant: await measure(build_app(variant, redis), body, requests)
+        for variant in ('none', 'base_http', 'asgi')
+    }
+
+
+def main():
+    """Print mean request time and middleware overhead."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS)
+    timings = asyncio.run(run(parser.parse_args().requests))
+    baseline = timings['none']
+    sys.stdout.write(
+        HEADER_FORMAT.format('variant', 'mean, us', 'overhead, us'),
+    )
+    for variant, mean_time in timings.items():
+        sys.stdout.write(
+            ROW_FORMAT.format(variant, mean_time, mean_time - baseline),
+        )
+
+
+if __name__ == '__main__':
+    main()
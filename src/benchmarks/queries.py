@@ -0,0 +1,131 @@
+"""ORM and core statements on the login and verification hot paths.
+
+Every operation runs in a fresh session, like a request does. The
+database from the service config is used unless ``--url`` is given, the
+``user`` table is created if needed and the benchmark user is upserted.
+
+Run from the repository root::
+
+    PYTHONPATH=src python -m benchmarks.queries --operations 2000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Awaitable, Callable
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.db import Base, User, get_credentials, set_verified
+from config import config
+
+DEFAULT_OPERATIONS = 2000
+MICROSECONDS = 10 ** 6
+BENCHMARK_LOGIN = 'benchmark_user'
+HEADER_FORMAT = '{0:<16}{1:>12}\n'
+ROW_FORMAT = '{0:<16}{1:>12.1f}\n'
+
+
+async def orm_login(session: AsyncSession, user_id: int):
+    """Login lookup loading the full ORM object."""
+    query_result = await session.execute(
+        select(User).where(User.login == BENCHMARK_LOGIN),
+    )
+    user = query_result.scalar_one_or_none()
+    return user.id, user.hashed_password  # type: ignore
+
+
+async def core_login(session: AsyncSession, user_id: int):
+    """Login lookup selecting only id and password hash."""
+    return await get_credentials(session, BENCHMARK_LOGIN)
+
+
+async def orm_verify(session: AsyncSession, user_id: int):
+    """SELECT then unit-of-work flush of is_verified."""
+    query_result = await session.execute(
+        select(User).where(User.id == user_id),
+    )
+    user = query_result.scalar_one_or_none()
+    user.is_verified = True  # type: ignore
+    await session.commit()
+
+
+async def core_verify(session: AsyncSession, user_id: int):
+    """Single UPDATE ... RETURNING."""
+    await set_verified(session, user_id)
+    await session.commit()
+
+
+async def measure(
+    session_maker: async_sessionmaker,
+    operation: Callable[[AsyncSession, int], Awaitable],
+    user_id: int,
+    operations: int,
+) -> float:
+    """Mean operation time in microseconds."""
+    started_at = time.perf_counter()
+    for _ in range(operations):
+        async with session_maker() as session:
+            await operation(session, user_id)
+    return (time.perf_counter() - started_at) / operations * MICROSECONDS
+
+
+async def prepare_user(engine: AsyncEngine) -> int:
+    """Create the schema and the benchmark user, return the user id."""
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with AsyncSession(engine) as session:
+        await session.execute(
+            delete(User).where(User.login == BENCHMARK_LOGIN),
+        )
+        user = User(login=BENCHMARK_LOGIN, hashed_password='x' * 60)
+        session.add(user)
+        await session.flush()
+        user_id = user.id
+        await session.commit()
+    return user_id
+
+
+async def run(url: str, operations: int) -> dict[str, float]:
+    """Mean time of every ORM and core operation."""
+    engine = create_async_engine(url)
+    user_id = await prepare_user(engine)
+    session_maker = async_sessionmaker(bind=engine)
+    timings = {}
+    for operation in (orm_login, core_login, orm_verify, core_verify):
+        await measure(session_maker, operation, user_id, operations // 10)
+        timings[operation.__name__] = await measure(
+            session_maker,
+            operation,
+            user_id,
+            operations,
+        )
+    await engine.dispose()
+    return timings
+
+
+def main():
+    """Print mean time of ORM and core operations."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default=config.database_url)
+    parser.add_argument(
+        '--operations',
+        type=int,
+        default=DEFAULT_OPERATIONS,
+    )
+    arguments = parser.parse_args()
+    timings = asyncio.run(run(arguments.url, arguments.operations))
+    sys.stdout.write(HEADER_FORMAT.format('operation', 'mean, us'))
+    for operation, mean_time in timings.items():
+        sys.stdout.write(ROW_FORMAT.format(operation, mean_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Local stand-ins for the network services of the application.
+
+Redis is replaced with fakeredis, PostgreSQL with SQLite and Kafka with a
+producer acknowledging messages at once. The application lifespan runs
+unchanged on top of them.
+"""
+
+import asyncio
+from contextlib import ExitStack, asynccontextmanager
+from functools import partial
+from typing import Any, Callable
+from unittest.mock import patch
+
+from fakeredis import FakeAsyncRedis
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.db import Base, get_async_session
+from app.main import app
+from app.service import outbox_relay, photo_storage, rate_limiter
+from config import config
+
+SQLITE_BUSY_TIMEOUT = 30
+
+
+class StubKafkaProducer:
+    """``AIOKafkaProducer`` stand-in acknowledging messages at once."""
+
+    def __init__(
+        self,
+        value_serializer: Callable[[Any], bytes],
+        **options: Any,
+    ):
+        """Stub producer initialization, connection options are ignored."""
+        self.serializer = value_serializer
+        self.messages = 0
+
+    @property
+    def client(self) -> 'StubKafkaProducer':
+        """Cluster client, the stub answers metadata requests itself."""
+        return self
+
+    async def start(self):
+        """Nothing to connect to."""
+
+    async def send(
+        self,
+        topic: str,
+        value: Any,  # noqa: WPS110
+    ) -> asyncio.Future:
+        """Serialize the message, return its completed delivery."""
+        self.serializer(value)
+        self.messages += 1
+        delivery = asyncio.get_running_loop().create_future()
+        delivery.set_result(None)
+        return delivery
+
+    async def stop(self):
+        """Nothing to flush."""
+
+    async def fetch_all_metadata(self):
+        """Metadata of the stub cluster is always available."""
+
+
+def enable_wal(connection: Any, connection_record: Any):
+    """Let readers run while SQLite commits a write."""
+    connection.execute('PRAGMA journal_mode=WAL')
+
+
+async def create_database(directory: str) -> AsyncEngine:
+    """Create the SQLite database with the service tables."""
+    engine = create_async_engine(
+        'sqlite+aiosqlite:///{0}/load.db'.format(directory),
+        connect_args={'timeout': SQLITE_BUSY_TIMEOUT},
+    )
+    event.listen(engine.sync_engine, 'connect', enable_wal)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    return engine
+
+
+def use_database(engine: AsyncEngine):
+    """Open request and outbox relay sessions in the database."""
+    sessions = async_sessionmaker(bind=engine)
+
+    async def database_session():  # noqa: WPS430
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_async_session] = database_session
+    outbox_relay.session_factory = sessions
+
+
+def network_patches(engine: AsyncEngine, directory: str) -> list[Any]:
+    """Patches replacing network services and the photo directory."""
+    return [
+        patch('app.lifespan.engine', engine),
+        patch(
+            'app.lifespan.create_redis',
+            partial(FakeAsyncRedis, decode_responses=True),
+        ),
+        patch('app.service.producer.AIOKafkaProducer', StubKafkaProducer),
+        patch.object(
+            config.service,  # type: ignore
+            'photo_directory',
+            directory,
+        ),
+        patch.object(photo_storage, 'directory', directory),
+        patch.object(rate_limiter, 'enabled', new=False),
+    ]
+
+
+@asynccontextmanager
+async def stand_ins(directory: str):
+    """Run the application lifespan on local stand-ins."""
+    engine = await create_database(directory)
+    use_database(engine)
+    with ExitStack() as patches:
+        for network_patch in network_patches(engine, directory):
+            patches.enter_context(network_patch)
+        async with app.router.lifespan_context(app):
+            yield
+    app.dependency_overrides.clear()
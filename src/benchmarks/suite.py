@@ -0,0 +1,280 @@
+"""Offline micro benchmarks of the token and password hot paths.
+
+Every benchmark runs enough calls to take ``MIN_RUN_TIME`` and the best
+of ``--repeat`` runs is kept. Redis is replaced with fakeredis and the
+Kafka serializer runs without a producer, so no network is needed.
+Results are compared with the baseline file and the command fails when
+a benchmark is slower than its baseline by more than ``--threshold``.
+
+Run from the repository root::
+
+    PYTHONPATH=src python -m benchmarks
+    PYTHONPATH=src python -m benchmarks --save
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from contextlib import closing
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+from fakeredis import FakeAsyncRedis
+
+from app.api.schemes import (
+    UserCreate,
+    UserTokenBatchCheckRequest,
+    UserTokenCheck,
+    UserTokenCheckRequest,
+)
+from app.constants import TOKEN_BATCH_SIZE
+from app.service import AuthService, password_executor, password_hashers
+from app.service.producer import producer
+
+Benchmark = Callable[[int], float]
+
+BASELINE_PATH = Path(__file__).with_name('baseline.json')
+BASELINE_MISMATCH = (
+    'Baseline was measured on Python {0} ({1}), running on Python {2} ({3})\n'
+)
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.3
+MIN_RUN_TIME = 0.2
+MICROSECONDS = 10 ** 6
+PASSWORD = 'benchmark_password'  # noqa: S105
+HEADER_FORMAT = '{0:<28}{1:>14}{2:>14}{3:>12}\n'
+ROW_FORMAT = '{0:<28}{1:>14.2f}{2:>14}{3:>12}\n'
+REGRESSION = 'REGRESSION'
+
+
+def sync_benchmark(function: Callable, *args: Any) -> Benchmark:
+    """Time ``number`` calls of a function."""
+    call = partial(function, *args)
+
+    def run(number: int) -> float:  # noqa: WPS430
+        started_at = time.perf_counter()
+        for _ in range(number):
+            call()
+        return time.perf_counter() - started_at
+
+    return run
+
+
+def async_benchmark(
+    loop: asyncio.AbstractEventLoop,
+    function: Callable,
+    *args: Any,
+) -> Benchmark:
+    """Time ``number`` awaited calls of a coroutine function in the loop."""
+
+    async def calls(number: int) -> float:  # noqa: WPS430
+        started_at = time.perf_counter()
+        for _ in range(number):
+            await function(*args)
+        return time.perf_counter() - started_at
+
+    return lambda number: loop.run_until_complete(calls(number))
+
+
+def time_per_call(benchmark: Benchmark, repeat: int) -> float:
+    """Return the best time of one call in microseconds."""
+    number = 1
+    while benchmark(number) < MIN_RUN_TIME:
+        number *= 2
+    best_time = min(benchmark(number) for _ in range(repeat))
+    return best_time / number * MICROSECONDS
+
+
+def service_benchmarks(
+    loop: asyncio.AbstractEventLoop,
+    token: str,
+) -> dict[str, Benchmark]:
+    """Create token and password benchmarks with fake Redis.
+
+    Passwords are hashed and checked in the password worker pool, as
+    registration and authentication do.
+    """
+    redis = FakeAsyncRedis(decode_responses=True)
+    loop.run_until_complete(AuthService.put_token(1, token, redis))
+    return {
+        'generate_jwt_token': sync_benchmark(
+            AuthService.generate_jwt_token,
+            1,
+        ),
+        'decode_jwt_token': sync_benchmark(
+            AuthService.decode_jwt_token,
+            token,
+        ),
+        'check_token': async_benchmark(
+            loop,
+            AuthService.check_token,
+            token,
+            redis,
+        ),
+        'hash_password': async_benchmark(
+            loop,
+            password_executor.run,
+            password_hashers.hash,
+            PASSWORD,
+        ),
+        'check_password': async_benchmark(
+            loop,
+            password_executor.run,
+            password_hashers.verify,
+            PASSWORD,
+            password_hashers.hash(PASSWORD),
+        ),
+    }
+
+
+def serialization_benchmarks(token: str) -> dict[str, Benchmark]:
+    """Create API scheme and Kafka serializer benchmarks."""
+    batch_request = {'tokens': [token for _ in range(TOKEN_BATCH_SIZE)]}
+    token_check = UserTokenCheck(user_id=1, is_token_valid=True)
+    return {
+        'scheme_user_create': sync_benchmark(
+            UserCreate.model_validate,
+            {'login': 'benchmark_user', 'password': PASSWORD},
+        ),
+        'scheme_token_check_request': sync_benchmark(
+            UserTokenCheckRequest.model_validate_json,
+            json.dumps({'token': token}),
+        ),
+        'scheme_token_batch_request': sync_benchmark(
+            UserTokenBatchCheckRequest.model_validate_json,
+            json.dumps(batch_request),
+        ),
+        'scheme_token_check_response': sync_benchmark(
+            token_check.model_dump_json,
+        ),
+        'kafka_serializer': sync_benchmark(
+            producer.serializer,
+            {1: 'photos/0b8e3f5c-7a1d-4c2e-9f6b-2d4a8c1e5b7f.jpg'},
+        ),
+    }
+
+
+def run(repeat: int) -> dict[str, float]:
+    """Time of one call of every benchmark in microseconds."""
+    with closing(asyncio.new_event_loop()) as loop:
+        token = AuthService.generate_jwt_token(1)
+        suite = {
+            **service_benchmarks(loop, token),
+            **serialization_benchmarks(token),
+        }
+        loop.run_until_complete(password_executor.start())
+        try:  # noqa: WPS501
+            return {
+                name: time_per_call(benchmark, repeat)
+                for name, benchmark in suite.items()
+            }
+        finally:
+            loop.run_until_complete(password_executor.stop())
+
+
+def is_regression(
+    timing: float,
+    baseline: float | None,
+    threshold: float,
+) -> bool:
+    """Check whether the timing exceeds the baseline by the threshold."""
+    return baseline is not None and timing > baseline * (1 + threshold)
+
+
+def report(
+    timings: dict[str, float],
+    baseline: dict[str, float],
+    threshold: float,
+) -> list[str]:
+    """Print timings against the baseline, return regressed benchmarks."""
+    sys.stdout.write(
+        HEADER_FORMAT.format('benchmark', 'time, us', 'baseline, us', ''),
+    )
+    regressions = []
+    for name, timing in timings.items():
+        baseline_timing = baseline.get(name)
+        regressed = is_regression(timing, baseline_timing, threshold)
+        if regressed:
+            regressions.append(name)
+        sys.stdout.write(
+            ROW_FORMAT.format(
+                name,
+                timing,
+                '-' if baseline_timing is None else round(baseline_timing, 2),
+                REGRESSION if regressed else '',
+            ),
+        )
+    return regressions
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse benchmark suite command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help='allowed slowdown against the baseline, 0.3 is 30 percent',
+    )
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        '--save',
+        action='store_true',
+        help='save the results as the new baseline',
+    )
+    return parser.parse_args()
+
+
+def load_baseline(path: Path) -> dict[str, float]:
+    """Read baseline timings, empty before the first save.
+
+    Timings measured on another interpreter or machine are not comparable,
+    so a mismatch is reported before the results.
+    """
+    if not path.exists():
+        return {}
+    baseline = json.loads(path.read_text())
+    measured_on = (baseline.get('python'), baseline.get('machine'))
+    running_on = (platform.python_version(), platform.machine())
+    if measured_on != running_on:
+        sys.stderr.write(
+            BASELINE_MISMATCH.format(*measured_on, *running_on),
+        )
+    return baseline['results']
+
+
+def save_baseline(path: Path, timings: dict[str, float]):
+    """Write timings with the interpreter they were measured with."""
+    baseline = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'unit': 'us',
+        'results': {
+            name: round(timing, 2) for name, timing in timings.items()
+        },
+    }
+    path.write_text('{0}\n'.format(json.dumps(baseline, indent=2)))
+
+
+def main():
+    """Run the suite, compare with or save the baseline."""
+    arguments = parse_arguments()
+    timings = run(arguments.repeat)
+    regressions = report(
+        timings,
+        load_baseline(arguments.baseline),
+        arguments.threshold,
+    )
+    if arguments.save:
+        save_baseline(arguments.baseline, timings)
+    elif regressions:
+        sys.exit('Regressed benchmarks: {0}'.format(', '.join(regressions)))
+
+
+if __name__ == '__main__':
+    main()
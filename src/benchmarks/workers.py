@@ -0,0 +1,213 @@
+"""Throughput of /api/check_token with one and with several workers.
+
+The service runs under uvicorn with the ``app.server`` settings and is
+loaded over keep-alive connections from separate client processes.
+Redis is replaced with fakeredis in every worker, so the numbers show
+how request handling scales with workers.
+Client processes share the CPUs with the server, so run the benchmark
+on a machine with more CPUs than workers.
+
+Run from the repository root::
+
+    PYTHONPATH=src python -m benchmarks.workers --workers 4 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
+import uvicorn
+from fakeredis import FakeAsyncRedis
+from fastapi import FastAPI
+
+from app.api import router
+from app.middleware import ObservabilityMiddleware
+from app.server import server_options, worker_count
+from app.service import AuthService
+
+HOST = '127.0.0.1'
+JWT_VARIABLE = 'BENCHMARK_JWT'
+REQUEST_HEAD = '\r\n'.join((
+    'POST /api/check_token HTTP/1.1',
+    'Host: {host}',
+    'Content-Type: application/json',
+    'Content-Length: {length}',
+    '',
+    '',
+))
+DEFAULT_DURATION = 10
+DEFAULT_CONNECTIONS = 64
+STARTUP_TIMEOUT = 30
+STARTUP_POLL_INTERVAL = 0.1
+HEADER_FORMAT = '{0:<10}{1:>15}{2:>10}\n'
+ROW_FORMAT = '{0:<10}{1:>15.0f}{2:>10.2f}\n'
+
+
+def create_app() -> FastAPI:
+    """Create the token check application of a single worker."""
+    redis = FakeAsyncRedis(decode_responses=True)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):  # noqa: WPS430
+        await AuthService.put_token(1, os.environ[JWT_VARIABLE], redis)
+        yield
+        await redis.aclose()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(router, prefix='/api')
+    app.add_middleware(ObservabilityMiddleware)
+    app.state.redis = redis
+    return app
+
+
+def serve(port: int, workers: int):
+    """Run the benchmark application workers."""
+    uvicorn.run(
+        'benchmarks.workers:create_app',
+        factory=True,
+        host=HOST,
+        port=port,
+        workers=workers,
+        log_level='warning',
+        **server_options(),
+    )
+
+
+def check_token_request() -> bytes:
+    """Issue the token checked by workers, return the raw request."""
+    token = AuthService.generate_jwt_token(1)
+    os.environ[JWT_VARIABLE] = token
+    body = json.dumps({'token': token}).encode()
+    return REQUEST_HEAD.format(host=HOST, length=len(body)).encode() + body
+
+
+def response_length(headers: bytes) -> int:
+    """Body length from the Content-Length response header."""
+    for header in headers.lower().split(b'\r\n'):
+        if header.startswith(b'content-length:'):
+            return int(header.split(b':')[1])
+    return 0
+
+
+async def connection_load(port: int, request: bytes, deadline: float) -> int:
+    """Send requests over one connection until the deadline."""
+    reader, writer = await asyncio.open_connection(HOST, port)
+    responses = 0
+    while time.perf_counter() < deadline:
+        writer.write(request)
+        headers = await reader.readuntil(b'\r\n\r\n')
+        await reader.readexactly(response_length(headers))
+        responses += 1
+    writer.close()
+    await writer.wait_closed()
+    return responses
+
+
+async def client_load(
+    port: int,
+    request: bytes,
+    connections: int,
+    duration: float,
+) -> int:
+    """Load the server from concurrent connections."""
+    deadline = time.perf_counter() + duration
+    responses = await asyncio.gather(*[
+        connection_load(port, request, deadline) for _ in range(connections)
+    ])
+    return sum(responses)
+
+
+def run_client(
+    port: int,
+    request: bytes,
+    connections: int,
+    duration: float,
+) -> int:
+    """Client process entry point."""
+    return asyncio.run(client_load(port, request, connections, duration))
+
+
+def free_port() -> int:
+    """Port free for the benchmark server."""
+    with socket.socket() as port_socket:
+        port_socket.bind((HOST, 0))
+        return port_socket.getsockname()[1]
+
+
+def wait_for_server(port: int):
+    """Wait until the server accepts connections."""
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((HOST, port)).close()
+        except OSError:
+            time.sleep(STARTUP_POLL_INTERVAL)
+        else:
+            return
+    raise TimeoutError('Server did not start on port {0}'.format(port))
+
+
+def measure(workers: int, request: bytes, arguments) -> float:
+    """Measure requests per second served by the number of workers."""
+    port = free_port()
+    server = multiprocessing.Process(target=serve, args=(port, workers))
+    server.start()
+    wait_for_server(port)
+    try:  # noqa: WPS501
+        with ProcessPoolExecutor(arguments.clients) as clients:
+            responses = clients.map(
+                run_client,
+                *zip(*[
+                    (port, request, arguments.connections, arguments.duration)
+                    for _ in range(arguments.clients)
+                ]),
+            )
+            return sum(responses) / arguments.duration
+    finally:
+        server.terminate()
+        server.join()
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parse benchmark command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=worker_count())
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION)
+    parser.add_argument(
+        '--connections',
+        type=int,
+        default=DEFAULT_CONNECTIONS,
+        help='connections per client process',
+    )
+    parser.add_argument('--clients', type=int, default=os.cpu_count())
+    return parser.parse_args()
+
+
+def main():
+    """Print throughput of a single worker and of several workers."""
+    arguments = parse_arguments()
+    request = check_token_request()
+    throughput = {
+        workers: measure(workers, request, arguments)
+        for workers in sorted({1, arguments.workers})
+    }
+    sys.stdout.write(HEADER_FORMAT.format('workers', 'requests/s', 'speedup'))
+    for workers, requests_per_second in throughput.items():
+        sys.stdout.write(
+            ROW_FORMAT.format(
+                workers,
+                requests_per_second,
+                requests_per_second / throughput[1],
+            ),
+        )
+
+
+if __name__ == '__main__':
+    main()
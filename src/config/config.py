@@ -1,9 +1,12 @@
 from pathlib import Path
+from typing import Literal
 
 import yaml
-from pydantic import SecretStr
+from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+KafkaCompression = Literal['gzip', 'snappy', 'lz4', 'zstd']
+
 
 class _SettingsModel(BaseSettings):
     """Base settings."""
@@ -42,14 +45,41 @@ class _ServiceSettings(_SettingsModel):
     kafka_host: str
     kafka_port: int
     kafka_topic: str
+    kafka_linger_ms: int = 0
+    kafka_max_batch_size: int = 16384
+    kafka_compression_type: KafkaCompression | None = None
+    kafka_acks: Literal[0, 1, 'all'] = 1
     photo_directory: str
     acceptable_formats: list[str]
+    max_photo_size: int = 10485760
+    photo_chunk_size: int = 65536
     token_ttl: int
     db_hostname: str
     db_port: int
     db_name: str
     db_username: str
     db_echo: bool
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = -1
+    db_pool_pre_ping: bool = False
+    db_pool_warm_up: bool = True
+    db_connect_timeout: float = 60
+    db_command_timeout: float | None = None
+    db_statement_cache_size: int = 100
+    db_prepared_statement_cache_size: int = 100
+    password_executor: Literal['thread', 'process'] = 'thread'
+    password_workers: int = 2
+    workers: int = 0
+    loop: Literal['auto', 'asyncio', 'uvloop'] = 'auto'
+    http: Literal['auto', 'h11', 'httptools'] = 'auto'
+    backlog: int = 2048
+    limit_concurrency: int | None = None
+    keep_alive_timeout: int = 5
+    graceful_timeout: int | None = 30
+    proxy_headers: bool = True
+    forwarded_allow_ips: list[str] = ['127.0.0.1']
     tags_metadata_auth: dict[str, str]
     tags_metadata_check: dict[str, str]
     tags_metadata_health: dict[str, str]
@@ -81,6 +111,12 @@ class _JaegerSettings(_SettingsModel):
     logging: bool
     sampler_type: str
     sampler_param: float | int
+    backend: Literal['jaeger', 'opentelemetry'] = 'jaeger'
+    otlp_url: str = 'http://jaeger:4318/v1/traces'
+    batch_max_queue_size: int = 2048
+    batch_max_export_size: int = 512
+    batch_delay: float = 5
+    batch_export_timeout: float = 30
 
 
 class _RedisSettings(_SettingsModel):
@@ -89,6 +125,129 @@ class _RedisSettings(_SettingsModel):
     url: str
     db: int
     decode_responses: bool
+    token_key_prefix: str = 'auth:token:'
+    legacy_token_keys: bool = True
+    mode: Literal['standalone', 'sentinel', 'cluster'] = 'standalone'
+    sentinels: list[str] = Field(default_factory=list)
+    sentinel_service_name: str = 'mymaster'
+    max_connections: int = 50
+    pool_timeout: float = 1
+    socket_timeout: float = 1
+    socket_connect_timeout: float = 1
+    health_check_interval: int = 30
+    retry_attempts: int = 3
+    retry_backoff_base: float = 0.01
+    retry_backoff_cap: float = 0.5
+    client_cache_enabled: bool = False
+    client_cache_max_size: int = 10000
+    client_cache_check_interval: float = 5
+
+
+class _JWTSettings(_SettingsModel):
+    """JWT signing settings validation."""
+
+    algorithm: Literal['HS256', 'EdDSA', 'ES256', 'RS256'] = 'HS256'
+    key_directory: str = './keys'
+    active_kid: str | None = None
+    jwks_max_age: int = 300
+
+
+class _TokenCacheSettings(_SettingsModel):
+    """Token cache settings validation."""
+
+    enabled: bool = False
+    max_size: int = 10000
+    ttl: int = 60
+    channel: str = 'auth:token_invalidation'
+    reconnect_delay: float = 1
+
+
+class _MetricsSettings(_SettingsModel):
+    """Metrics settings validation."""
+
+    request_duration_buckets: list[float] = [
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.075,
+        0.1,
+        0.25,
+        0.5,
+        0.75,
+        1,
+        2.5,
+        5,
+        10,
+    ]
+    multiprocess_directory: str = './prometheus_multiproc'
+
+
+class _HealthSettings(_SettingsModel):
+    """Health probes settings validation."""
+
+    check_interval: float = 5
+    check_timeout: float = 2
+    heartbeat_interval: float = 0.5
+    stall_timeout: float = 5
+
+
+class _OutboxSettings(_SettingsModel):
+    """Outbox relay settings validation."""
+
+    batch_size: int = 100
+    poll_interval: float = 1
+
+
+class _LoginCacheSettings(_SettingsModel):
+    """Missing login cache settings validation."""
+
+    enabled: bool = True
+    ttl: int = 60
+    prefix: str = 'auth:missing_login:'
+
+
+class _RateLimitSettings(_SettingsModel):
+    """Rate limit settings validation."""
+
+    enabled: bool = True
+    window: int = 60
+    prefix: str = 'auth:rate_limit:'
+    limits: dict[str, dict[str, int]] = {
+        'auth': {'login': 10},
+        'registration': {'ip': 20},
+    }
+
+
+class _AdmissionLimitSettings(_SettingsModel):
+    """Endpoint admission limit settings validation."""
+
+    concurrency: int
+    queue_size: int
+    timeout: float
+
+
+class _AdmissionSettings(_SettingsModel):
+    """Admission control settings validation."""
+
+    enabled: bool = True
+    retry_after: int = 1
+    endpoints: dict[str, _AdmissionLimitSettings] = {}
+
+
+class _PasswordHashingSettings(_SettingsModel):
+    """Password hashing settings validation."""
+
+    algorithm: Literal['bcrypt', 'scrypt', 'argon2id'] = 'bcrypt'
+    bcrypt_rounds: int = 12
+    scrypt_ln: int = 15
+    scrypt_block_size: int = 8
+    scrypt_parallelism: int = 1
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536
+    argon2_parallelism: int = 4
+    calibrate: bool = False
+    target_time: float = 0.25
 
 
 class Settings(_SettingsModel, _SettingsSecret):
@@ -97,6 +256,25 @@ class Settings(_SettingsModel, _SettingsSecret):
     service: _ServiceSettings
     jaeger: _JaegerSettings
     redis: _RedisSettings
+    jwt: _JWTSettings = Field(default_factory=_JWTSettings)
+    token_cache: _TokenCacheSettings = Field(
+        default_factory=_TokenCacheSettings,
+    )
+    password_hashing: _PasswordHashingSettings = Field(
+        default_factory=_PasswordHashingSettings,
+    )
+    login_cache: _LoginCacheSettings = Field(
+        default_factory=_LoginCacheSettings,
+    )
+    rate_limit: _RateLimitSettings = Field(
+        default_factory=_RateLimitSettings,
+    )
+    admission: _AdmissionSettings = Field(
+        default_factory=_AdmissionSettings,
+    )
+    outbox: _OutboxSettings = Field(default_factory=_OutboxSettings)
+    health: _HealthSettings = Field(default_factory=_HealthSettings)
+    metrics: _MetricsSettings = Field(default_factory=_MetricsSettings)
 
     @property
     def database_url(self):
@@ -1,13 +1,24 @@
 import pytest
 
+from app.db.database import async_session
 from app.main import app
-from app.service import AuthService
+from app.service import AuthService, outbox_relay
 
 
 @pytest.fixture()
 async def delete_token():
     """Token removing from db."""
-    await app.state.redis.delete(1)
+    await app.state.redis.delete(AuthService.token_key(1), 1)
+
+
+@pytest.fixture()
+async def drained_outbox():
+    """Outbox without pending events and with the relay stopped."""
+    await outbox_relay.stop()
+    async with async_session() as session:
+        await outbox_relay.relay_batch(session)
+    yield
+    await outbox_relay.start()
 
 
 @pytest.fixture
@@ -34,6 +45,18 @@ def check_link():
     return '/api/check_token'
 
 
+@pytest.fixture
+def batch_check_link():
+    """Batch token check link."""
+    return '/api/check_token/batch'
+
+
+@pytest.fixture
+def jwks_link():
+    """JWKS endpoint link."""
+    return '/.well-known/jwks.json'
+
+
 @pytest.fixture
 def metrics_link():
     """Metrics endpoint link."""
@@ -1,13 +1,18 @@
+import asyncio
+import uuid
+
 import pytest
 from sqlalchemy import text
 
 from app.constants import (
     KAFKA_RESPONSE,
+    PHOTO_TOO_LARGE,
     USER_EXISTS_MESSAGE,
     USER_NOT_FOUND,
     WRONG_IMAGE_FORMAT,
 )
-from app.db.database import engine
+from app.db import Outbox
+from app.db.database import async_session, engine
 from app.main import app
 from app.metrics import (
     AUTH_RESULT,
@@ -15,6 +20,7 @@ from app.metrics import (
     REQUEST_COUNT,
     REQUEST_DURATION,
 )
+from app.service import AuthService, outbox_relay, photo_storage, rate_limiter
 
 
 @pytest.mark.anyio
@@ -27,7 +33,9 @@ async def test_registration(client, test_user, registration_link):
             text('SELECT login FROM "user" WHERE id = 1'),
         )
         assert test_user['login'] == user.scalar_one_or_none()
-        assert response.json()['token'] == await app.state.redis.get(1)
+        assert AuthService.token_digest(
+            response.json()['token'],
+        ) == await app.state.redis.get(AuthService.token_key(1))
 
 
 @pytest.mark.anyio
@@ -41,7 +49,9 @@ async def test_authentication(client, test_user, auth_link):
             text('SELECT login FROM "user" WHERE id = 1'),
         )
         assert test_user['login'] == user.scalar_one_or_none()
-        assert response.json()['token'] == await app.state.redis.get(1)
+        assert AuthService.token_digest(
+            response.json()['token'],
+        ) == await app.state.redis.get(AuthService.token_key(1))
 
 
 @pytest.mark.anyio
@@ -58,6 +68,20 @@ async def test_registration_existing_user(
     )
 
 
+@pytest.mark.anyio
+async def test_concurrent_registration(client, test_user, registration_link):
+    """Only one of concurrent registrations with the same login succeeds."""
+    new_user = {**test_user, 'login': 'concurrent'}
+    responses = await asyncio.gather(
+        client.post(registration_link, json=new_user),
+        client.post(registration_link, json=new_user),
+    )
+    assert sorted(response.status_code for response in responses) == [
+        200,
+        400,
+    ]
+
+
 @pytest.mark.anyio
 async def test_wrong_login(
     auth_link,
@@ -88,6 +112,32 @@ async def test_no_user_token_check(client, check_link, no_user_token):
     assert response.json()['is_token_valid'] is False
 
 
+@pytest.mark.anyio
+async def test_batch_token_check(
+    client,
+    registration_link,
+    test_user,
+    batch_check_link,
+    no_user_token,
+):
+    """Batch token check test."""
+    response = await client.post(
+        registration_link,
+        json={**test_user, 'login': 'batch_check'},
+    )
+    token = response.json()['token']
+    user_id = AuthService.decode_jwt_token(token)['id']
+    response = await client.post(
+        batch_check_link,
+        json={'tokens': [token, no_user_token, 'invalid']},
+    )
+    assert response.status_code == 200
+    assert [
+        token_check['is_token_valid'] for token_check in response.json()
+    ] == [True, False, False]
+    assert response.json()[0]['user_id'] == user_id
+
+
 @pytest.mark.anyio
 async def test_check_healthz(client, check_health_link):
     """Health check test."""
@@ -120,6 +170,18 @@ async def test_photo_upload(
     assert response.json()['message'] == KAFKA_RESPONSE
 
 
+@pytest.mark.anyio
+async def test_outbox_relay(client, drained_outbox):
+    """Outbox events are published and removed."""
+    async with async_session() as session:
+        session.add(Outbox(topic='faces', payload={'1': 'photo.jpg'}))
+        await session.commit()
+        assert await outbox_relay.relay_batch(session) == 1
+    async with engine.connect() as conn:
+        events = await conn.execute(text('SELECT count(*) FROM outbox'))
+        assert events.scalar_one() == 0
+
+
 @pytest.mark.anyio
 async def test_wrong_file_upload(client, verify_link, wrong_file):
     """Wrong file upload test."""
@@ -134,6 +196,24 @@ async def test_wrong_file_upload(client, verify_link, wrong_file):
     )
 
 
+@pytest.mark.anyio
+async def test_too_large_file_upload(
+    client,
+    verify_link,
+    image_file,
+    monkeypatch,
+):
+    """Oversized photo upload test."""
+    monkeypatch.setattr(photo_storage, 'max_size', 5)
+    response = await client.post(
+        verify_link,
+        data={'user_id': 1},
+        files={'file': ('one_face.jpg', image_file, 'image/jpeg')},
+    )
+    assert response.status_code == 413
+    assert response.json()['detail'] == PHOTO_TOO_LARGE.format(max_size=5)
+
+
 @pytest.mark.anyio
 async def test_authentication_without_token(
     client,
@@ -142,13 +222,62 @@ async def test_authentication_without_token(
     delete_token,
 ):
     """Auth user test without token in redis."""
-    assert await app.state.redis.get(1) is None
+    assert await app.state.redis.get(AuthService.token_key(1)) is None
     response = await client.post(auth_link, json=test_user)
     assert response.status_code == 200
     assert 'token' in response.json()
     assert response.json()['token'] is not None
 
 
+@pytest.mark.anyio
+async def test_registration_after_missing_login(
+    client,
+    test_user,
+    registration_link,
+    auth_link,
+):
+    """Login cached as missing can authenticate after registration."""
+    new_user = {**test_user, 'login': 'late_user'}
+    response = await client.post(auth_link, json=new_user)
+    assert response.status_code == 404
+    response = await client.post(registration_link, json=new_user)
+    assert response.status_code == 200
+    response = await client.post(auth_link, json=new_user)
+    assert response.status_code == 200
+
+
+@pytest.mark.anyio
+async def test_auth_rate_limit(client, test_user, auth_link, monkeypatch):
+    """Authentication attempts above the login limit get 429."""
+    monkeypatch.setattr(rate_limiter, 'limits', {'auth': {'login': 1}})
+    limited_user = {**test_user, 'login': uuid.uuid4().hex[:20]}
+    response = await client.post(auth_link, json=limited_user)
+    assert response.status_code == 404
+    response = await client.post(auth_link, json=limited_user)
+    assert response.status_code == 429
+    assert int(response.headers['retry-after']) > 0
+
+
+@pytest.mark.anyio
+async def test_legacy_token_check(client, check_link, delete_token):
+    """Full token stored under the bare user id key is still accepted."""
+    token = AuthService.generate_jwt_token(1)
+    await app.state.redis.set(1, token)
+    response = await client.post(check_link, json={'token': token})
+    assert response.json()['is_token_valid'] is True
+    await AuthService.create_and_put_token(1, app.state.redis)
+    assert await app.state.redis.get(1) is None
+
+
+@pytest.mark.anyio
+async def test_jwks(client, jwks_link):
+    """JWKS endpoint test."""
+    response = await client.get(jwks_link)
+    assert response.status_code == 200
+    assert response.json() == {'keys': []}
+    assert 'max-age' in response.headers['cache-control']
+
+
 @pytest.mark.anyio
 async def test_metrics(client, metrics_link):
     """Metrics endpoint test."""
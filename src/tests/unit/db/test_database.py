@@ -0,0 +1,62 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.database import PoolMetrics, TimedQueuePool, warm_up_pool
+from app.metrics import DB_POOL_CHECKED_OUT, DB_POOL_OVERFLOW, DB_POOL_WAIT
+
+
+@pytest.fixture()
+async def pooled_engine(tmp_path):
+    """SQLite engine with the measured connection pool."""
+    engine = create_async_engine(
+        f'sqlite+aiosqlite:///{tmp_path}/pool.db',
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+    )
+    PoolMetrics(engine.sync_engine.pool, pool_size=1).listen()
+    yield engine
+    await engine.dispose()
+
+
+def pool_waits():
+    """Observed connection acquisitions."""
+    return REGISTRY.get_sample_value(f'{DB_POOL_WAIT._name}_count')
+
+
+@pytest.mark.anyio
+async def test_warm_up_pool(pooled_engine):
+    """Warm up opens connections and returns them to the pool."""
+    await warm_up_pool(pooled_engine, 2)
+    pool = pooled_engine.sync_engine.pool
+    assert pool.checkedout() == 0
+    assert pool.checkedin() == 1
+
+
+@pytest.mark.anyio
+async def test_warm_up_pool_failure(tmp_path, caplog):
+    """Failed connections are logged instead of failing the startup."""
+    engine = create_async_engine(
+        f'sqlite+aiosqlite:///{tmp_path}/missing/pool.db',
+        poolclass=TimedQueuePool,
+    )
+    await warm_up_pool(engine, 2)
+    await engine.dispose()
+    assert 'Opened 0 of 2 pool connections' in caplog.text
+
+
+@pytest.mark.anyio
+async def test_pool_metrics(pooled_engine):
+    """Checkouts update the gauges and observe the wait time."""
+    waits = pool_waits()
+    async with pooled_engine.connect() as connection:
+        await connection.execute(text('SELECT 1'))
+        async with pooled_engine.connect() as overflow_connection:
+            await overflow_connection.execute(text('SELECT 1'))
+            assert DB_POOL_CHECKED_OUT._value.get() == 2
+            assert DB_POOL_OVERFLOW._value.get() == 1
+    assert DB_POOL_CHECKED_OUT._value.get() == 0
+    assert DB_POOL_OVERFLOW._value.get() == 0
+    assert pool_waits() == waits + 2
@@ -0,0 +1,25 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db import Base, get_credentials, insert_user, set_verified
+
+
+@pytest.fixture()
+async def session():
+    """Session of an in-memory SQLite database with the service tables."""
+    engine = create_async_engine('sqlite+aiosqlite://')
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(bind=engine)() as database_session:
+        yield database_session
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_insert_user_on_sqlite(session):
+    """Taken login is not inserted again on SQLite."""
+    user_id = await insert_user(session, 'user', 'hash')
+    assert user_id is not None
+    assert await insert_user(session, 'user', 'other_hash') is None
+    assert tuple(await get_credentials(session, 'user')) == (user_id, 'hash')
+    assert await set_verified(session, user_id)
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from app.service.admission import AdmissionLimiter, AdmissionRejectedError
+
+
+@pytest.fixture()
+def limiter():
+    """Limiter with a single slot and a single queue place."""
+    return AdmissionLimiter(
+        name='test',
+        concurrency=1,
+        queue_size=1,
+        timeout=0.05,
+    )
+
+
+async def hold(limiter, release):
+    """Keep a slot until released."""
+    async with limiter.admit():
+        await release.wait()
+
+
+@pytest.mark.anyio
+async def test_wait_deadline(limiter):
+    """Request waiting longer than the deadline is rejected."""
+    release = asyncio.Event()
+    holder = asyncio.create_task(hold(limiter, release))
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejectedError) as excinfo:
+        await hold(limiter, release)
+    assert excinfo.value.reason == 'timeout'
+    release.set()
+    await holder
+    assert limiter.waiting == 0
+
+
+@pytest.mark.anyio
+async def test_full_queue(limiter):
+    """Request over the queue size is rejected at once."""
+    release = asyncio.Event()
+    holder = asyncio.create_task(hold(limiter, release))
+    waiter = asyncio.create_task(hold(limiter, release))
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejectedError) as excinfo:
+        await hold(limiter, release)
+    assert excinfo.value.reason == 'queue_full'
+    release.set()
+    await asyncio.gather(holder, waiter)
@@ -0,0 +1,85 @@
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from app.service import tokens
+from app.service.client_cache import ClientSideCache
+from app.service.tokens import TokenService
+
+
+@pytest.fixture()
+def cache():
+    """Subscribed client-side cache."""
+    client_cache = ClientSideCache(
+        enabled=True,
+        max_size=2,
+        prefix='auth:token:',
+        reconnect_delay=0,
+        check_interval=1,
+    )
+    client_cache.subscribed = True
+    return client_cache
+
+
+def test_cached_keys(cache):
+    """Cached values and missing keys lookup test."""
+    cache.put_many({'auth:token:1': 'a', 'auth:token:2': None}, cache.version)
+    assert cache.get_many(['auth:token:1', 'auth:token:2', 'auth:token:3']) == {
+        'auth:token:1': 'a',
+        'auth:token:2': None,
+    }
+
+
+def test_untracked_keys_are_not_cached(cache):
+    """Keys outside the tracked prefix are never cached."""
+    cache.put_many({'1': 'legacy'}, cache.version)
+    assert not cache.entries
+
+
+def test_stale_read_is_not_cached(cache):
+    """Values read before an invalidation are dropped."""
+    version = cache.version
+    cache.invalidate(['auth:token:1'])
+    cache.put_many({'auth:token:1': 'stale'}, version)
+    assert not cache.get_many(['auth:token:1'])
+
+
+def test_cache_invalidation(cache):
+    """Invalidated keys and flushes drop cached values."""
+    cache.put_many({'auth:token:1': 'a', 'auth:token:2': 'b'}, cache.version)
+    cache.invalidate(['auth:token:1'])
+    assert list(cache.entries) == ['auth:token:2']
+    cache.invalidate(None)
+    assert not cache.entries
+
+
+def test_cache_size_eviction(cache):
+    """Least recently used key eviction test."""
+    cache.put_many({'auth:token:1': 'a', 'auth:token:2': 'b'}, cache.version)
+    cache.get_many(['auth:token:1'])
+    cache.put_many({'auth:token:3': 'c'}, cache.version)
+    assert list(cache.entries) == ['auth:token:1', 'auth:token:3']
+
+
+def test_unsubscribed_cache(cache):
+    """Cache is bypassed while invalidations are not received."""
+    cache.put_many({'auth:token:1': 'a'}, cache.version)
+    cache.subscribed = False
+    assert not cache.get_many(['auth:token:1'])
+
+
+@pytest.mark.anyio
+async def test_token_digests_are_cached(cache, monkeypatch):
+    """Token digests are read from redis once while not invalidated."""
+    monkeypatch.setattr(tokens, 'client_cache', cache)
+    redis = FakeAsyncRedis(decode_responses=True)
+    await redis.set(TokenService.token_key(1), 'digest')
+    assert await TokenService.get_tokens({1, 2}, redis) == {
+        1: 'digest',
+        2: None,
+    }
+    await redis.set(TokenService.token_key(1), 'other_digest')
+    assert await TokenService.get_token(1, redis) == 'digest'
+    await TokenService.put_token(1, 'token', redis)
+    assert await TokenService.get_token(1, redis) == (
+        TokenService.token_digest('token')
+    )
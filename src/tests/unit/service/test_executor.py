@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.service import password_hashers
+from app.service.executor import PasswordExecutor
+
+
+@pytest.mark.anyio
+async def test_executor_runs_password_check():
+    """Password check in worker pool test."""
+    executor = PasswordExecutor(executor_type='thread', max_workers=1)
+    await executor.start()
+    hashed_password = await executor.run(password_hashers.hash, 'secret')
+    assert await executor.run(
+        password_hashers.verify,
+        'secret',
+        hashed_password,
+    )
+    await executor.stop()
+
+
+@pytest.mark.anyio
+async def test_executor_not_started():
+    """Not started executor test."""
+    executor = PasswordExecutor(executor_type='thread', max_workers=1)
+    with pytest.raises(RuntimeError):
+        await executor.run(password_hashers.hash, 'secret')
+
+
+@pytest.mark.anyio
+async def test_cancelled_run_keeps_slot_until_work_finishes():
+    """Cancelled caller does not free the slot of a running task."""
+    executor = PasswordExecutor(executor_type='thread', max_workers=1)
+    await executor.start()
+    started = threading.Event()
+    finish = threading.Event()
+
+    def blocking():
+        started.set()
+        finish.wait()
+
+    task = asyncio.create_task(executor.run(blocking))
+    await asyncio.to_thread(started.wait)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert executor.semaphore.locked()
+    finish.set()
+    assert await executor.run(int, '1') == 1
+    assert not executor.semaphore.locked()
+    await executor.stop()
@@ -0,0 +1,110 @@
+import pickle
+
+import pytest
+
+from app.service.hashers import (
+    Argon2Hasher,
+    BcryptHasher,
+    PasswordHasher,
+    PasswordHashers,
+    ScryptHasher,
+)
+
+
+@pytest.fixture(
+    params=(
+        BcryptHasher(rounds=4),
+        ScryptHasher(ln=10, block_size=8, parallelism=1),
+        Argon2Hasher(time_cost=1, memory_cost=1024, parallelism=1),
+    ),
+    ids=('bcrypt', 'scrypt', 'argon2id'),
+)
+def hasher(request):
+    """Cheap hasher of every supported algorithm."""
+    return request.param
+
+
+def test_hash_verification(hasher):
+    """Hash is verified with the right password only."""
+    hashed_password = hasher.hash('secret')
+    assert hasher.identifies(hashed_password)
+    assert hasher.verify('secret', hashed_password)
+    assert not hasher.verify('wrong', hashed_password)
+
+
+def test_weaker_hash_needs_rehash(hasher):
+    """Hash with a lower cost than the current one needs rehash."""
+    hashed_password = hasher.hash('secret')
+    assert not hasher.needs_rehash(hashed_password)
+    assert hasher.with_cost(hasher.cost + 1).needs_rehash(hashed_password)
+    assert not hasher.with_cost(hasher.cost - 1).needs_rehash(
+        hashed_password,
+    )
+
+
+def test_registry_verifies_every_algorithm():
+    """Hashes of other algorithms are verified and need rehash."""
+    bcrypt_hasher = BcryptHasher(rounds=4)
+    hashers = PasswordHashers(
+        hashers=[
+            bcrypt_hasher,
+            ScryptHasher(ln=10, block_size=8, parallelism=1),
+        ],
+        default='scrypt',
+    )
+    bcrypt_hash = bcrypt_hasher.hash('secret')
+    assert hashers.verify('secret', bcrypt_hash)
+    assert hashers.needs_rehash(bcrypt_hash)
+    assert not hashers.needs_rehash(hashers.hash('secret'))
+    assert not hashers.verify('secret', 'unknown')
+
+
+def test_calibration():
+    """Calibrated hasher reaches the target time."""
+    hashers = PasswordHashers(hashers=[BcryptHasher(rounds=4)], default='bcrypt')
+    hashers.calibrate(target_time=0.005)
+    assert hashers.default.cost > 4
+    assert hashers.hashers['bcrypt'] is hashers.default
+
+
+def test_registry_is_picklable():
+    """Registry keeps its parameters in worker processes."""
+    hashers = PasswordHashers(
+        hashers=[Argon2Hasher(time_cost=1, memory_cost=1024, parallelism=1)],
+        default='argon2id',
+    )
+    restored_hashers = pickle.loads(pickle.dumps(hashers))
+    assert restored_hashers.verify('secret', hashers.hash('secret'))
+    assert restored_hashers.default.cost == 1
+
+
+@pytest.mark.parametrize('hashed_password', [
+    '$scrypt$',
+    '$scrypt$ln=10,r=8,p=1$c2FsdA',
+    '$scrypt$ln=10,r=8$c2FsdA$a2V5',
+    '$scrypt$ln=ten,r=8,p=1$c2FsdA$a2V5',
+    '$scrypt$ln=0,r=8,p=1$c2FsdA$a2V5',
+    '$scrypt$ln=10,r=8,p=1$c2Fs!$a2V5',
+    '$2b$xx$corrupt',
+    '$argon2id$corrupt',
+])
+def test_corrupt_hash(hashed_password):
+    """Corrupt hash is not verified and needs rehash."""
+    hashers = PasswordHashers(
+        hashers=[
+            BcryptHasher(rounds=4),
+            ScryptHasher(ln=10, block_size=8, parallelism=1),
+            Argon2Hasher(time_cost=1, memory_cost=1024, parallelism=1),
+        ],
+        default='scrypt',
+    )
+    assert not hashers.verify('secret', hashed_password)
+    for hasher in hashers.hashers.values():
+        if hasher.identifies(hashed_password):
+            assert hasher.needs_rehash(hashed_password)
+
+
+def test_hasher_interface_is_abstract():
+    """Hasher without the algorithm methods is not created."""
+    with pytest.raises(TypeError):
+        PasswordHasher()
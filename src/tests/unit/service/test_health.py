@@ -0,0 +1,113 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.service import health
+from app.service.health import DependencyChecks, Heartbeat, HealthChecker
+
+
+class FakeClock:
+    """Monotonic clock moved forward by the test."""
+
+    def __init__(self):
+        """Fake clock initialization."""
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        """Return the current fake time."""
+        return self.now
+
+
+@pytest.fixture()
+def checker():
+    """Health checker with short intervals."""
+    return HealthChecker(
+        dependency_checks=DependencyChecks(interval=0.05, timeout=0.05),
+        heartbeat=Heartbeat(interval=0.01, stall_timeout=0.1),
+    )
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    """Fake clock of the health checker."""
+    fake_clock = FakeClock()
+    monkeypatch.setattr(health, 'time', fake_clock)
+    return fake_clock
+
+
+async def run_once(checker, clock, background_loop):
+    """Run one pass of a background loop, its sleep moves the clock."""
+    async def sleep(delay):  # noqa: WPS430
+        clock.now += delay
+        checker.tasks = []
+
+    checker.tasks = [asyncio.current_task()]
+    with patch('asyncio.sleep', sleep):
+        await background_loop()
+
+
+async def passing_check():
+    """Dependency check that passes."""
+
+
+async def failing_check():
+    """Dependency check that fails."""
+    raise ConnectionError
+
+
+async def hanging_check():
+    """Dependency check that never answers."""
+    await asyncio.Event().wait()
+
+
+@pytest.mark.anyio
+async def test_dependency_checks(checker):
+    """Readiness needs every dependency check to pass in time."""
+    await checker.start({'redis': passing_check, 'database': passing_check})
+    assert checker.is_ready()
+    await checker.stop()
+    checker.dependency_checks.dependencies['kafka'] = hanging_check
+    await checker.dependency_checks.refresh()
+    assert checker.dependency_checks.checks == {'redis': True, 'database': True, 'kafka': False}
+    assert not checker.is_ready()
+    checker.dependency_checks.dependencies['kafka'] = failing_check
+    await checker.dependency_checks.refresh()
+    assert not checker.is_ready()
+
+
+@pytest.mark.anyio
+async def test_stale_checks(checker):
+    """Results not refreshed in time are not trusted."""
+    await checker.start({'redis': passing_check})
+    await checker.stop()
+    checker.dependency_checks.checked_at -= 1
+    assert not checker.is_ready()
+
+
+@pytest.mark.anyio
+async def test_checks_are_refreshed(checker, clock):
+    """Background task refreshes the checks every interval."""
+    await checker.start({'redis': passing_check})
+    await checker.stop()
+    checker.dependency_checks.dependencies['redis'] = failing_check
+    await run_once(checker, clock, checker._check_periodically)
+    assert checker.dependency_checks.checks == {'redis': False}
+    assert checker.dependency_checks.checked_at == checker.dependency_checks.interval
+
+
+@pytest.mark.anyio
+async def test_event_loop_stall(checker, clock):
+    """Blocked event loop is reported by the heartbeat."""
+    await checker.start({})
+    await checker.stop()
+    clock.now += 0.05
+    assert checker.is_alive()
+    clock.now += 0.15
+    assert not checker.is_alive()
+    await run_once(checker, clock, checker._heartbeat)
+    assert checker.heartbeat.loop_lag == pytest.approx(0.2)
+    assert not checker.is_alive()
+    await run_once(checker, clock, checker._heartbeat)
+    assert checker.heartbeat.loop_lag == pytest.approx(0)
+    assert checker.is_alive()
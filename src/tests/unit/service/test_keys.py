@@ -0,0 +1,74 @@
+import jwt
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api import well_known_router
+from app.service.keys import KeyRing, write_private_key
+
+
+@pytest.mark.parametrize('algorithm', ['EdDSA', 'ES256', 'RS256'])
+def test_key_ring_rotation(algorithm, tmp_path):
+    """Token signed with a rotated key is still verified."""
+    write_private_key(algorithm, str(tmp_path), 'old')
+    write_private_key(algorithm, str(tmp_path), 'new')
+    old_ring = KeyRing(algorithm, str(tmp_path), 'old')
+    old_ring.load()
+    token = jwt.encode(
+        {'user_id': 1},
+        old_ring.key_for_signing(),
+        algorithm=algorithm,
+        headers=old_ring.headers(),
+    )
+    key_ring = KeyRing(algorithm, str(tmp_path), 'new')
+    key_ring.load()
+    payload = jwt.decode(
+        token,
+        key_ring.key_for_token(token),
+        algorithms=[algorithm],
+    )
+    assert payload == {'user_id': 1}
+    kids = {jwk['kid'] for jwk in key_ring.jwks()['keys']}
+    assert kids == {'old', 'new'}
+
+
+def test_unknown_key_id(tmp_path):
+    """Token with unknown kid is rejected."""
+    write_private_key('EdDSA', str(tmp_path), 'current')
+    key_ring = KeyRing('EdDSA', str(tmp_path), 'current')
+    key_ring.load()
+    token = jwt.encode(
+        {'user_id': 1},
+        key_ring.key_for_signing(),
+        algorithm='EdDSA',
+        headers={'kid': 'unknown'},
+    )
+    with pytest.raises(jwt.InvalidTokenError):
+        key_ring.key_for_token(token)
+
+
+def test_missing_signing_key(tmp_path):
+    """Key ring without active key is not loaded."""
+    key_ring = KeyRing('EdDSA', str(tmp_path), 'missing')
+    with pytest.raises(RuntimeError):
+        key_ring.load()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize('algorithm', ['HS256', 'EdDSA', 'ES256', 'RS256'])
+async def test_jwks_endpoint(algorithm, tmp_path, monkeypatch):
+    """JWKS endpoint serves public keys of every supported algorithm."""
+    if algorithm != 'HS256':
+        write_private_key(algorithm, str(tmp_path), 'current')
+    key_ring = KeyRing(algorithm, str(tmp_path), 'current')
+    key_ring.load()
+    monkeypatch.setattr('app.api.well_known.key_ring', key_ring)
+    app = FastAPI()
+    app.include_router(well_known_router)
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url='http://testserver',
+    ) as client:
+        response = await client.get('/.well-known/jwks.json')
+    assert response.status_code == 200
+    assert response.json() == key_ring.jwks()
@@ -0,0 +1,31 @@
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from app.service.login_cache import MissingLoginCache
+
+
+@pytest.fixture()
+def redis():
+    """Fake redis client."""
+    return FakeAsyncRedis(decode_responses=True)
+
+
+@pytest.mark.anyio
+async def test_missing_login_is_cached(redis):
+    """Remembered login is reported missing until registration."""
+    cache = MissingLoginCache(enabled=True, ttl=60, prefix='missing:')
+    assert not await cache.is_missing('user', redis)
+    await cache.remember('user', redis)
+    assert await cache.is_missing('user', redis)
+    assert await redis.ttl('missing:user') == 60
+    await cache.forget('user', redis)
+    assert not await cache.is_missing('user', redis)
+
+
+@pytest.mark.anyio
+async def test_disabled_cache(redis):
+    """Disabled cache never reports logins missing."""
+    cache = MissingLoginCache(enabled=False, ttl=60, prefix='missing:')
+    await cache.remember('user', redis)
+    assert not await cache.is_missing('user', redis)
+    assert not await redis.keys()
@@ -0,0 +1,31 @@
+from contextlib import nullcontext
+
+import pytest
+
+from app.metrics import OUTBOX_RELAY_ERRORS
+from app.service.outbox import OutboxRelay
+
+
+@pytest.mark.anyio
+async def test_relay_survives_unexpected_error(monkeypatch):
+    """Relay keeps running after an unexpected error."""
+    relay = OutboxRelay(
+        batch_size=10,
+        poll_interval=0,
+        session_factory=nullcontext,
+    )
+    batches = []
+
+    async def relay_batch(session):
+        batches.append(session)
+        if len(batches) == 1:
+            raise ValueError('Unexpected payload')
+        relay.task = None
+        return 0
+
+    monkeypatch.setattr(relay, 'relay_batch', relay_batch)
+    errors = OUTBOX_RELAY_ERRORS._value.get()
+    await relay.start()
+    await relay.task
+    assert len(batches) == 2
+    assert OUTBOX_RELAY_ERRORS._value.get() == errors + 1
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from aiokafka.errors import KafkaTimeoutError  # type: ignore
+
+from app.metrics import KAFKA_DELIVERY_FAILURES
+from app.service.producer import KafkaProducer
+
+
+class BrokerStub:
+    """Producer stub resolving deliveries on demand."""
+
+    def __init__(self):
+        """Broker stub initialization."""
+        self.deliveries: list[asyncio.Future] = []
+
+    async def send(self, topic, value):
+        """Enqueue message without delivery."""
+        delivery = asyncio.get_running_loop().create_future()
+        self.deliveries.append(delivery)
+        return delivery
+
+
+@pytest.fixture()
+def kafka_producer():
+    """Producer with stubbed broker."""
+    batch_producer = KafkaProducer(bootstrap_servers='kafka:9092')
+    batch_producer.producer = BrokerStub()
+    return batch_producer
+
+
+@pytest.mark.anyio
+async def test_batch_is_sent_before_waiting(kafka_producer):
+    """Whole batch is enqueued before waiting for acknowledgements."""
+    sending = asyncio.create_task(
+        kafka_producer.send_batch(
+            [('faces', {1: 'photo.jpg'}), ('faces', {2: 'photo.jpg'})],
+        ),
+    )
+    await asyncio.sleep(0)
+    deliveries = kafka_producer.producer.deliveries
+    assert len(deliveries) == 2
+    assert not sending.done()
+    for delivery in deliveries:
+        delivery.set_result(None)
+    await sending
+
+
+@pytest.mark.anyio
+async def test_failed_delivery_fails_batch(kafka_producer):
+    """Batch fails when a message is not acknowledged."""
+    sending = asyncio.create_task(
+        kafka_producer.send_batch(
+            [('faces', {1: 'photo.jpg'}), ('faces', {2: 'photo.jpg'})],
+        ),
+    )
+    await asyncio.sleep(0)
+    first, second = kafka_producer.producer.deliveries
+    failures = KAFKA_DELIVERY_FAILURES._value.get()
+    first.set_result(None)
+    second.set_exception(KafkaTimeoutError())
+    with pytest.raises(KafkaTimeoutError):
+        await sending
+    assert KAFKA_DELIVERY_FAILURES._value.get() == failures + 1
+
+
+@pytest.mark.anyio
+async def test_not_started_producer():
+    """Batch is not sent by a producer that is not started."""
+    with pytest.raises(RuntimeError):
+        await KafkaProducer(bootstrap_servers='kafka:9092').send_batch([])
@@ -0,0 +1,46 @@
+import pytest
+from fakeredis import FakeAsyncRedis
+from fastapi import HTTPException
+
+from app.service.rate_limiter import SlidingWindowRateLimiter
+
+
+@pytest.fixture()
+async def limiter():
+    """Rate limiter on fake redis."""
+    rate_limiter = SlidingWindowRateLimiter(
+        enabled=True,
+        window=60,
+        prefix='rate:',
+        limits={'auth': {'ip': 3, 'login': 2}},
+    )
+    await rate_limiter.start(FakeAsyncRedis(decode_responses=True))
+    return rate_limiter
+
+
+@pytest.mark.anyio
+async def test_limit_exceeded(limiter):
+    """Attempt above the login limit is rejected with Retry-After."""
+    await limiter.check('auth', ip='127.0.0.1', login='user')
+    await limiter.check('auth', ip='127.0.0.1', login='user')
+    with pytest.raises(HTTPException) as excinfo:
+        await limiter.check('auth', ip='127.0.0.1', login='user')
+    assert excinfo.value.status_code == 429
+    assert 0 < int(excinfo.value.headers['Retry-After']) <= 60
+
+
+@pytest.mark.anyio
+async def test_rejected_attempt_is_not_counted(limiter):
+    """Rejected attempt does not count against the other limits."""
+    await limiter.check('auth', ip='127.0.0.1', login='user')
+    await limiter.check('auth', ip='127.0.0.1', login='user')
+    with pytest.raises(HTTPException):
+        await limiter.check('auth', ip='127.0.0.1', login='user')
+    await limiter.check('auth', ip='127.0.0.1', login='other_user')
+
+
+@pytest.mark.anyio
+async def test_endpoint_without_limits(limiter):
+    """Endpoints without configured limits are not limited."""
+    for _ in range(5):
+        await limiter.check('registration', ip='127.0.0.1')
@@ -1,8 +1,10 @@
 import jwt
 import pytest
+from fakeredis import FakeAsyncRedis
 
 from app.constants import INVALID_TOKEN_MESSAGE, TOKEN_EXPIRED_MESSAGE
 from app.service import AuthService
+from config import config
 
 auth_service = AuthService()
 
@@ -26,3 +28,46 @@ def test_decode_jwt_invalid_token():
 def test_is_token_expired(expired_token):
     """Test for method is_token_expired."""
     assert AuthService.is_token_expired(expired_token) is True
+
+
+@pytest.mark.anyio
+async def test_token_digest_is_stored():
+    """Token digest is stored under the namespaced key."""
+    redis = FakeAsyncRedis(decode_responses=True)
+    await redis.set(1, 'legacy_token')
+    token = await AuthService.create_and_put_token(1, redis)
+    assert await redis.get(AuthService.token_key(1)) == (
+        AuthService.token_digest(token)
+    )
+    assert await redis.get(1) is None
+    check = await AuthService.check_token(token, redis)
+    assert check['is_token_valid'] is True
+
+
+@pytest.mark.anyio
+async def test_legacy_token_is_accepted():
+    """Full token under the bare user id key is valid until replaced."""
+    redis = FakeAsyncRedis(decode_responses=True)
+    legacy_token = AuthService.generate_jwt_token(1)
+    await redis.set(2, 'other_legacy_token')
+    await redis.set(1, legacy_token)
+    stored_tokens = await AuthService.get_tokens({1, 2, 3}, redis)
+    assert stored_tokens == {
+        1: legacy_token,
+        2: 'other_legacy_token',
+        3: None,
+    }
+    check = await AuthService.check_token(legacy_token, redis)
+    assert check['is_token_valid'] is True
+
+
+@pytest.mark.anyio
+async def test_legacy_token_is_rejected_when_disabled(monkeypatch):
+    """Full token is not accepted once legacy token keys are disabled."""
+    monkeypatch.setattr(config.redis, 'legacy_token_keys', False)
+    redis = FakeAsyncRedis(decode_responses=True)
+    token = AuthService.generate_jwt_token(1)
+    await redis.set(AuthService.token_key(1), token)
+    check = await AuthService.check_token(token, redis)
+    assert check['is_token_valid'] is False
+    assert AuthService.is_stored_token(token, token) is False
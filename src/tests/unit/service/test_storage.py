@@ -0,0 +1,97 @@
+import errno
+import os
+from io import BytesIO
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+
+import pytest
+from fastapi import UploadFile
+
+from app.service.storage import PhotoStorage, PhotoTooLargeError
+
+
+@pytest.fixture()
+def storage(tmp_path):
+    """Photo storage with small limits."""
+    return PhotoStorage(directory=str(tmp_path), max_size=10, chunk_size=4)
+
+
+@pytest.mark.anyio
+async def test_photo_save(storage):
+    """Photo is copied chunk by chunk."""
+    upload = UploadFile(BytesIO(b'photo data'), filename='photo.jpg')
+    file_path = await storage.save(upload, '.jpg')
+    assert file_path.endswith('.jpg')
+    assert Path(file_path).read_bytes() == b'photo data'
+
+
+@pytest.mark.anyio
+async def test_spooled_photo_save(storage):
+    """Photo spooled to disk is copied by the kernel."""
+    spool = SpooledTemporaryFile(max_size=1)
+    spool.write(b'photo data')
+    spool.seek(0)
+    upload = UploadFile(spool, filename='photo.jpg')
+    file_path = await storage.save(upload, '.jpg')
+    assert Path(file_path).read_bytes() == b'photo data'
+    assert spool.tell() == 0
+
+
+@pytest.mark.anyio
+async def test_spooled_size_too_large(storage, tmp_path):
+    """Photo spooled to disk over the limit is not copied."""
+    spool = SpooledTemporaryFile(max_size=1)
+    spool.write(b'x' * 11)
+    spool.seek(0)
+    with pytest.raises(PhotoTooLargeError):
+        await storage.save(UploadFile(spool, filename='photo.jpg'), '.jpg')
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.anyio
+async def test_declared_size_too_large(storage, tmp_path):
+    """Photo with known size over the limit is not copied."""
+    upload = UploadFile(BytesIO(b'x' * 11), size=11, filename='photo.jpg')
+    with pytest.raises(PhotoTooLargeError):
+        await storage.save(upload, '.jpg')
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.anyio
+async def test_streamed_size_too_large(storage, tmp_path):
+    """Photo of unknown size is removed once it exceeds the limit."""
+    upload = UploadFile(BytesIO(b'x' * 11), filename='photo.jpg')
+    with pytest.raises(PhotoTooLargeError):
+        await storage.save(upload, '.jpg')
+    assert not list(tmp_path.iterdir())
+
+
+def failing_sendfile(error_code):
+    """Sendfile replacement failing with the error code."""
+    def sendfile(*args):  # noqa: WPS430
+        raise OSError(error_code, os.strerror(error_code))
+    return sendfile
+
+
+@pytest.mark.anyio
+async def test_unsupported_sendfile_falls_back_to_copy(storage, monkeypatch):
+    """Photo is copied chunk by chunk when sendfile is not supported."""
+    monkeypatch.setattr(os, 'sendfile', failing_sendfile(errno.ENOSYS))
+    spool = SpooledTemporaryFile(max_size=1)
+    spool.write(b'photo data')
+    spool.seek(0)
+    upload = UploadFile(spool, filename='photo.jpg')
+    file_path = await storage.save(upload, '.jpg')
+    assert Path(file_path).read_bytes() == b'photo data'
+
+
+@pytest.mark.anyio
+async def test_sendfile_error_is_raised(storage, monkeypatch, tmp_path):
+    """Sendfile errors other than missing support are not hidden."""
+    monkeypatch.setattr(os, 'sendfile', failing_sendfile(errno.EIO))
+    spool = SpooledTemporaryFile(max_size=1)
+    spool.write(b'photo data')
+    spool.seek(0)
+    with pytest.raises(OSError, match='Input/output error'):
+        await storage.save(UploadFile(spool, filename='photo.jpg'), '.jpg')
+    assert not list(tmp_path.iterdir())
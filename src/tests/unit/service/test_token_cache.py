@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from app.service.token_cache import TokenCache
+
+
+@pytest.fixture()
+def cache():
+    """Subscribed token cache."""
+    token_cache = TokenCache(
+        enabled=True,
+        max_size=2,
+        ttl=60,
+        channel='test',
+        reconnect_delay=0,
+    )
+    token_cache.subscribed = True
+    return token_cache
+
+
+def test_cached_token(cache):
+    """Cached token lookup test."""
+    cache.put('token', 1, time.time() + 60, cache.version)
+    assert cache.get('token') == 1
+    assert cache.get('other_token') is None
+
+
+def test_cached_token_expiration(cache):
+    """Cached token is dropped after token expiration."""
+    cache.put('token', 1, time.time() - 1, cache.version)
+    assert cache.get('token') is None
+    assert not cache.tokens.entries
+
+
+def test_cache_size_eviction(cache):
+    """Least recently used token eviction test."""
+    cache.put('first', 1, time.time() + 60, cache.version)
+    cache.put('second', 2, time.time() + 60, cache.version)
+    cache.get('first')
+    cache.put('third', 3, time.time() + 60, cache.version)
+    assert cache.get('second') is None
+    assert cache.get('first') == 1
+
+
+def test_cache_invalidation(cache):
+    """User tokens invalidation test."""
+    cache.put('token', 1, time.time() + 60, cache.version)
+    cache.invalidate(1)
+    assert cache.get('token') is None
+
+
+def test_not_subscribed_cache(cache):
+    """Cache is bypassed without invalidation channel."""
+    cache.subscribed = False
+    cache.put('token', 1, time.time() + 60, cache.version)
+    assert cache.get('token') is None
+
+
+def test_stale_token_is_not_cached(cache):
+    """Token read before an invalidation is not cached."""
+    version = cache.version
+    cache.invalidate(1)
+    cache.put('token', 1, time.time() + 60, version)
+    assert cache.get('token') is None
+
+
+@pytest.mark.anyio
+async def test_listener_survives_bad_message(cache, monkeypatch):
+    """Listener reconnects after an unexpected error."""
+    consumed = []
+
+    async def receive(redis):
+        consumed.append(redis)
+        if len(consumed) == 1:
+            raise ValueError('bad message')
+        cache.listener.cancel()
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(cache, '_receive', receive)
+    cache.listener = asyncio.create_task(cache._listen(FakeAsyncRedis()))
+    with pytest.raises(asyncio.CancelledError):
+        await cache.listener
+    assert len(consumed) == 2
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+from app.constants import MULTIPROCESS_DIRECTORY_VARIABLE, UNMATCHED_ROUTE
+from app.metrics import (
+    metrics_registry,
+    remove_dead_workers,
+    route_template,
+    trace_exemplar,
+)
+
+WORKER_CODE = '''
+from prometheus_client import Counter, Gauge
+Counter('test_requests', 'Requests').inc(2)
+Gauge('test_in_flight', 'In flight', multiprocess_mode='livesum').set(3)
+'''
+
+
+def test_route_template():
+    """Endpoint label uses route template instead of raw path."""
+    route = SimpleNamespace(path='/api/users/{user_id}')
+    assert route_template({'route': route}) == '/api/users/{user_id}'
+    assert route_template({'endpoint': None, 'root_path': '/metrics'}) == (
+        '/metrics'
+    )
+    assert route_template({'path': '/random/scanner/path'}) == (
+        UNMATCHED_ROUTE
+    )
+
+
+def test_trace_exemplar():
+    """Exemplar holds hex trace id of a sampled span."""
+    span = SimpleNamespace(context=SimpleNamespace(trace_id=255))
+    assert trace_exemplar(span) == {'trace_id': 'ff'}
+    assert trace_exemplar(None) is None
+
+
+def test_multiprocess_metrics(tmp_path, monkeypatch, caplog):
+    """Metrics of all workers are aggregated, gauges of dead ones dropped."""
+    monkeypatch.setenv(MULTIPROCESS_DIRECTORY_VARIABLE, str(tmp_path))
+    for _ in range(2):
+        subprocess.run(
+            [sys.executable, '-c', WORKER_CODE],
+            env=os.environ,
+            check=True,
+        )
+    registry = metrics_registry()
+    assert 'trace exemplars are not exported' in caplog.text
+    assert registry.get_sample_value('test_requests_total') == 4
+    assert registry.get_sample_value('test_in_flight') == 6
+    remove_dead_workers()
+    assert registry.get_sample_value('test_requests_total') == 4
+    assert registry.get_sample_value('test_in_flight') is None
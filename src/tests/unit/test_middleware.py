@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+
+from app.constants import UNMATCHED_ROUTE, UPLOAD_FORM_OVERHEAD
+from app.metrics import REQUEST_COUNT
+from app.middleware import (
+    AdmissionControlMiddleware,
+    ObservabilityMiddleware,
+    UploadSizeLimitMiddleware,
+)
+from app.service import AdmissionLimiter, photo_storage
+
+
+def http_scope(path):
+    """Minimal HTTP request scope."""
+    return {
+        'type': 'http',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'headers': [(b'host', b'testserver')],
+    }
+
+
+async def receive():
+    """Empty request body."""
+    return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+
+def request_count(status):
+    """Unmatched GET requests with the status."""
+    return REQUEST_COUNT.labels(
+        method='GET',
+        endpoint=UNMATCHED_ROUTE,
+        status=status,
+    )._value.get()
+
+
+@pytest.mark.anyio
+async def test_response_status_is_measured():
+    """Response passes through and its status is counted."""
+    messages = []
+
+    async def app(scope, receive, send):
+        await send({'type': 'http.response.start', 'status': 404})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def send(message):
+        messages.append(message)
+
+    before = request_count(404)
+    await ObservabilityMiddleware(app)(http_scope('/scan'), receive, send)
+    assert [message['type'] for message in messages] == [
+        'http.response.start',
+        'http.response.body',
+    ]
+    assert request_count(404) == before + 1
+
+
+@pytest.mark.anyio
+async def test_error_is_measured_and_raised():
+    """Application error is counted as 500 and raised."""
+
+    async def app(scope, receive, send):
+        raise ValueError
+
+    async def send(message):
+        """Unused send."""
+
+    before = request_count(500)
+    with pytest.raises(ValueError):
+        await ObservabilityMiddleware(app)(http_scope('/fail'), receive, send)
+    assert request_count(500) == before + 1
+
+
+@pytest.mark.anyio
+async def test_overload_is_shed():
+    """Request that cannot be admitted in time gets 503."""
+    limiter = AdmissionLimiter(
+        name='/api/auth',
+        concurrency=1,
+        queue_size=1,
+        timeout=0.01,
+    )
+    release = asyncio.Event()
+    statuses = []
+
+    async def app(scope, receive, send):
+        if scope['path'] == '/api/auth':
+            await release.wait()
+        await send({'type': 'http.response.start', 'status': 200})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            statuses.append(message['status'])
+
+    middleware = AdmissionControlMiddleware(app, {'/api/auth': limiter})
+    admitted = asyncio.create_task(
+        middleware(http_scope('/api/auth'), receive, send),
+    )
+    await asyncio.sleep(0)
+    await middleware(http_scope('/api/auth'), receive, send)
+    assert statuses == [503]
+    await middleware(http_scope('/api/check_token'), receive, send)
+    assert statuses == [503, 200]
+    release.set()
+    await admitted
+    assert statuses == [503, 200, 200]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    ('chunks', 'expected_status'),
+    [(2, 200), (3, 413)],
+)
+async def test_chunked_upload_is_limited(monkeypatch, chunks, expected_status):
+    """Upload without Content-Length is rejected once its body is too large."""
+    monkeypatch.setattr(photo_storage, 'max_size', 0)
+    chunk = b'0' * (UPLOAD_FORM_OVERHEAD // 2)
+    messages = [
+        {'type': 'http.request', 'body': chunk, 'more_body': True}
+        for _ in range(chunks)
+    ]
+    messages.append({'type': 'http.request', 'body': b'', 'more_body': False})
+    statuses = []
+
+    async def chunked_receive():
+        return messages.pop(0)
+
+    async def app(scope, receive, send):
+        message = {'more_body': True}
+        try:
+            while message['more_body']:
+                message = await receive()
+        except Exception:
+            await send({'type': 'http.response.start', 'status': 400})
+        else:
+            await send({'type': 'http.response.start', 'status': 200})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            statuses.append(message['status'])
+
+    middleware = UploadSizeLimitMiddleware(app, '/api/verify')
+    await middleware(http_scope('/api/verify'), chunked_receive, send)
+    assert statuses == [expected_status]
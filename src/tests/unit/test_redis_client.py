@@ -0,0 +1,83 @@
+import pytest
+from redis.asyncio import BlockingConnectionPool
+from redis.asyncio.cluster import RedisCluster
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.redis_client import (
+    BlockingSentinelConnectionPool,
+    create_redis,
+    sentinel_addresses,
+)
+from config import config
+
+
+@pytest.fixture()
+def redis_settings(monkeypatch):
+    """Redis settings with a small pool."""
+    monkeypatch.setattr(config.redis, 'max_connections', 1)
+    monkeypatch.setattr(config.redis, 'pool_timeout', 0.01)
+    monkeypatch.setattr(
+        config.redis,
+        'sentinels',
+        ['sentinel-1:26379', 'sentinel-2:26380'],
+    )
+    return config.redis
+
+
+def test_sentinel_addresses():
+    """Sentinel addresses are split into host and port."""
+    assert sentinel_addresses(['sentinel-1:26379', '10.0.0.2:26380']) == [
+        ('sentinel-1', 26379),
+        ('10.0.0.2', 26380),
+    ]
+
+
+def test_sentinel_addresses_without_port():
+    """Sentinel address without a port is rejected."""
+    with pytest.raises(ValueError):
+        sentinel_addresses(['sentinel-1'])
+
+
+@pytest.mark.parametrize(('mode', 'pool_class'), [
+    ('standalone', BlockingConnectionPool),
+    ('sentinel', BlockingSentinelConnectionPool),
+])
+def test_blocking_pool(redis_settings, monkeypatch, mode, pool_class):
+    """Standalone and sentinel clients wait for a free connection."""
+    monkeypatch.setattr(redis_settings, 'mode', mode)
+    pool = create_redis().connection_pool
+    assert type(pool) is pool_class
+    assert pool.max_connections == 1
+    assert pool.timeout == redis_settings.pool_timeout
+
+
+@pytest.mark.anyio
+async def test_sentinel_pool_waits_for_connection(
+    redis_settings,
+    monkeypatch,
+):
+    """Sentinel pool over the limit waits instead of failing at once."""
+    monkeypatch.setattr(redis_settings, 'mode', 'sentinel')
+    redis = create_redis()
+    pool = redis.connection_pool
+    assert pool.service_name == redis_settings.sentinel_service_name
+    assert [
+        sentinel.connection_pool.connection_kwargs['port']
+        for sentinel in pool.sentinel_manager.sentinels
+    ] == [26379, 26380]
+
+    async def connected(connection):
+        """Skip connecting to the primary."""
+
+    monkeypatch.setattr(pool, 'ensure_connection', connected)
+    connection = await pool.get_connection('PING')
+    with pytest.raises(RedisConnectionError, match='No connection'):
+        await pool.get_connection('PING')
+    await pool.release(connection)
+    assert await pool.get_connection('PING') is connection
+
+
+def test_cluster_client(redis_settings, monkeypatch):
+    """Cluster mode creates a cluster client."""
+    monkeypatch.setattr(redis_settings, 'mode', 'cluster')
+    assert isinstance(create_redis(), RedisCluster)
@@ -0,0 +1,97 @@
+import os
+
+import pytest
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from app import server
+from app.constants import (
+    CGROUP_V1_CPU_PERIOD,
+    CGROUP_V1_CPU_QUOTA,
+    CGROUP_V2_CPU_MAX,
+    MULTIPROCESS_DIRECTORY_VARIABLE,
+)
+from config import config
+
+
+def cgroup_files(monkeypatch, files):
+    """Serve cgroup files from the dictionary."""
+    monkeypatch.setattr(server, 'read_cgroup_file', files.get)
+
+
+@pytest.mark.parametrize(('files', 'quota'), [
+    ({CGROUP_V2_CPU_MAX: '250000 100000'}, 2.5),
+    ({CGROUP_V2_CPU_MAX: 'max 100000'}, None),
+    ({CGROUP_V1_CPU_QUOTA: '50000', CGROUP_V1_CPU_PERIOD: '100000'}, 0.5),
+    ({CGROUP_V1_CPU_QUOTA: '-1', CGROUP_V1_CPU_PERIOD: '100000'}, None),
+    ({}, None),
+])
+def test_cpu_quota(monkeypatch, files, quota):
+    """CPU quota of cgroup v2 and v1."""
+    cgroup_files(monkeypatch, files)
+    assert server.cpu_quota() == quota
+
+
+@pytest.mark.parametrize(('cpu_max', 'cpus', 'workers'), [
+    ('250000 100000', 8, 2),
+    ('20000 100000', 8, 1),
+    ('max 100000', 4, 4),
+    ('800000 100000', 2, 2),
+])
+def test_worker_count(monkeypatch, cpu_max, cpus, workers):
+    """Workers follow the CPU quota and the CPUs of the process."""
+    cgroup_files(monkeypatch, {CGROUP_V2_CPU_MAX: cpu_max})
+    monkeypatch.setattr(os, 'sched_getaffinity', lambda pid: range(cpus))
+    monkeypatch.setattr(config.service, 'workers', 0)
+    assert server.worker_count() == workers
+
+
+def test_configured_worker_count(monkeypatch):
+    """Configured workers override the CPU quota."""
+    cgroup_files(monkeypatch, {CGROUP_V2_CPU_MAX: '100000 100000'})
+    monkeypatch.setattr(config.service, 'workers', 3)
+    assert server.worker_count() == 3
+
+
+def test_metrics_directory(tmp_path, monkeypatch):
+    """Several workers share a cleaned metrics directory."""
+    monkeypatch.setenv(MULTIPROCESS_DIRECTORY_VARIABLE, '')
+    monkeypatch.delenv(MULTIPROCESS_DIRECTORY_VARIABLE)
+    monkeypatch.setattr(
+        config.metrics,
+        'multiprocess_directory',
+        str(tmp_path),
+    )
+    stale_file = tmp_path / 'counter_1.db'
+    stale_file.write_bytes(b'')
+    server.prepare_metrics_directory(workers=1)
+    assert MULTIPROCESS_DIRECTORY_VARIABLE not in os.environ
+    assert stale_file.exists()
+    server.prepare_metrics_directory(workers=2)
+    assert os.environ[MULTIPROCESS_DIRECTORY_VARIABLE] == str(tmp_path)
+    assert not stale_file.exists()
+
+
+@pytest.mark.anyio
+async def test_forwarded_client_of_trusted_proxy(monkeypatch):
+    """Client address is taken from X-Forwarded-For of trusted proxies."""
+    monkeypatch.setattr(config.service, 'forwarded_allow_ips', ['10.1.2.3'])
+    clients = []
+
+    async def app(scope, receive, send):
+        clients.append(scope['client'][0])
+
+    proxied_app = ProxyHeadersMiddleware(
+        app,
+        trusted_hosts=server.server_options()['forwarded_allow_ips'],
+    )
+    for peer in ('10.1.2.3', '192.168.1.1'):
+        await proxied_app(
+            {
+                'type': 'http',
+                'client': (peer, 1234),
+                'headers': [(b'x-forwarded-for', b'203.0.113.7')],
+            },
+            None,
+            None,
+        )
+    assert clients == ['203.0.113.7', '192.168.1.1']
@@ -0,0 +1,93 @@
+import opentracing
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.sampling import (
+    ALWAYS_OFF,
+    ALWAYS_ON,
+    Decision,
+    ParentBased,
+    TraceIdRatioBased,
+)
+from opentelemetry.shim.opentracing_shim import create_tracer
+
+from app import tracing
+from app.metrics import trace_exemplar
+from app.tracing import (
+    NOOP_TRACER,
+    RateLimitingSampler,
+    create_sampler,
+    is_sampled,
+    request_sampled,
+)
+
+
+@pytest.mark.parametrize(('sampler_type', 'sampler_param', 'root'), [
+    ('const', 1, ALWAYS_ON),
+    ('const', 0, ALWAYS_OFF),
+])
+def test_const_sampler(sampler_type, sampler_param, root):
+    """Constant sampler maps to the always on and always off samplers."""
+    sampler = create_sampler(sampler_type, sampler_param)
+    assert isinstance(sampler, ParentBased)
+    assert sampler._root is root  # noqa: WPS437
+
+
+def test_probabilistic_sampler():
+    """Probabilistic sampler samples the configured ratio of traces."""
+    sampler = create_sampler('probabilistic', 0.25)
+    assert isinstance(sampler._root, TraceIdRatioBased)  # noqa: WPS437
+    assert sampler._root.rate == 0.25  # noqa: WPS437
+
+
+def test_unknown_sampler():
+    """Unknown sampler type is rejected."""
+    with pytest.raises(ValueError, match='remote'):
+        create_sampler('remote', 1)
+
+
+def test_rate_limiting_sampler(monkeypatch):
+    """At most the configured traces are sampled per second."""
+    now = 100.0
+    monkeypatch.setattr(tracing.time, 'monotonic', lambda: now)
+    sampler = RateLimitingSampler(2)
+    decisions = [
+        sampler.should_sample(None, 1, 'span').decision for _ in range(3)
+    ]
+    assert decisions == [
+        Decision.RECORD_AND_SAMPLE,
+        Decision.RECORD_AND_SAMPLE,
+        Decision.DROP,
+    ]
+    now += 0.5
+    assert sampler.should_sample(None, 1, 'span').decision == (
+        Decision.RECORD_AND_SAMPLE
+    )
+    assert sampler.should_sample(None, 1, 'span').decision == Decision.DROP
+
+
+@pytest.mark.parametrize('sampler_param', [0, 1])
+def test_opentelemetry_span(sampler_param):
+    """Sampling decision of OpenTelemetry shim spans."""
+    provider = TracerProvider(sampler=create_sampler('const', sampler_param))
+    with create_tracer(provider).start_active_span('request') as scope:
+        assert is_sampled(scope.span) == bool(sampler_param)
+
+
+def test_opentelemetry_exemplar():
+    """Exemplar holds trace id of the wrapped OpenTelemetry span."""
+    provider = TracerProvider(sampler=create_sampler('const', 1))
+    with create_tracer(provider).start_active_span('request') as scope:
+        trace_id = scope.span.unwrap().get_span_context().trace_id
+        assert trace_exemplar(scope.span) == {
+            'trace_id': format(trace_id, 'x'),
+        }
+
+
+def test_unsampled_request_tracer(monkeypatch):
+    """Spans of unsampled requests use the no-op tracer."""
+    global_tracer = opentracing.Tracer()
+    monkeypatch.setattr(opentracing, 'tracer', global_tracer)
+    assert tracing.tracer() is NOOP_TRACER
+    sampled_token = request_sampled.set(True)
+    assert tracing.tracer() is global_tracer
+    request_sampled.reset(sampled_token)